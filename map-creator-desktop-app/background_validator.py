@@ -0,0 +1,100 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from model import Building
+from building_validator import BuildingValidator, ValidationCancelled, ValidationSnapshot
+
+class _ValidateTaskSignals(QObject):
+    progress = Signal(object, int, int)
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+
+class _ValidateTask(QRunnable):
+    def __init__(self, validator: BuildingValidator, snapshot: ValidationSnapshot):
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.validator = validator
+        self.snapshot = snapshot
+        self.cancel_event = threading.Event()
+        self.signals = _ValidateTaskSignals()
+
+    def run(self):
+        try:
+            issues = self.validator.validate(
+                self.snapshot,
+                progress=lambda done, total: self.signals.progress.emit(self, done, total),
+                cancelled=self.cancel_event.is_set,
+            )
+        except ValidationCancelled:
+            # cancel() has told the GUI already
+            self.signals.finished.emit(self, None)
+            return
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+
+        self.signals.finished.emit(self, issues)
+
+class BackgroundValidator(QObject):
+    progress = Signal(int, int)
+    finished = Signal(list)
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._validator = BuildingValidator()
+        self._task: _ValidateTask = None
+
+        # Running tasks, cancelled ones included, live until they return
+        self._tasks = set()
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self, building: Building):
+        # A new run replaces the one in progress, whose results would be stale
+        self.cancel()
+
+        # Taken on the GUI thread, the checks only see this copy
+        snapshot = self._validator.snapshot(building)
+
+        task = _ValidateTask(self._validator, snapshot)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+
+        self._task = task
+        self._tasks.add(task)
+        self._pool.start(task)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel_event.set()
+            self._task = None
+            self.cancelled.emit()
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_progress(self, task: _ValidateTask, done: int, total: int):
+        if task is self._task:
+            self.progress.emit(done, total)
+
+    def _on_finished(self, task: _ValidateTask, issues: list):
+        self._tasks.discard(task)
+        if task is self._task:
+            self._task = None
+            self.finished.emit(issues)
+
+    def _on_failed(self, task: _ValidateTask, error: str):
+        self._tasks.discard(task)
+        if task is self._task:
+            self._task = None
+            self.failed.emit(error)
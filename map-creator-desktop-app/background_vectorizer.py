@@ -0,0 +1,103 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from model import FloorUnderlay
+from model.wall_vectorization import WallVectorizer, VectorizationCancelled
+from underlay_tiles import read_grayscale
+
+class _VectorizeTaskSignals(QObject):
+    progress = Signal(object, int, int)
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+
+class _VectorizeTask(QRunnable):
+    def __init__(self, vectorizer: WallVectorizer, underlay: FloorUnderlay):
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.vectorizer = vectorizer
+        self.underlay = underlay
+        self.cancel_event = threading.Event()
+        self.signals = _VectorizeTaskSignals()
+
+    def run(self):
+        try:
+            gray = read_grayscale(self.underlay.image_path)
+            segments = self.vectorizer.vectorize(
+                gray,
+                progress=lambda done, total: self.signals.progress.emit(self, done, total),
+                cancelled=self.cancel_event.is_set,
+            )
+        except VectorizationCancelled:
+            # cancel() has told the GUI already
+            self.signals.finished.emit(self, None)
+            return
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+
+        # Image pixels to scene coordinates
+        u = self.underlay
+        segments = [
+            (u.x + x1 * u.scale, u.y + y1 * u.scale, u.x + x2 * u.scale, u.y + y2 * u.scale)
+            for x1, y1, x2, y2 in segments
+        ]
+        self.signals.finished.emit(self, segments)
+
+class BackgroundVectorizer(QObject):
+    progress = Signal(int, int)
+    finished = Signal(list)
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._task: _VectorizeTask = None
+
+        # Running tasks, cancelled ones included, live until they return
+        self._tasks = set()
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self, underlay: FloorUnderlay, vectorizer: WallVectorizer):
+        self.cancel()
+
+        task = _VectorizeTask(vectorizer, underlay)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+
+        self._task = task
+        self._tasks.add(task)
+        self._pool.start(task)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel_event.set()
+            self._task = None
+            self.cancelled.emit()
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_progress(self, task: _VectorizeTask, done: int, total: int):
+        if task is self._task:
+            self.progress.emit(done, total)
+
+    def _on_finished(self, task: _VectorizeTask, segments: list):
+        self._tasks.discard(task)
+        if task is self._task:
+            self._task = None
+            self.finished.emit(segments)
+
+    def _on_failed(self, task: _VectorizeTask, error: str):
+        self._tasks.discard(task)
+        if task is self._task:
+            self._task = None
+            self.failed.emit(error)
@@ -0,0 +1,108 @@
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import Floor
+from cad_importer import CadImporter
+
+# Writes a synthetic DXF or SVG floor plan with the given number of entities
+# (a grid of rooms: wall lines, room outlines, room labels and some arcs the
+# importer skips), imports it into a floor and reports entities per second
+# and the peak memory of the process.
+
+def write_dxf(path: str, entities: int):
+    side = max(1, int((entities / 7) ** 0.5))
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("0\nSECTION\n2\nHEADER\n9\n$INSUNITS\n70\n4\n0\nENDSEC\n")
+        f.write("0\nSECTION\n2\nENTITIES\n")
+        for i in range(side):
+            for j in range(side):
+                if written >= entities:
+                    break
+                x, y = i * 5000.0, j * 4000.0
+                f.write(f"0\nLINE\n8\nA-WALL\n10\n{x}\n20\n{y}\n30\n0.0\n11\n{x + 5000}\n21\n{y}\n31\n0.0\n")
+                f.write(f"0\nLINE\n8\nA-WALL\n10\n{x}\n20\n{y}\n30\n0.0\n11\n{x}\n21\n{y + 4000}\n31\n0.0\n")
+                f.write(f"0\nLWPOLYLINE\n8\nA-WALL\n90\n3\n70\n0\n10\n{x + 1000}\n20\n{y + 500}\n"
+                        f"10\n{x + 1000}\n20\n{y + 1500}\n10\n{x + 2000}\n20\n{y + 1500}\n")
+                f.write(f"0\nLWPOLYLINE\n8\nROOMS\n90\n4\n70\n1\n10\n{x}\n20\n{y}\n10\n{x + 5000}\n20\n{y}\n"
+                        f"10\n{x + 5000}\n20\n{y + 4000}\n10\n{x}\n20\n{y + 4000}\n")
+                f.write(f"0\nTEXT\n8\nPOI-LABELS\n10\n{x + 2500}\n20\n{y + 2000}\n40\n200\n1\nRoom {i}-{j}\n")
+                f.write(f"0\nPOINT\n8\nPOI\n10\n{x + 100}\n20\n{y + 100}\n")
+                f.write(f"0\nARC\n8\nA-DOOR\n10\n{x + 300}\n20\n{y}\n40\n900\n50\n0\n51\n90\n")
+                written += 7
+        f.write("0\nENDSEC\n0\nEOF\n")
+    return written
+
+def write_svg(path: str, entities: int):
+    side = max(1, int((entities / 6) ** 0.5))
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="1000mm" height="1000mm" viewBox="0 0 1000 1000">\n')
+        f.write('<g id="walls" transform="translate(10 10)">\n')
+        for i in range(side):
+            for j in range(side):
+                if written >= entities:
+                    break
+                x, y = i * 5, j * 4
+                f.write(f'<line x1="{x}" y1="{y}" x2="{x + 5}" y2="{y}"/>'
+                        f'<path d="M{x} {y} v4 h1"/>'
+                        f'<polyline points="{x + 1},{y + 1} {x + 2},{y + 1}"/>\n')
+                written += 3
+        f.write('</g>\n<g id="rooms">\n')
+        for i in range(side):
+            for j in range(side):
+                x, y = i * 5, j * 4
+                f.write(f'<rect x="{x}" y="{y}" width="5" height="4"/>'
+                        f'<ellipse cx="{x}" cy="{y}" rx="1" ry="1"/>\n')
+                written += 2
+        f.write('</g>\n<g id="labels">\n')
+        for i in range(side):
+            for j in range(side):
+                x, y = i * 5, j * 4
+                f.write(f'<text x="{x + 2.5}" y="{y + 2}">Room <tspan>{i}-{j}</tspan></text>\n')
+                written += 1
+        f.write('</g>\n</svg>\n')
+    return written
+
+def run(kind: str, entities: int, keep: bool):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, f"plan.{kind}")
+    written = (write_dxf if kind == "dxf" else write_svg)(path, entities)
+    size = os.path.getsize(path)
+
+    floor = Floor("Benchmark")
+    start = time.perf_counter()
+    result = CadImporter().import_file(path, floor)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{kind} {written:>8} entities ({size / 2**20:>6.1f} MB) "
+          f"{elapsed:>6.2f} s {result.entities / elapsed:>9.0f} entities/s  "
+          f"walls {result.walls} zones {result.zones} POIs {result.points_of_interest} "
+          f"skipped {result.skipped}  peak RSS {peak:.0f} MB")
+
+    if not keep:
+        os.remove(path)
+        os.rmdir(directory)
+
+def main():
+    parser = argparse.ArgumentParser(description="DXF / SVG import benchmark")
+    parser.add_argument("sizes", type=int, nargs="*", default=[10_000, 100_000, 300_000],
+                        help="number of entities per run")
+    parser.add_argument("--format", choices=["dxf", "svg", "both"], default="both")
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    args = parser.parse_args()
+
+    kinds = ["dxf", "svg"] if args.format == "both" else [args.format]
+    for size in args.sizes:
+        for kind in kinds:
+            run(kind, size, args.keep)
+
+if __name__ == "__main__":
+    main()
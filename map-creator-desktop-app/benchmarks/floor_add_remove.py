@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import Floor, Node, Wall
+
+# Adds a batch of walls (each pulling in its two nodes) to a floor, removes
+# them again in random order and adds them back, like importing a batch and
+# undoing / redoing it.
+
+def build_walls(count: int) -> list[Wall]:
+    return [Wall(Node(i, 0), Node(i, 10)) for i in range(count)]
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+def run(count: int, seed: int):
+    walls = build_walls(count)
+    floor = Floor("Benchmark")
+
+    def add_all():
+        for wall in walls:
+            floor.add(wall)
+
+    shuffled = walls[:]
+    random.Random(seed).shuffle(shuffled)
+
+    def remove_all():
+        for wall in shuffled:
+            floor.remove(wall)
+
+    add_time = timed(add_all)
+    remove_time = timed(remove_all)
+    readd_time = timed(add_all)
+
+    elements = count * 3
+    print(f"{count:>8} walls ({elements:>7} elements) "
+          f"add {add_time * 1000:>9.1f} ms "
+          f"remove {remove_time * 1000:>9.1f} ms "
+          f"re-add {readd_time * 1000:>9.1f} ms "
+          f"{(add_time + remove_time + readd_time) * 1e6 / (3 * elements):>7.2f} us/element/op")
+
+def main():
+    parser = argparse.ArgumentParser(description="Floor add / remove benchmark")
+    parser.add_argument("sizes", type=int, nargs="*", default=[1_000, 10_000, 100_000],
+                        help="number of walls per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.seed)
+
+if __name__ == "__main__":
+    main()
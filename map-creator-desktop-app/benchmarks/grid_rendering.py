@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from model import Building, Floor
+from cad_scene import InteractiveScene
+from main_map_controller import MainMapController
+from constants import GRID_SIZE_DEFAULT
+
+# Repaints the background of an empty floor, grid and axis labels included,
+# while panning a few pixels per frame the way mouse moves repaint the view,
+# and reports the frame time with and without the grid tile cache.
+
+def render_frames(scene: InteractiveScene, zoom: float, width: int, height: int, frames: int) -> float:
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    span_x, span_y = width / zoom, height / zoom
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Around the origin, so both axes and their labels are on screen
+        x = -span_x / 2 + (frame % 60) * 3 / zoom
+        y = -span_y / 2 + (frame % 40) * 2 / zoom
+        rect = QRectF(x, y, span_x, span_y)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(zoom, zoom)
+        painter.translate(-x, -y)
+        scene.drawBackground(painter, rect)
+        painter.end()
+    return (time.perf_counter() - start) / frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid background rendering benchmark")
+    parser.add_argument("zooms", type=float, nargs="*", default=[0.2, 0.5, 1.0, 3.0, 10.0],
+                        help="view scales to render at")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080], metavar=("W", "H"))
+    parser.add_argument("--grid", type=int, default=GRID_SIZE_DEFAULT)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    building = Building()
+    building.add_floor(Floor("Benchmark"))
+    scene = InteractiveScene()
+    controller = MainMapController(building, scene, args.grid, {object: object})
+    scene.set_controller(controller)
+
+    width, height = args.size
+    renderer = scene.grid_renderer
+    for zoom in args.zooms:
+        renderer.cache_enabled = False
+        direct = render_frames(scene, zoom, width, height, args.frames)
+
+        renderer.cache_enabled = True
+        renderer.clear()
+        cached = render_frames(scene, zoom, width, height, args.frames)
+
+        print(f"zoom {zoom:>5.2f}  direct {direct * 1000:>7.2f} ms/frame  "
+              f"cached {cached * 1000:>7.2f} ms/frame  {direct / cached:>5.1f}x  "
+              f"tiles {renderer.tile_count}")
+
+if __name__ == "__main__":
+    main()
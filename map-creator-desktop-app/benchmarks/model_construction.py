@@ -0,0 +1,87 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model import Floor, Node, Wall, Zone
+
+# Builds a floor of square rooms (4 nodes + 1 zone) and walls (2 nodes + 1 wall)
+# and reports construction time and memory per element. Python heap usage is
+# traced directly; native allocations (e.g. Qt objects) only show up in the
+# resident set size, which is read from /proc where available.
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+def build_floor(rooms: int, walls: int) -> Floor:
+    floor = Floor("Benchmark")
+
+    for i in range(rooms):
+        x = (i % 100) * 10.0
+        y = (i // 100) * 10.0
+        corners = [Node(x, y), Node(x + 8, y), Node(x + 8, y + 8), Node(x, y + 8)]
+        floor.add(Zone(corners, f"Room {i}"))
+
+    for i in range(walls):
+        x = (i % 100) * 10.0
+        y = (i // 100) * 10.0
+        floor.add(Wall(Node(x, y), Node(x + 10, y)))
+
+    return floor
+
+def build_nodes(count: int) -> list[Node]:
+    return [Node(i * 1.0, i * 2.0) for i in range(count)]
+
+def measure(name: str, build, element_count: int):
+    # Timed without tracing, tracemalloc slows allocation down several times
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    rss_growth = rss_bytes() - rss_before
+
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = build()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<24} {element_count:>9} elements "
+          f"{elapsed * 1000:>9.1f} ms "
+          f"{elapsed * 1e6 / element_count:>7.2f} us/element "
+          f"{traced / element_count:>8.0f} B/element (heap) "
+          f"{rss_growth / element_count:>8.0f} B/element (rss)")
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Model construction benchmark")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--rooms", type=int, default=2_000)
+    parser.add_argument("--walls", type=int, default=2_000)
+    args = parser.parse_args()
+
+    nodes = measure("bare nodes", lambda: build_nodes(args.nodes), args.nodes)
+    del nodes
+
+    element_count = args.rooms * 5 + args.walls * 3
+    floor = measure("floor (rooms + walls)", lambda: build_floor(args.rooms, args.walls), element_count)
+
+    start = time.perf_counter()
+    del floor
+    gc.collect()
+    print(f"{'teardown':<24} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+if __name__ == "__main__":
+    main()
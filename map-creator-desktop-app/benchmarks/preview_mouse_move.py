@@ -0,0 +1,140 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF
+from PySide6.QtWidgets import QApplication
+
+from model import Building, Floor, Node, Wall, Zone, PointOfInterest, ZoneType
+from cad_scene import InteractiveScene
+from main_map_controller import MainMapController
+from commands import ZoneAddCommand
+from tools import WallAddTool, ZoneAddTool, PointOfInterestAddTool, ZoneConnectTool, SelectTool
+from view import (
+    NodeGraphicsItem, WallGraphicsItem, ZoneGraphicsItem, PointOfInterestGraphicsItem,
+    WallPreview, ZonePreview, PointOfInterestPreview, HighlightPreview,
+)
+
+# Feeds mouse moves to the tool previews, and to the tools the way the view
+# does, and reports the time spent per move, the Python memory allocated while
+# handling it (the traced peak above what was in use before the move) and the
+# graphics items it created.
+
+def mouse_path(count: int) -> list[QPointF]:
+    return [QPointF(100 + (i * 7) % 900, 100 + (i * 13) % 700) for i in range(count)]
+
+def setup(tool_type: type):
+    building = Building()
+    floor = Floor("Benchmark")
+    building.add_floor(floor)
+
+    scene = InteractiveScene()
+    controller = MainMapController(building, scene, 25, {
+        Node: NodeGraphicsItem,
+        Wall: WallGraphicsItem,
+        Zone: ZoneGraphicsItem,
+        PointOfInterest: PointOfInterestGraphicsItem,
+    })
+    scene.set_controller(controller)
+
+    # Rooms for the zone connection tool to highlight while the mouse crosses them
+    for i in range(4):
+        x = i * 250
+        corners = [QPointF(x, 0), QPointF(x + 200, 0), QPointF(x + 200, 800), QPointF(x, 800)]
+        controller.execute(ZoneAddCommand(floor, corners, f"Room {i}", ZoneType.GENERIC))
+
+    controller.current_tool = tool_type
+    tool = controller.current_tool
+
+    # Drawing tools are mid-gesture: a wall started, a zone with a few corners
+    if tool_type is WallAddTool:
+        tool.mouse_click(QPointF(50, 50))
+    elif tool_type is ZoneAddTool:
+        for corner in (QPointF(50, 50), QPointF(1000, 50), QPointF(1000, 900)):
+            tool.mouse_click(corner)
+
+    return controller
+
+def measure(name: str, scene, move, path: list[QPointF]):
+    # Warm up, so first-move setup is not counted
+    for pos in path[:10]:
+        move(pos)
+
+    start = time.perf_counter()
+    for pos in path:
+        move(pos)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peak_total = 0
+    for pos in path:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        move(pos)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+    tracemalloc.stop()
+
+    # Graphics items put in the scene by a move, rather than reused
+    created = 0
+    items = set(scene.items())
+    for pos in path:
+        move(pos)
+        current = set(scene.items())
+        created += len(current - items)
+        items |= current
+
+    moves = len(path)
+    print(f"{name:<24} {elapsed / moves * 1e6:>7.1f} us/move  "
+          f"{peak_total / moves:>6.0f} bytes allocated/move  "
+          f"{created / moves:>5.2f} new items/move")
+
+def run_tool(tool_type: type, moves: int):
+    controller = setup(tool_type)
+    measure(tool_type.__name__, controller.scene, controller.on_canvas_move, mouse_path(moves))
+
+# The previews alone, as the tools drive them
+def run_previews(moves: int):
+    controller = setup(SelectTool)
+    scene = controller.scene
+    path = mouse_path(moves)
+
+    wall = WallPreview(scene)
+    start = QPointF(50, 50)
+    measure("WallPreview", scene, lambda pos: wall.update_preview(start, pos), path)
+    wall.clear()
+
+    zone = ZonePreview(scene)
+    corners = [QPointF(50, 50), QPointF(1000, 50), QPointF(1000, 900)]
+    measure("ZonePreview", scene, lambda pos: zone.update_preview(corners, pos, pos.x() < 600), path)
+    zone.clear()
+
+    poi = PointOfInterestPreview(scene)
+    measure("PointOfInterestPreview", scene, poi.update_preview, path)
+    poi.clear()
+
+    highlight = HighlightPreview()
+    floor = controller.current_floor
+    rooms = sorted(floor.zones, key=lambda zone: zone.name)
+    room_items = [controller.get_item_for_model(room) for room in rooms]
+    measure("HighlightPreview", scene,
+            lambda pos: highlight.update_preview(room_items[int(pos.x()) // 250 % len(room_items)]), path)
+    highlight.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool preview mouse-move benchmark")
+    parser.add_argument("--moves", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    run_previews(args.moves)
+    for tool_type in (WallAddTool, ZoneAddTool, PointOfInterestAddTool, ZoneConnectTool):
+        run_tool(tool_type, args.moves)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,762 @@
+import json
+import os
+import struct
+import sys
+import threading
+import uuid
+import weakref
+import zlib
+
+from array import array
+from typing import Callable
+
+from model import (
+    Building, Floor, Node, Zone, PointOfInterest,
+    Wall, ZoneType, PointOfInterestType, Fingerprints, Point, FloorUnderlay
+)
+from utils.atomic_file import atomic_write
+
+# Compact columnar .inmap encoding:
+#
+#   header | floor payload 0 | ... | floor payload N-1 | index
+#
+# Every floor payload (optionally zlib) keeps each element kind as parallel
+# columns: UUIDs as raw 16 byte values, coordinates as packed float64 arrays
+# and wall / zone corners as u32 indices into the floor's node table.
+#
+# The index at the end of the file lists the uuid, name, offset and size of
+# every floor payload followed by the zone connections, each tagged with the
+# floor indices of its zones. Reading just the header and the index is enough
+# to open a building with all floors left unloaded. Every floor entry also
+# carries the floor's underlay as a JSON string, empty for none.
+#
+# Zone fingerprints follow the points of interest as the last section of a
+# payload: fingerprint counts per zone, measurement counts per fingerprint,
+# then all tag ids (int16) and RSSI values (int8).
+
+MAGIC = b"INMAPBIN"
+VERSION = 1
+
+FLAG_COMPRESSED = 1
+
+_PREFIX = struct.Struct("<8sH")
+_HEADER = struct.Struct("<8sHH16sIQ")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class _FloorColumns:
+    def __init__(self):
+        self.node_ids: list[uuid.UUID] = []
+        self.node_xs = array("d")
+        self.node_ys = array("d")
+
+        self.wall_ids: list[uuid.UUID] = []
+        self.wall_starts = array("I")
+        self.wall_ends = array("I")
+
+        self.zone_ids: list[uuid.UUID] = []
+        self.zone_names: list[str] = []
+        self.zone_types = array("B")
+        self.zone_corner_counts = array("I")
+        self.zone_corners = array("I")
+
+        self.poi_ids: list[uuid.UUID] = []
+        self.poi_names: list[str] = []
+        self.poi_types = array("B")
+        self.poi_xs = array("d")
+        self.poi_ys = array("d")
+
+        self.zone_fingerprint_counts = array("I")
+        self.fingerprint_sizes = array("I")
+        self.fingerprint_tag_ids = array("h")
+        self.fingerprint_rssis = array("b")
+
+
+class FloorIndexEntry:
+    def __init__(self, id: uuid.UUID, name: str, offset: int, size: int, underlay: dict = None):
+        self.id = id
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.underlay = underlay
+
+
+class BuildingIndex:
+    def __init__(self,
+                 id: uuid.UUID,
+                 version: int,
+                 flags: int,
+                 floors: list[FloorIndexEntry],
+                 connections: list[tuple]):
+        self.id = id
+        self.version = version
+        self.flags = flags
+        self.floors = floors
+        # (zone1 id, floor1 index, zone2 id, floor2 index)
+        self.connections = connections
+
+
+class _Writer:
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def u32(self, value: int):
+        self.raw(_U32.pack(value))
+
+    def u64(self, value: int):
+        self.raw(_U64.pack(value))
+
+    def raw(self, data: bytes):
+        self._parts.append(data)
+        self._size += len(data)
+
+    def uuids(self, ids: list[uuid.UUID]):
+        self.raw(b"".join(id.bytes for id in ids))
+
+    def array(self, values: array):
+        if not _LITTLE_ENDIAN:
+            values = array(values.typecode, values)
+            values.byteswap()
+        self.raw(values.tobytes())
+
+    def string(self, value: str):
+        encoded = value.encode("utf-8")
+        self.u32(len(encoded))
+        self.raw(encoded)
+
+    def strings(self, values: list[str]):
+        encoded = [value.encode("utf-8") for value in values]
+        self.array(array("I", (len(e) for e in encoded)))
+        self.raw(b"".join(encoded))
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int = 0):
+        self._data = memoryview(data)
+        self._offset = offset
+
+    @property
+    def remaining(self) -> int:
+        return len(self._data) - self._offset
+
+    def u32(self) -> int:
+        value, = _U32.unpack(self.raw(_U32.size))
+        return value
+
+    def u64(self) -> int:
+        value, = _U64.unpack(self.raw(_U64.size))
+        return value
+
+    def raw(self, size: int) -> bytes:
+        if self._offset + size > len(self._data):
+            raise ValueError("Unexpected end of binary building data.")
+
+        value = self._data[self._offset:self._offset + size].tobytes()
+        self._offset += size
+        return value
+
+    def uuids(self, count: int) -> list[uuid.UUID]:
+        blob = self.raw(count * 16)
+        return [uuid.UUID(bytes=blob[i:i + 16]) for i in range(0, len(blob), 16)]
+
+    def array(self, typecode: str, count: int) -> array:
+        values = array(typecode)
+        values.frombytes(self.raw(count * values.itemsize))
+        if not _LITTLE_ENDIAN:
+            values.byteswap()
+        return values
+
+    def string(self) -> str:
+        return self.raw(self.u32()).decode("utf-8")
+
+    def strings(self, count: int) -> list[str]:
+        lengths = self.array("I", count)
+        blob = self.raw(sum(lengths))
+
+        values = []
+        start = 0
+        for length in lengths:
+            values.append(blob[start:start + length].decode("utf-8"))
+            start += length
+        return values
+
+
+class LazyFloorLoader:
+    def __init__(self, codec: "BinaryBuildingCodec", source: "BinaryBuildingSource", entry: FloorIndexEntry):
+        self._codec = codec
+        self._source = source
+        self._entry = entry
+
+    def __call__(self, floor: Floor):
+        body, flags = self._source.read_chunk(self._entry)
+        columns = self._codec.decode_payload(body, flags)
+        self._codec.populate_floor(floor, columns)
+
+
+# One source per file path, so that the saver can move chunk offsets of
+# the file it overwrites while no floor is being read from it.
+class BinaryBuildingSource:
+    _sources = weakref.WeakValueDictionary()
+    _sources_lock = threading.Lock()
+
+    def __init__(self, file_path: str, flags: int):
+        self.file_path = file_path
+        self.flags = flags
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, file_path: str, flags: int) -> "BinaryBuildingSource":
+        key = os.path.normcase(os.path.abspath(file_path))
+
+        with cls._sources_lock:
+            source = cls._sources.get(key)
+            if source is None:
+                source = cls(file_path, flags)
+                cls._sources[key] = source
+            return source
+
+    def read_chunk(self, entry: FloorIndexEntry) -> tuple[bytes, int]:
+        with self.lock:
+            with open(self.file_path, 'rb') as f:
+                f.seek(entry.offset)
+                body = f.read(entry.size)
+            flags = self.flags
+
+        if len(body) != entry.size:
+            raise ValueError("Unexpected end of binary building data.")
+        return body, flags
+
+
+# Taken on the GUI thread. Unchanged floors are copied from what they were
+# last saved as; the others are captured as plain values, and turned into
+# dicts and encoded on the worker thread.
+class FloorSnapshot:
+    def __init__(self, floor: Floor, reusable: Callable[[object], bool]):
+        self.floor = floor
+        self.id = floor.uuid
+        self.name = floor.name
+        self.underlay = floor.underlay.to_dict() if floor.underlay is not None else None
+        self.revision = floor.revision
+
+        self.source = floor.source if floor.source is not None and reusable(floor.source) else None
+        if self.source is None:
+            self._capture(floor)
+
+    def _capture(self, floor: Floor):
+        self.nodes = [(node.uuid, node.x, node.y) for node in floor.nodes]
+
+        self.walls = [(wall.uuid, wall.start_node.uuid, wall.end_node.uuid) for wall in floor.walls]
+        self.zones = [
+            (zone.uuid, zone.name, zone.type, [node.uuid for node in zone.corner_nodes],
+             zone.fingerprints.copy())
+            for zone in floor.zones
+        ]
+        self.points_of_interest = [
+            (poi.uuid, poi.position.x(), poi.position.y(), poi.name, poi.type)
+            for poi in floor.points_of_interest
+        ]
+
+    # Same layout as Floor.to_dict()
+    def to_dict(self) -> dict:
+        data = {
+            "id": str(self.id),
+            "name": self.name,
+            "nodes": [
+                {"id": str(node_id), "x": x, "y": y}
+                for node_id, x, y in self.nodes
+            ],
+            "walls": [
+                {"id": str(wall_id), "start_node_id": str(start_id), "end_node_id": str(end_id)}
+                for wall_id, start_id, end_id in self.walls
+            ],
+            "zones": [
+                {
+                    "id": str(zone_id),
+                    "name": name,
+                    "type": zone_type.name,
+                    "corner_node_ids": [str(node_id) for node_id in corner_ids],
+                    "fingerprints": fingerprints.to_list(),
+                } for zone_id, name, zone_type, corner_ids, fingerprints in self.zones
+            ],
+            "points_of_interest": [
+                {"id": str(poi_id), "x": x, "y": y, "name": name, "type": poi_type.name}
+                for poi_id, x, y, name, poi_type in self.points_of_interest
+            ],
+        }
+        if self.underlay is not None:
+            data["underlay"] = self.underlay
+        return data
+
+
+class BuildingSnapshot:
+    def __init__(self, building: Building, reusable: Callable[[object], bool]):
+        self.id = building.id
+        self.floors = [FloorSnapshot(floor, reusable) for floor in building.floors]
+
+        floor_indices = {floor: i for i, floor in enumerate(building.floors)}
+        self.connections = [
+            (zone1_id, floor_indices[floor1], zone2_id, floor_indices[floor2])
+            for zone1_id, floor1, zone2_id, floor2 in building.get_connection_records()
+        ]
+
+
+class BinaryBuildingCodec:
+    @staticmethod
+    def is_binary(header: bytes) -> bool:
+        return header[:len(MAGIC)] == MAGIC
+
+    # ------------------------------------
+    # ------------- Encoding -------------
+    # ------------------------------------
+    def encode(self, data: dict, compress: bool = True) -> bytes:
+        floors = data.get("floors", [])
+        flags = FLAG_COMPRESSED if compress else 0
+
+        bodies = [self.encode_payload(floor_data, compress) for floor_data in floors]
+        entries = []
+        offset = _HEADER.size
+        for floor_data, body in zip(floors, bodies):
+            entries.append(FloorIndexEntry(uuid.UUID(floor_data.get("id")),
+                                           floor_data.get("name", "Unnamed Floor"),
+                                           offset,
+                                           len(body),
+                                           floor_data.get("underlay")))
+            offset += len(body)
+
+        zone_floors = {
+            zone.get("id"): i
+            for i, floor_data in enumerate(floors)
+            for zone in floor_data.get("zones", [])
+        }
+        connections = [
+            (uuid.UUID(connection.get("zone1_id")), zone_floors[connection.get("zone1_id")],
+             uuid.UUID(connection.get("zone2_id")), zone_floors[connection.get("zone2_id")])
+            for connection in data.get("zone_connections", [])
+        ]
+
+        writer = _Writer()
+        writer.raw(_HEADER.pack(MAGIC, VERSION, flags, uuid.UUID(data.get("id")).bytes, len(floors), offset))
+        for body in bodies:
+            writer.raw(body)
+        self._encode_index(writer, entries, connections)
+
+        return writer.getvalue()
+
+    def write_snapshot(self, snapshot: BuildingSnapshot, file_path: str, compress: bool = True):
+        flags = FLAG_COMPRESSED if compress else 0
+
+        bodies = []
+        for floor in snapshot.floors:
+            if floor.source is None:
+                bodies.append(self.encode_payload(floor.to_dict(), compress))
+            else:
+                source, entry = floor.source
+                body, source_flags = source.read_chunk(entry)
+                bodies.append(self._recompress(body, source_flags, flags))
+
+        entries = []
+        offset = _HEADER.size
+        for floor, body in zip(snapshot.floors, bodies):
+            entries.append(FloorIndexEntry(floor.id, floor.name, offset, len(body), floor.underlay))
+            offset += len(body)
+
+        target = BinaryBuildingSource.for_path(file_path, flags)
+
+        # Chunks that stay in the overwritten file move together with the
+        # file replacement, so stubs reading from it never see stale offsets
+        def on_replaced():
+            target.flags = flags
+            for floor, entry in zip(snapshot.floors, entries):
+                if floor.source is not None and floor.source[0] is target:
+                    floor.source[1].offset = entry.offset
+                    floor.source[1].size = entry.size
+
+        with atomic_write(file_path, 'wb', replace_lock=target.lock, on_replaced=on_replaced) as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, flags, snapshot.id.bytes, len(entries), offset))
+            for body in bodies:
+                f.write(body)
+
+            index = _Writer()
+            self._encode_index(index, entries, snapshot.connections)
+            f.write(index.getvalue())
+
+        return [
+            (target, floor.source[1] if floor.source is not None and floor.source[0] is target else entry)
+            for floor, entry in zip(snapshot.floors, entries)
+        ]
+
+    # Saved floor chunks, the only sources a binary save can copy from
+    @staticmethod
+    def is_chunk_source(source) -> bool:
+        return isinstance(source, tuple) and isinstance(source[0], BinaryBuildingSource)
+
+    def chunk_to_dict(self, source: tuple) -> dict:
+        chunk_source, entry = source
+        body, flags = chunk_source.read_chunk(entry)
+        return self._floor_to_dict(entry, self.decode_payload(body, flags))
+
+    def apply_saved(self, snapshot: BuildingSnapshot, sources: list):
+        for floor, source in zip(snapshot.floors, sources):
+            if floor.floor.revision == floor.revision:
+                floor.floor.mark_saved(source)
+
+    def _recompress(self, body: bytes, source_flags: int, flags: int) -> bytes:
+        if source_flags & FLAG_COMPRESSED == flags & FLAG_COMPRESSED:
+            return body
+        if source_flags & FLAG_COMPRESSED:
+            return zlib.decompress(body)
+        return zlib.compress(body)
+
+    def encode_payload(self, floor_data: dict, compress: bool) -> bytes:
+        nodes = floor_data.get("nodes", [])
+        walls = floor_data.get("walls", [])
+        zones = floor_data.get("zones", [])
+        pois = floor_data.get("points_of_interest", [])
+
+        node_index = {node.get("id"): i for i, node in enumerate(nodes)}
+
+        payload = _Writer()
+
+        payload.u32(len(nodes))
+        payload.uuids([uuid.UUID(node.get("id")) for node in nodes])
+        payload.array(array("d", (node.get("x") for node in nodes)))
+        payload.array(array("d", (node.get("y") for node in nodes)))
+
+        payload.u32(len(walls))
+        payload.uuids([uuid.UUID(wall.get("id")) for wall in walls])
+        payload.array(array("I", (node_index[wall.get("start_node_id")] for wall in walls)))
+        payload.array(array("I", (node_index[wall.get("end_node_id")] for wall in walls)))
+
+        payload.u32(len(zones))
+        payload.uuids([uuid.UUID(zone.get("id")) for zone in zones])
+        payload.strings([zone.get("name", "") for zone in zones])
+        payload.array(array("B", (ZoneType[zone.get("type")].value for zone in zones)))
+        payload.array(array("I", (len(zone.get("corner_node_ids", [])) for zone in zones)))
+        payload.array(array("I", (node_index[node_id]
+                                  for zone in zones
+                                  for node_id in zone.get("corner_node_ids", []))))
+
+        payload.u32(len(pois))
+        payload.uuids([uuid.UUID(poi.get("id")) for poi in pois])
+        payload.strings([poi.get("name", "") for poi in pois])
+        payload.array(array("B", (PointOfInterestType[poi.get("type").upper()].value for poi in pois)))
+        payload.array(array("d", (float(poi.get("x")) for poi in pois)))
+        payload.array(array("d", (float(poi.get("y")) for poi in pois)))
+
+        fingerprints = [Fingerprints.from_list(zone.get("fingerprints", [])) for zone in zones]
+        payload.array(array("I", (len(zone_fingerprints) for zone_fingerprints in fingerprints)))
+        for zone_fingerprints in fingerprints:
+            payload.array(zone_fingerprints.sizes)
+        for zone_fingerprints in fingerprints:
+            payload.array(zone_fingerprints.tag_ids)
+        for zone_fingerprints in fingerprints:
+            payload.array(zone_fingerprints.rssis)
+
+        body = payload.getvalue()
+        if compress:
+            body = zlib.compress(body)
+
+        return body
+
+    def _encode_index(self, writer: _Writer, entries: list[FloorIndexEntry], connections: list[tuple]):
+        for entry in entries:
+            writer.raw(entry.id.bytes)
+            writer.string(entry.name)
+            writer.string(json.dumps(entry.underlay) if entry.underlay else "")
+            writer.u64(entry.offset)
+            writer.u32(entry.size)
+
+        writer.u32(len(connections))
+        for zone1_id, floor1, zone2_id, floor2 in connections:
+            writer.raw(zone1_id.bytes)
+            writer.u32(floor1)
+            writer.raw(zone2_id.bytes)
+            writer.u32(floor2)
+
+    # ------------------------------------
+    # ------------- Decoding -------------
+    # ------------------------------------
+    def decode(self, data: bytes, progress: Callable[[int, int], None] = None) -> Building:
+        index = self.decode_index(data)
+
+        building = Building(index.id)
+        zone_map = {}
+
+        for i, entry in enumerate(index.floors):
+            columns = self.decode_payload(self._chunk(data, entry), index.flags)
+
+            floor = Floor(entry.name, entry.id)
+            self._apply_underlay(floor, entry)
+            zone_map.update(self.populate_floor(floor, columns))
+            building.add_floor(floor)
+
+            if progress is not None:
+                progress(i + 1, len(index.floors))
+
+        for zone1_id, _, zone2_id, _ in index.connections:
+            building.add_connection(zone_map[zone1_id], zone_map[zone2_id])
+
+        return building
+
+    def decode_to_dict(self, data: bytes) -> dict:
+        index = self.decode_index(data)
+
+        floors = []
+        for entry in index.floors:
+            columns = self.decode_payload(self._chunk(data, entry), index.flags)
+            floors.append(self._floor_to_dict(entry, columns))
+
+        return {
+            "id": str(index.id),
+            "floors": floors,
+            "zone_connections": [
+                {
+                    "zone1_id": str(zone1_id),
+                    "zone2_id": str(zone2_id)
+                } for zone1_id, _, zone2_id, _ in index.connections
+            ]
+        }
+
+    def open_lazy(self, file_path: str) -> Building:
+        with open(file_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            self._check_header(header)
+
+            _, _, _, _, _, index_offset = _HEADER.unpack_from(header)
+            f.seek(index_offset)
+            index = self._decode_index(header, _Reader(f.read()))
+
+        source = BinaryBuildingSource.for_path(file_path, index.flags)
+        with source.lock:
+            source.flags = index.flags
+        building = Building(index.id)
+
+        for entry in index.floors:
+            floor = Floor(entry.name, entry.id, LazyFloorLoader(self, source, entry))
+            self._apply_underlay(floor, entry)
+            floor.mark_saved((source, entry))
+            building.add_floor(floor)
+
+        for zone1_id, floor1, zone2_id, floor2 in index.connections:
+            building.add_lazy_connection(zone1_id, building.floors[floor1],
+                                         zone2_id, building.floors[floor2])
+
+        return building
+
+    def decode_index(self, data: bytes) -> BuildingIndex:
+        self._check_header(data)
+
+        _, _, _, _, _, index_offset = _HEADER.unpack_from(data)
+        return self._decode_index(data, _Reader(data, index_offset))
+
+    def _check_header(self, header: bytes):
+        if len(header) < _PREFIX.size or not self.is_binary(header):
+            raise ValueError("Not a binary building file.")
+
+        _, version = _PREFIX.unpack_from(header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary building version: {version}.")
+
+        if len(header) < _HEADER.size:
+            raise ValueError("Unexpected end of binary building data.")
+
+    def _decode_index(self, header: bytes, reader: _Reader) -> BuildingIndex:
+        _, version, flags, building_id, floor_count, _ = _HEADER.unpack_from(header)
+
+        entries = []
+        for _ in range(floor_count):
+            floor_id = reader.uuids(1)[0]
+            name = reader.string()
+            underlay = reader.string()
+            offset = reader.u64()
+            size = reader.u32()
+            entries.append(FloorIndexEntry(floor_id, name, offset, size, json.loads(underlay) if underlay else None))
+
+        connections = []
+        for _ in range(reader.u32()):
+            zone1_id = reader.uuids(1)[0]
+            floor1 = reader.u32()
+            zone2_id = reader.uuids(1)[0]
+            floor2 = reader.u32()
+            connections.append((zone1_id, floor1, zone2_id, floor2))
+
+        return BuildingIndex(uuid.UUID(bytes=building_id), version, flags, entries, connections)
+
+    def _chunk(self, data: bytes, entry: FloorIndexEntry) -> bytes:
+        body = data[entry.offset:entry.offset + entry.size]
+        if len(body) != entry.size:
+            raise ValueError("Unexpected end of binary building data.")
+        return body
+
+    def _apply_underlay(self, floor: Floor, entry: FloorIndexEntry):
+        if entry.underlay:
+            floor.underlay = FloorUnderlay.from_dict(entry.underlay)
+
+    def decode_payload(self, body: bytes, flags: int) -> _FloorColumns:
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        payload = _Reader(body)
+        columns = _FloorColumns()
+
+        count = payload.u32()
+        columns.node_ids = payload.uuids(count)
+        columns.node_xs = payload.array("d", count)
+        columns.node_ys = payload.array("d", count)
+
+        count = payload.u32()
+        columns.wall_ids = payload.uuids(count)
+        columns.wall_starts = payload.array("I", count)
+        columns.wall_ends = payload.array("I", count)
+
+        count = payload.u32()
+        columns.zone_ids = payload.uuids(count)
+        columns.zone_names = payload.strings(count)
+        columns.zone_types = payload.array("B", count)
+        columns.zone_corner_counts = payload.array("I", count)
+        columns.zone_corners = payload.array("I", sum(columns.zone_corner_counts))
+
+        count = payload.u32()
+        columns.poi_ids = payload.uuids(count)
+        columns.poi_names = payload.strings(count)
+        columns.poi_types = payload.array("B", count)
+        columns.poi_xs = payload.array("d", count)
+        columns.poi_ys = payload.array("d", count)
+
+        columns.zone_fingerprint_counts = payload.array("I", len(columns.zone_ids))
+        columns.fingerprint_sizes = payload.array("I", sum(columns.zone_fingerprint_counts))
+
+        count = sum(columns.fingerprint_sizes)
+        columns.fingerprint_tag_ids = payload.array("h", count)
+        columns.fingerprint_rssis = payload.array("b", count)
+
+        if payload.remaining > 0:
+            raise ValueError("Unexpected data after the floor payload.")
+
+        return columns
+
+    def _zone_fingerprints(self, columns: _FloorColumns) -> list[Fingerprints]:
+        fingerprints = []
+        size_start = 0
+        start = 0
+        for count in columns.zone_fingerprint_counts:
+            sizes = columns.fingerprint_sizes[size_start:size_start + count]
+            size_start += count
+
+            end = start + sum(sizes)
+            fingerprints.append(Fingerprints.from_sizes(columns.fingerprint_tag_ids[start:end],
+                                                        columns.fingerprint_rssis[start:end],
+                                                        sizes))
+            start = end
+
+        return fingerprints
+
+    def populate_floor(self, floor: Floor, columns: _FloorColumns) -> dict:
+        zone_map = {}
+
+        floor.reserve_nodes(len(columns.node_ids))
+        nodes = [
+            Node(x, y, None, node_id)
+            for node_id, x, y in zip(columns.node_ids, columns.node_xs, columns.node_ys)
+        ]
+        for node in nodes:
+            floor.add(node)
+
+        start = 0
+        for zone_id, name, type, count, fingerprints in zip(columns.zone_ids,
+                                                            columns.zone_names,
+                                                            columns.zone_types,
+                                                            columns.zone_corner_counts,
+                                                            self._zone_fingerprints(columns)):
+            corners = [nodes[i] for i in columns.zone_corners[start:start + count]]
+            start += count
+
+            zone = Zone(corners, name, ZoneType(type), zone_id, fingerprints)
+            floor.add(zone)
+            zone_map[zone_id] = zone
+
+        for poi_id, name, type, x, y in zip(columns.poi_ids,
+                                            columns.poi_names,
+                                            columns.poi_types,
+                                            columns.poi_xs,
+                                            columns.poi_ys):
+            poi = PointOfInterest(Point(x, y), name, PointOfInterestType(type), poi_id)
+            floor.add(poi)
+
+        for wall_id, start_index, end_index in zip(columns.wall_ids,
+                                                   columns.wall_starts,
+                                                   columns.wall_ends):
+            wall = Wall(nodes[start_index], nodes[end_index], wall_id)
+            floor.add(wall)
+
+        return zone_map
+
+    def _floor_to_dict(self, entry: FloorIndexEntry, columns: _FloorColumns) -> dict:
+        node_ids = [str(node_id) for node_id in columns.node_ids]
+
+        zones = []
+        start = 0
+        for zone_id, name, type, count, fingerprints in zip(columns.zone_ids,
+                                                            columns.zone_names,
+                                                            columns.zone_types,
+                                                            columns.zone_corner_counts,
+                                                            self._zone_fingerprints(columns)):
+            corners = columns.zone_corners[start:start + count]
+            start += count
+
+            zones.append({
+                "id": str(zone_id),
+                "name": name,
+                "type": ZoneType(type).name,
+                "corner_node_ids": [node_ids[i] for i in corners],
+                "fingerprints": fingerprints.to_list(),
+            })
+
+        data = {
+            "id": str(entry.id),
+            "name": entry.name,
+            "nodes": [
+                {
+                    "id": node_id,
+                    "x": x,
+                    "y": y
+                } for node_id, x, y in zip(node_ids, columns.node_xs, columns.node_ys)
+            ],
+            "walls": [
+                {
+                    "id": str(wall_id),
+                    "start_node_id": node_ids[start_index],
+                    "end_node_id": node_ids[end_index],
+                } for wall_id, start_index, end_index in zip(columns.wall_ids,
+                                                             columns.wall_starts,
+                                                             columns.wall_ends)
+            ],
+            "zones": zones,
+            "points_of_interest": [
+                {
+                    "id": str(poi_id),
+                    "x": x,
+                    "y": y,
+                    "name": name,
+                    "type": PointOfInterestType(type).name,
+                } for poi_id, name, type, x, y in zip(columns.poi_ids,
+                                                      columns.poi_names,
+                                                      columns.poi_types,
+                                                      columns.poi_xs,
+                                                      columns.poi_ys)
+            ],
+        }
+        if entry.underlay:
+            data["underlay"] = entry.underlay
+        return data
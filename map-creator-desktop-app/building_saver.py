@@ -0,0 +1,68 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from model import Building
+from building_serializer import BuildingSerializer
+
+class _SaveTaskSignals(QObject):
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+
+class _SaveTask(QRunnable):
+    def __init__(self, serializer: BuildingSerializer, snapshot, file_path: str, binary: bool, compress: bool):
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.serializer = serializer
+        self.snapshot = snapshot
+        self.file_path = file_path
+        self.binary = binary
+        self.compress = compress
+        self.signals = _SaveTaskSignals()
+
+    def run(self):
+        try:
+            result = self.serializer.write_snapshot(self.snapshot, self.file_path, self.binary, self.compress)
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+
+        self.signals.finished.emit(self, result)
+
+class BuildingSaver(QObject):
+    saved = Signal(str)
+    save_failed = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._serializer = BuildingSerializer()
+        self._tasks = set()
+
+        # Saves run one after another, so they reach the disk in order
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    @property
+    def is_saving(self) -> bool:
+        return len(self._tasks) > 0
+
+    def save(self, building: Building, file_path: str, binary: bool = False, compress: bool = True):
+        snapshot = self._serializer.snapshot(building, file_path, binary)
+
+        task = _SaveTask(self._serializer, snapshot, file_path, binary, compress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+
+        self._tasks.add(task)
+        self._pool.start(task)
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_finished(self, task: _SaveTask, result):
+        self._tasks.discard(task)
+        self._serializer.apply_saved(task.snapshot, result)
+        self.saved.emit(task.file_path)
+
+    def _on_failed(self, task: _SaveTask, error: str):
+        self._tasks.discard(task)
+        self.save_failed.emit(task.file_path, error)
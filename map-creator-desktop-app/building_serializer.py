@@ -1,95 +1,320 @@
 import json
+import os
 import uuid
 
-from PySide6.QtCore import QPointF
+from typing import Callable
+
 from model import (
-    Building, Floor, Node, Zone, PointOfInterest, 
-    Wall, ZoneType, PointOfInterestType
+    Building, Floor, Node, Zone, PointOfInterest,
+    Wall, ZoneType, PointOfInterestType, Fingerprints, Point, FloorUnderlay
 )
+from building_binary_codec import BinaryBuildingCodec, BuildingSnapshot, MAGIC
+from utils.atomic_file import atomic_write
+from utils.json_stream import JsonStreamReader
+
+# JSON text of a saved floor's elements, spliced back into the next JSON save
+# while the floor stays unchanged
+class JsonFloorSource:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _file_key(file_path: str) -> str:
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def _json_members(data: dict, indent: int) -> str:
+    # Members of an indent=4 dump, re-indented to sit inside an object at indent
+    lines = json.dumps(data, indent=4).split("\n")[1:-1]
+    return "\n".join(" " * indent + line for line in lines)
+
 
 class BuildingSerializer:
-    def save_to_file(self, building: Building, file_path: str):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            data = self.serialize(building)
+    def __init__(self):
+        self._binary_codec = BinaryBuildingCodec()
+
+    def save_to_file(self,
+                     building: Building,
+                     file_path: str,
+                     binary: bool = False,
+                     compress: bool = True):
+        snapshot = self.snapshot(building, file_path, binary)
+        result = self.write_snapshot(snapshot, file_path, binary, compress)
+        self.apply_saved(snapshot, result)
+        return True
+
+    # Taken on the GUI thread, everything below write_snapshot may run
+    # on a worker thread
+    def snapshot(self, building: Building, file_path: str, binary: bool) -> BuildingSnapshot:
+        if binary:
+            return BuildingSnapshot(building, BinaryBuildingCodec.is_chunk_source)
+
+        # Unloaded floors read from their chunk, which a JSON save over
+        # the same file would replace
+        target = _file_key(file_path)
+        for floor in building.floors:
+            source = floor.source
+            if (not floor.is_loaded and BinaryBuildingCodec.is_chunk_source(source)
+                    and _file_key(source[0].file_path) == target):
+                floor.ensure_loaded()
+
+        return BuildingSnapshot(building, lambda source: True)
+
+    def write_snapshot(self, snapshot: BuildingSnapshot, file_path: str, binary: bool, compress: bool = True):
+        if binary:
+            return self._binary_codec.write_snapshot(snapshot, file_path, compress)
+        return self._write_json_snapshot(snapshot, file_path)
+
+    def apply_saved(self, snapshot: BuildingSnapshot, result: list):
+        self._binary_codec.apply_saved(snapshot, result)
+
+    # Writes the same text as json.dump(building.to_dict(), f, indent=4)
+    def _write_json_snapshot(self, snapshot: BuildingSnapshot, file_path: str) -> list:
+        target = _file_key(file_path)
+        sources = []
+        texts = []
+        for floor in snapshot.floors:
+            if isinstance(floor.source, JsonFloorSource):
+                sources.append(floor.source)
+                texts.append(floor.source.text)
+                continue
+
+            data = floor.to_dict() if floor.source is None else self._binary_codec.chunk_to_dict(floor.source)
+            elements = {key: data[key] for key in ("nodes", "walls", "zones", "points_of_interest")}
+            texts.append(_json_members(elements, 8))
+
+            # Chunks in other files stay valid, and unloaded floors still need them
+            if floor.source is not None and _file_key(floor.source[0].file_path) != target:
+                sources.append(floor.source)
+            else:
+                sources.append(JsonFloorSource(texts[-1]))
+
+        floors = []
+        for floor, text in zip(snapshot.floors, texts):
+            members = [_json_members({"id": str(floor.id), "name": floor.name}, 8), text]
+            if floor.underlay is not None:
+                members.append(_json_members({"underlay": floor.underlay}, 8))
+            floors.append("        {\n" + ",\n".join(members) + "\n        }")
+
+        connections = [
+            {"zone1_id": str(zone1_id), "zone2_id": str(zone2_id)}
+            for zone1_id, _, zone2_id, _ in snapshot.connections
+        ]
+
+        with atomic_write(file_path, 'w', encoding='utf-8') as f:
+            f.write("{\n" + _json_members({"id": str(snapshot.id)}, 0) + ",\n")
+            if floors:
+                f.write('    "floors": [\n' + ",\n".join(floors) + "\n    ],\n")
+            else:
+                f.write('    "floors": [],\n')
+            f.write(_json_members({"zone_connections": connections}, 0) + "\n}")
+
+        return sources
+
+    def load_from_file(self,
+                       file_path: str,
+                       progress: Callable[[int, int], None] = None,
+                       lazy: bool = False) -> Building:
+        if self.is_binary_file(file_path):
+            if lazy:
+                return self._binary_codec.open_lazy(file_path)
+
+            with open(file_path, 'rb') as f:
+                return self._binary_codec.decode(f.read(), progress)
+
+        with open(file_path, 'rb') as f:
+            reader = JsonStreamReader(f, progress=progress)
+            return self._deserialize_stream(reader)
+
+    def convert_file(self,
+                     source_path: str,
+                     target_path: str,
+                     binary: bool,
+                     compress: bool = True):
+        if self.is_binary_file(source_path):
+            with open(source_path, 'rb') as f:
+                data = self._binary_codec.decode_to_dict(f.read())
+        else:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        return self._write_data(data, target_path, binary, compress)
+
+    def is_binary_file(self, file_path: str) -> bool:
+        with open(file_path, 'rb') as f:
+            return BinaryBuildingCodec.is_binary(f.read(len(MAGIC)))
+
+    def _write_data(self, data: dict, file_path: str, binary: bool, compress: bool):
+        if binary:
+            with atomic_write(file_path, 'wb') as f:
+                f.write(self._binary_codec.encode(data, compress))
+                return True
+
+        with atomic_write(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4)
             return True
-        
-        return False
-
-    def load_from_file(self, file_path: str) -> Building:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return self.deserialize(data)
 
     def serialize(self, building: Building) -> dict:
         return building.to_dict()
-    
+
     def deserialize(self, data: dict) -> Building:
-        building = Building()
-        id_map = {}
+        building_id = data.get("id")
+        building = Building(uuid.UUID(building_id) if building_id else None)
+        zone_map = {}
 
         for floor_data in data.get("floors"):
             floor_name = floor_data.get("name", "Unnamed Floor")
             floor_uuid = uuid.UUID(floor_data.get("id"))
             floor = Floor(floor_name, floor_uuid)
-            
-            id_map[floor_uuid] = floor
-            building.add_floor(floor)
+            node_map = {}
 
-            for node_data in floor_data.get("nodes", []):
-                pos_x = node_data.get("x")
-                pos_y = node_data.get("y")
-                node_uuid = uuid.UUID(node_data.get("id"))
-                node = Node(pos_x, pos_y, None, node_uuid)
+            if floor_data.get("underlay"):
+                floor.underlay = FloorUnderlay.from_dict(floor_data["underlay"])
 
-                floor.add(node)
-                id_map[node_uuid] = node
+            for node_data in floor_data.get("nodes", []):
+                self._add_node(floor, node_data, node_map)
 
             for zone_data in floor_data.get("zones", []):
-                zone_name = zone_data.get("name", "Unnamed Zone")
-                zone_type = ZoneType[zone_data.get("type")]
-                zone_uuid = uuid.UUID(zone_data.get("id"))
+                if not self._add_zone(floor, zone_data, node_map, zone_map):
+                    raise KeyError(f"Zone {zone_data.get('id')} references unknown nodes.")
+
+            for poi_data in floor_data.get("points_of_interest", []):
+                self._add_point_of_interest(floor, poi_data)
 
-                corner_node_ids = zone_data.get("corner_node_ids", [])
-                corner_nodes = [id_map[uuid.UUID(node_id)] for node_id in corner_node_ids]
+            for wall_data in floor_data.get("walls", []):
+                if not self._add_wall(floor, wall_data, node_map):
+                    raise KeyError(f"Wall {wall_data.get('id')} references unknown nodes.")
 
-                zone = Zone(corner_nodes, zone_name, zone_type, zone_uuid)
+            building.add_floor(floor)
 
-                floor.add(zone)
-                id_map[zone_uuid] = zone
+        for connection_data in data.get("zone_connections", []):
+            self._add_connection(building, connection_data, zone_map)
 
-            for poi_data in floor_data.get("points_of_interest", []):
-                poi_name = poi_data.get("name", "Unnamed POI")
-                pos_x = float(poi_data.get("x"))
-                pos_y = float(poi_data.get("y"))
-                poi_uuid = uuid.UUID(poi_data.get("id"))
-                poi_type = PointOfInterestType[poi_data.get("type").upper()]
+        return building
 
-                poi = PointOfInterest(QPointF(pos_x, pos_y), poi_name, poi_type, poi_uuid)
+    # ------------------------------------
+    # -------- Streaming loading ---------
+    # ------------------------------------
+    def _deserialize_stream(self, reader: JsonStreamReader) -> Building:
+        building = Building()
+        zone_map = {}
 
-                floor.add(poi)
-                id_map[poi_uuid] = poi
+        for key in reader.iter_object():
+            if key == "id":
+                building.id = uuid.UUID(reader.read_value())
+            elif key == "floors":
+                for _ in reader.iter_array():
+                    floor = self._deserialize_floor_stream(reader, zone_map)
+                    building.add_floor(floor)
+            elif key == "zone_connections":
+                for _ in reader.iter_array():
+                    self._add_connection(building, reader.read_value(), zone_map)
+            else:
+                reader.skip_value()
 
-            for wall_data in floor_data.get("walls", []):
-                start_node_id = uuid.UUID(wall_data.get("start_node_id"))
-                end_node_id = uuid.UUID(wall_data.get("end_node_id"))
-                wall_uuid = uuid.UUID(wall_data.get("id"))
+        return building
 
-                start_node = id_map[start_node_id]
-                end_node = id_map[end_node_id]
+    def _deserialize_floor_stream(self, reader: JsonStreamReader, zone_map: dict) -> Floor:
+        floor = Floor()
+        node_map = {}
 
-                wall = Wall(start_node, end_node, wall_uuid)
+        # elements read before the nodes they reference are resolved at the end
+        pending_zones = []
+        pending_walls = []
 
-                floor.add(wall)
-                id_map[wall_uuid] = wall
+        for key in reader.iter_object():
+            if key == "id":
+                floor.uuid = uuid.UUID(reader.read_value())
+            elif key == "name":
+                floor.name = reader.read_value()
+            elif key == "nodes":
+                for _ in reader.iter_array():
+                    self._add_node(floor, reader.read_value(), node_map)
+            elif key == "zones":
+                for _ in reader.iter_array():
+                    zone_data = reader.read_value()
+                    if not self._add_zone(floor, zone_data, node_map, zone_map):
+                        pending_zones.append(zone_data)
+            elif key == "walls":
+                for _ in reader.iter_array():
+                    wall_data = reader.read_value()
+                    if not self._add_wall(floor, wall_data, node_map):
+                        pending_walls.append(wall_data)
+            elif key == "points_of_interest":
+                for _ in reader.iter_array():
+                    self._add_point_of_interest(floor, reader.read_value())
+            elif key == "underlay":
+                underlay_data = reader.read_value()
+                if underlay_data:
+                    floor.underlay = FloorUnderlay.from_dict(underlay_data)
+            else:
+                reader.skip_value()
 
-        for connection_data in data.get("zone_connections", []):
-            zone1_id = uuid.UUID(connection_data.get("zone1_id"))
-            zone2_id = uuid.UUID(connection_data.get("zone2_id"))
+        for zone_data in pending_zones:
+            if not self._add_zone(floor, zone_data, node_map, zone_map):
+                raise KeyError(f"Zone {zone_data.get('id')} references unknown nodes.")
+
+        for wall_data in pending_walls:
+            if not self._add_wall(floor, wall_data, node_map):
+                raise KeyError(f"Wall {wall_data.get('id')} references unknown nodes.")
+
+        return floor
+
+    # ------------------------------------
+    # -------- Element factories ---------
+    # ------------------------------------
+    def _add_node(self, floor: Floor, node_data: dict, node_map: dict):
+        pos_x = node_data.get("x")
+        pos_y = node_data.get("y")
+        node_uuid = uuid.UUID(node_data.get("id"))
+        node = Node(pos_x, pos_y, None, node_uuid)
+
+        floor.add(node)
+        node_map[node_uuid] = node
+
+    def _add_zone(self, floor: Floor, zone_data: dict, node_map: dict, zone_map: dict) -> bool:
+        corner_node_ids = [uuid.UUID(node_id) for node_id in zone_data.get("corner_node_ids", [])]
+        if any(node_id not in node_map for node_id in corner_node_ids):
+            return False
+
+        zone_name = zone_data.get("name", "Unnamed Zone")
+        zone_type = ZoneType[zone_data.get("type")]
+        zone_uuid = uuid.UUID(zone_data.get("id"))
+        corner_nodes = [node_map[node_id] for node_id in corner_node_ids]
+
+        fingerprints = Fingerprints.from_list(zone_data.get("fingerprints", []))
+
+        zone = Zone(corner_nodes, zone_name, zone_type, zone_uuid, fingerprints)
+
+        floor.add(zone)
+        zone_map[zone_uuid] = zone
+        return True
+
+    def _add_point_of_interest(self, floor: Floor, poi_data: dict):
+        poi_name = poi_data.get("name", "Unnamed POI")
+        pos_x = float(poi_data.get("x"))
+        pos_y = float(poi_data.get("y"))
+        poi_uuid = uuid.UUID(poi_data.get("id"))
+        poi_type = PointOfInterestType[poi_data.get("type").upper()]
+
+        poi = PointOfInterest(Point(pos_x, pos_y), poi_name, poi_type, poi_uuid)
+
+        floor.add(poi)
+
+    def _add_wall(self, floor: Floor, wall_data: dict, node_map: dict) -> bool:
+        start_node = node_map.get(uuid.UUID(wall_data.get("start_node_id")))
+        end_node = node_map.get(uuid.UUID(wall_data.get("end_node_id")))
+        if start_node is None or end_node is None:
+            return False
+
+        wall_uuid = uuid.UUID(wall_data.get("id"))
+        wall = Wall(start_node, end_node, wall_uuid)
 
-            zone1 = id_map[zone1_id]
-            zone2 = id_map[zone2_id]
+        floor.add(wall)
+        return True
 
-            building.add_connection(zone1, zone2)
+    def _add_connection(self, building: Building, connection_data: dict, zone_map: dict):
+        zone1 = zone_map[uuid.UUID(connection_data.get("zone1_id"))]
+        zone2 = zone_map[uuid.UUID(connection_data.get("zone2_id"))]
 
-        return building    
\ No newline at end of file
+        building.add_connection(zone1, zone2)
@@ -0,0 +1,537 @@
+from enum import Enum
+from typing import Callable
+
+import numpy as np
+
+from model import Building, Floor, MapObject, Node, Wall, Zone
+from model.spatial_index import polygon_contains
+from utils.geometry_utils import find_self_intersection
+
+# Coordinates closer than this are treated as the same point
+EPSILON = 1e-6
+
+# Boxes covering more grid cells than this, such as an outline around the
+# whole floor, are tested against every other box instead of being bucketed
+MAX_BOX_CELLS = 64
+
+class IssueKind(Enum):
+    OVERLAPPING_ZONES = "Overlapping zones"
+    ZONE_CROSSES_WALL = "Zone crosses wall"
+    ZERO_LENGTH_WALL = "Zero length wall"
+    DUPLICATE_NODES = "Duplicate nodes"
+    ORPHANED_NODE = "Orphaned node"
+    DEGENERATE_ZONE = "Degenerate zone"
+    SELF_INTERSECTING_ZONE = "Self-intersecting zone"
+    DANGLING_CONNECTION = "Dangling connection"
+
+class ValidationIssue:
+    __slots__ = ("kind", "floor", "elements", "message", "position")
+
+    def __init__(self,
+                 kind: IssueKind,
+                 floor: Floor,
+                 elements: list[MapObject],
+                 message: str,
+                 position: tuple[float, float] = None):
+        self.kind = kind
+        self.floor = floor
+        self.elements = elements
+        self.message = message
+        self.position = position
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue({self.kind.name}, {self.message!r})"
+
+class ValidationCancelled(Exception):
+    pass
+
+
+# Geometry of one floor copied into arrays on the GUI thread, so the checks
+# can run on a worker thread while the floor keeps being edited
+class FloorGeometry:
+    def __init__(self, floor: Floor):
+        self.floor = floor
+        self.floor_name = floor.name
+
+        nodes = list(floor.nodes)
+        walls = list(floor.walls)
+        zones = list(floor.zones)
+        node_index = {node: i for i, node in enumerate(nodes)}
+
+        self.nodes = nodes
+        self.xs = np.fromiter((node.x for node in nodes), dtype=np.float64, count=len(nodes))
+        self.ys = np.fromiter((node.y for node in nodes), dtype=np.float64, count=len(nodes))
+
+        # Bit mask of what a node belongs to: 1 walls, 2 zones, 4 anything
+        # else, 0 for nothing
+        owner_kinds = {Wall: 1, Zone: 2}
+        self.owner_kinds = np.fromiter(
+            (_owner_kind(node, owner_kinds) for node in nodes), dtype=np.int8, count=len(nodes)
+        )
+
+        # Nodes of other floors or of no floor at all are left out of the
+        # walls and zones they belong to
+        self.walls = walls
+        self.wall_nodes = np.array(
+            [(node_index.get(wall.start_node, -1), node_index.get(wall.end_node, -1)) for wall in walls],
+            dtype=np.intp,
+        ).reshape(-1, 2)
+
+        self.zones = zones
+        self.zone_names = [zone.name for zone in zones]
+        corners = [
+            [node_index[node] for node in zone.corner_nodes if node in node_index]
+            for zone in zones
+        ]
+        self.corner_counts = np.fromiter((len(c) for c in corners), dtype=np.intp, count=len(zones))
+        self.corner_offsets = np.concatenate(([0], np.cumsum(self.corner_counts))).astype(np.intp)
+        self.corner_nodes = np.fromiter(
+            (i for c in corners for i in c), dtype=np.intp, count=int(self.corner_offsets[-1])
+        )
+
+
+class ValidationSnapshot:
+    def __init__(self, building: Building):
+        self.floors = []
+        for floor in building.floors:
+            floor.ensure_loaded()
+            self.floors.append(FloorGeometry(floor))
+
+        # Connections whose zones are gone from their floor or whose floor
+        # left the building
+        floors = set(building.floors)
+        self.dangling_connections = []
+        for zone1_id, floor1, zone2_id, floor2 in building.get_connection_records():
+            zone1 = floor1.get_element(zone1_id) if floor1 in floors else None
+            zone2 = floor2.get_element(zone2_id) if floor2 in floors else None
+            if type(zone1) is not Zone or type(zone2) is not Zone:
+                self.dangling_connections.append((zone1_id, floor1, zone1, zone2_id, floor2, zone2))
+
+
+class BuildingValidator:
+    def snapshot(self, building: Building) -> ValidationSnapshot:
+        return ValidationSnapshot(building)
+
+    def validate(self,
+                 snapshot: ValidationSnapshot,
+                 progress: Callable[[int, int], None] = None,
+                 cancelled: Callable[[], bool] = None) -> list[ValidationIssue]:
+        issues = []
+        total = len(snapshot.floors) + 1
+
+        def step(done: int):
+            if cancelled is not None and cancelled():
+                raise ValidationCancelled()
+            if progress is not None:
+                progress(done, total)
+
+        step(0)
+        for done, geometry in enumerate(snapshot.floors, 1):
+            for check in (
+                self._check_zero_length_walls,
+                self._check_duplicate_nodes,
+                self._check_orphaned_nodes,
+                self._check_degenerate_zones,
+                self._check_self_intersecting_zones,
+                self._check_zones_crossing_walls,
+                self._check_overlapping_zones,
+            ):
+                issues.extend(check(geometry))
+                step(done - 1)
+            step(done)
+
+        issues.extend(self._check_connections(snapshot))
+        step(total)
+        return issues
+
+    def validate_building(self, building: Building) -> list[ValidationIssue]:
+        return self.validate(self.snapshot(building))
+
+    # ------------------------------------
+    # -------------- Checks --------------
+    # ------------------------------------
+    def _check_zero_length_walls(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        wall_ids = np.flatnonzero((geometry.wall_nodes >= 0).all(axis=1))
+        starts, ends = geometry.wall_nodes[wall_ids, 0], geometry.wall_nodes[wall_ids, 1]
+
+        lengths = np.hypot(geometry.xs[starts] - geometry.xs[ends], geometry.ys[starts] - geometry.ys[ends])
+        found = np.flatnonzero(lengths <= EPSILON)
+
+        return [
+            ValidationIssue(
+                IssueKind.ZERO_LENGTH_WALL, geometry.floor, [geometry.walls[wall_ids[w]]],
+                "Wall starts and ends at the same point",
+                (float(geometry.xs[starts[w]]), float(geometry.ys[starts[w]])),
+            )
+            for w in found
+        ]
+
+    def _check_duplicate_nodes(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        if len(geometry.nodes) < 2:
+            return []
+
+        # Nodes of the same layer sharing a spot could be one node
+        keys_x = np.round(geometry.xs / EPSILON).astype(np.int64)
+        keys_y = np.round(geometry.ys / EPSILON).astype(np.int64)
+        kinds = geometry.owner_kinds
+
+        order = np.lexsort((kinds, keys_y, keys_x))
+        same = ((keys_x[order][1:] == keys_x[order][:-1])
+                & (keys_y[order][1:] == keys_y[order][:-1])
+                & (kinds[order][1:] == kinds[order][:-1]))
+        if not same.any():
+            return []
+
+        # Runs of equal keys in sorted order
+        starts = np.flatnonzero(same & ~np.concatenate(([False], same[:-1])))
+        ends = np.flatnonzero(same & ~np.concatenate((same[1:], [False]))) + 2
+
+        issues = []
+        for start, end in zip(starts, ends):
+            members = order[start:end]
+            x, y = float(geometry.xs[members[0]]), float(geometry.ys[members[0]])
+            issues.append(ValidationIssue(
+                IssueKind.DUPLICATE_NODES, geometry.floor, [geometry.nodes[i] for i in members],
+                f"{len(members)} nodes at ({x:g}, {y:g})", (x, y),
+            ))
+        return issues
+
+    def _check_orphaned_nodes(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        return [
+            ValidationIssue(
+                IssueKind.ORPHANED_NODE, geometry.floor, [geometry.nodes[i]],
+                "Node belongs to no wall or zone", (float(geometry.xs[i]), float(geometry.ys[i])),
+            )
+            for i in np.flatnonzero(geometry.owner_kinds == 0)
+        ]
+
+    def _check_degenerate_zones(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        counts = geometry.corner_counts
+        areas = _zone_areas(geometry)
+
+        issues = []
+        for z in np.flatnonzero((counts < 3) | (np.abs(areas) <= EPSILON)):
+            if counts[z] < 3:
+                message = f"Zone \"{geometry.zone_names[z]}\" has {counts[z]} corners"
+            else:
+                message = f"Zone \"{geometry.zone_names[z]}\" has no area"
+
+            issues.append(ValidationIssue(
+                IssueKind.DEGENERATE_ZONE, geometry.floor, [geometry.zones[z]], message,
+                _zone_center(geometry, z),
+            ))
+        return issues
+
+    def _check_self_intersecting_zones(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        # Zones without area are already reported as degenerate
+        areas = _zone_areas(geometry)
+        zone_ids = np.flatnonzero((geometry.corner_counts >= 3) & (np.abs(areas) > EPSILON))
+
+        issues = []
+        for z in zone_ids:
+            points = _zone_points(geometry, z)
+            crossing = find_self_intersection(points, closed=True)
+            if crossing is None:
+                continue
+
+            (x1, y1), (x2, y2) = points[crossing[0]], points[(crossing[0] + 1) % len(points)]
+            issues.append(ValidationIssue(
+                IssueKind.SELF_INTERSECTING_ZONE, geometry.floor, [geometry.zones[z]],
+                f"Outline of zone \"{geometry.zone_names[z]}\" crosses itself",
+                ((x1 + x2) / 2, (y1 + y2) / 2),
+            ))
+        return issues
+
+    def _check_zones_crossing_walls(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        wall_ids = np.flatnonzero((geometry.wall_nodes >= 0).all(axis=1))
+        wall_nodes = geometry.wall_nodes[wall_ids]
+        edge_zones, edge_starts, edge_ends = _zone_edges(geometry)
+        if len(wall_nodes) == 0 or len(edge_zones) == 0:
+            return []
+
+        xs, ys = geometry.xs, geometry.ys
+        walls = _segments(xs, ys, wall_nodes[:, 0], wall_nodes[:, 1])
+        edges = _segments(xs, ys, edge_starts, edge_ends)
+
+        w, e = _candidate_pairs(_boxes(*walls), _boxes(*edges))
+        crossing = _proper_crossings(*(s[w] for s in walls), *(s[e] for s in edges))
+        w, e = w[crossing], e[crossing]
+
+        # One issue per wall and zone, however many edges the wall crosses
+        pairs = np.unique(np.stack((wall_ids[w], edge_zones[e]), axis=1), axis=0)
+
+        issues = []
+        for wall_id, zone_id in pairs:
+            wall = geometry.walls[wall_id]
+            start, end = geometry.wall_nodes[wall_id]
+            issues.append(ValidationIssue(
+                IssueKind.ZONE_CROSSES_WALL, geometry.floor, [geometry.zones[zone_id], wall],
+                f"Wall crosses zone \"{geometry.zone_names[zone_id]}\"",
+                (float(xs[start] + xs[end]) / 2, float(ys[start] + ys[end]) / 2),
+            ))
+        return issues
+
+    def _check_overlapping_zones(self, geometry: FloorGeometry) -> list[ValidationIssue]:
+        edge_zones, edge_starts, edge_ends = _zone_edges(geometry)
+        if len(geometry.zones) < 2 or len(edge_zones) == 0:
+            return []
+
+        xs, ys = geometry.xs, geometry.ys
+        edges = _segments(xs, ys, edge_starts, edge_ends)
+
+        # Edges of two zones crossing each other
+        a, b = _candidate_pairs(_boxes(*edges), _boxes(*edges))
+        keep = edge_zones[a] < edge_zones[b]
+        a, b = a[keep], b[keep]
+        crossing = _proper_crossings(*(s[a] for s in edges), *(s[b] for s in edges))
+        overlapping = {
+            (int(z1), int(z2))
+            for z1, z2 in np.unique(np.stack((edge_zones[a][crossing], edge_zones[b][crossing]), axis=1), axis=0)
+        }
+
+        # Zones without crossing edges still overlap when one lies inside
+        # the other; zones merely sharing an edge do not
+        zone_ids = np.flatnonzero(geometry.corner_counts >= 3)
+        zone_boxes = _zone_boxes(geometry, zone_ids)
+        z1, z2 = _candidate_pairs(zone_boxes, zone_boxes, strict=True)
+        keep = zone_ids[z1] < zone_ids[z2]
+        for first, second in zip(zone_ids[z1][keep], zone_ids[z2][keep]):
+            pair = (int(first), int(second))
+            if pair not in overlapping and (
+                _zone_inside(geometry, pair[0], pair[1]) or _zone_inside(geometry, pair[1], pair[0])
+            ):
+                overlapping.add(pair)
+
+        return [
+            ValidationIssue(
+                IssueKind.OVERLAPPING_ZONES, geometry.floor, [geometry.zones[first], geometry.zones[second]],
+                f"Zones \"{geometry.zone_names[first]}\" and \"{geometry.zone_names[second]}\" overlap",
+                _zone_center(geometry, first),
+            )
+            for first, second in sorted(overlapping)
+        ]
+
+    def _check_connections(self, snapshot: ValidationSnapshot) -> list[ValidationIssue]:
+        issues = []
+        for zone1_id, floor1, zone1, zone2_id, floor2, zone2 in snapshot.dangling_connections:
+            # Reported on the side that is still there
+            if zone1 is None:
+                zone1_id, floor1, zone1, zone2_id, floor2, zone2 = zone2_id, floor2, zone2, zone1_id, floor1, zone1
+
+            elements = [zone1] if zone1 is not None else []
+            name = f"\"{zone1.name}\"" if zone1 is not None else str(zone1_id)
+            issues.append(ValidationIssue(
+                IssueKind.DANGLING_CONNECTION, floor1, elements,
+                f"Connection of zone {name} points to missing zone {zone2_id}",
+                _bounds_center(zone1) if zone1 is not None else None,
+            ))
+        return issues
+
+
+# ------------------------------------
+# ------------- Helpers --------------
+# ------------------------------------
+def _owner_kind(node: Node, owner_kinds: dict) -> int:
+    kind = 0
+    for owner in node.owners:
+        kind |= owner_kinds.get(type(owner), 4)
+    return kind
+
+def _segments(xs: np.ndarray, ys: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    return xs[starts], ys[starts], xs[ends], ys[ends]
+
+def _boxes(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray):
+    return np.minimum(x1, x2), np.minimum(y1, y2), np.maximum(x1, x2), np.maximum(y1, y2)
+
+def _zone_edges(geometry: FloorGeometry):
+    # Zone of every outline edge and its two corner nodes, the last edge of
+    # each zone closing the outline
+    counts = geometry.corner_counts
+    zones = np.flatnonzero(counts >= 2)
+    sizes = counts[zones]
+
+    edge_zones = np.repeat(zones, sizes)
+    first = np.repeat(geometry.corner_offsets[zones], sizes)
+    local = np.arange(len(edge_zones)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    size = np.repeat(sizes, sizes)
+
+    starts = geometry.corner_nodes[first + local]
+    ends = geometry.corner_nodes[first + (local + 1) % size]
+    return edge_zones, starts, ends
+
+def _zone_areas(geometry: FloorGeometry) -> np.ndarray:
+    edge_zones, starts, ends = _zone_edges(geometry)
+    xs, ys = geometry.xs, geometry.ys
+    cross = xs[starts] * ys[ends] - xs[ends] * ys[starts]
+
+    areas = np.zeros(len(geometry.zones), dtype=np.float64)
+    np.add.at(areas, edge_zones, cross)
+    return areas / 2
+
+def _zone_boxes(geometry: FloorGeometry, zone_ids: np.ndarray):
+    counts = geometry.corner_counts
+    nonempty = np.flatnonzero(counts > 0)
+    if len(zone_ids) == 0 or len(nonempty) == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return empty, empty, empty, empty
+
+    # Empty zones take no room in corner_nodes, so each remaining zone's
+    # corners run up to the next one's offset
+    xs = geometry.xs[geometry.corner_nodes]
+    ys = geometry.ys[geometry.corner_nodes]
+    starts = geometry.corner_offsets[nonempty]
+    rows = np.searchsorted(nonempty, zone_ids)
+
+    return (np.minimum.reduceat(xs, starts)[rows], np.minimum.reduceat(ys, starts)[rows],
+            np.maximum.reduceat(xs, starts)[rows], np.maximum.reduceat(ys, starts)[rows])
+
+def _zone_points(geometry: FloorGeometry, zone_id: int) -> list[tuple[float, float]]:
+    corners = geometry.corner_nodes[geometry.corner_offsets[zone_id]:geometry.corner_offsets[zone_id + 1]]
+    return list(zip(geometry.xs[corners].tolist(), geometry.ys[corners].tolist()))
+
+def _zone_center(geometry: FloorGeometry, zone_id: int) -> tuple[float, float] | None:
+    points = _zone_points(geometry, zone_id)
+    if not points:
+        return None
+    return sum(x for x, _ in points) / len(points), sum(y for _, y in points) / len(points)
+
+def _zone_inside(geometry: FloorGeometry, inner: int, outer: int) -> bool:
+    # A point well inside the inner zone: the area centroid when it falls
+    # inside, otherwise the middle of its first corner triangle that does
+    points = _zone_points(geometry, inner)
+    candidates = []
+
+    twice_area = cx = cy = 0.0
+    x0, y0 = points[-1]
+    for x1, y1 in points:
+        cross = x0 * y1 - x1 * y0
+        twice_area += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+        x0, y0 = x1, y1
+    if twice_area != 0.0:
+        candidates.append((cx / (3 * twice_area), cy / (3 * twice_area)))
+
+    for i in range(1, len(points) - 1):
+        (ax, ay), (bx, by), (cx, cy) = points[0], points[i], points[i + 1]
+        candidates.append(((ax + bx + cx) / 3, (ay + by + cy) / 3))
+
+    outer_points = _zone_points(geometry, outer)
+    for x, y in candidates:
+        if polygon_contains(points, x, y):
+            return polygon_contains(outer_points, x, y)
+    return False
+
+def _bounds_center(element: MapObject) -> tuple[float, float] | None:
+    bounds = element.bounds
+    if bounds is None:
+        return None
+    return (bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2
+
+def _cell_counts(min_x, min_y, max_x, max_y, cell_size: float):
+    widths = np.floor(max_x / cell_size).astype(np.int64) - np.floor(min_x / cell_size).astype(np.int64) + 1
+    heights = np.floor(max_y / cell_size).astype(np.int64) - np.floor(min_y / cell_size).astype(np.int64) + 1
+    return widths * heights
+
+def _box_cells(min_x, min_y, max_x, max_y, cell_size: float):
+    # Every (cell, box) pair for the grid cells each box covers
+    first_i = np.floor(min_x / cell_size).astype(np.int64)
+    first_j = np.floor(min_y / cell_size).astype(np.int64)
+    widths = np.floor(max_x / cell_size).astype(np.int64) - first_i + 1
+    heights = np.floor(max_y / cell_size).astype(np.int64) - first_j + 1
+
+    counts = widths * heights
+    total = int(counts.sum())
+    boxes = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    repeated_heights = np.repeat(heights, counts)
+
+    i = np.repeat(first_i, counts) + local // repeated_heights
+    j = np.repeat(first_j, counts) + local % repeated_heights
+    return (i << 32) + (j + (1 << 31)), boxes, i, j, first_i, first_j
+
+def _cell_size(boxes_a, boxes_b) -> float:
+    # About twice the size of a typical box. Sizes are the longer side of
+    # each box, as axis-aligned walls and edges have no extent across, and
+    # points such as zero length walls are left out. Either would otherwise
+    # drag the size towards nothing and split every box over many cells.
+    sizes = np.concatenate((np.maximum(boxes_a[2] - boxes_a[0], boxes_a[3] - boxes_a[1]),
+                            np.maximum(boxes_b[2] - boxes_b[0], boxes_b[3] - boxes_b[1])))
+    sizes = sizes[sizes > EPSILON]
+
+    extent = max(
+        float(max(boxes_a[2].max(), boxes_b[2].max()) - min(boxes_a[0].min(), boxes_b[0].min())),
+        float(max(boxes_a[3].max(), boxes_b[3].max()) - min(boxes_a[1].min(), boxes_b[1].min())),
+    )
+    if len(sizes) == 0:
+        cell_size = extent / np.sqrt(len(boxes_a[0]) + len(boxes_b[0]))
+    else:
+        cell_size = float(np.median(sizes)) * 2
+
+    # Cell indices have to fit the 32 bits they get in the cell keys
+    cell_size = max(cell_size, extent / (1 << 30))
+    return cell_size if cell_size > 0 else 1.0
+
+def _grid_pairs(boxes_a, boxes_b, cell_size: float) -> tuple[np.ndarray, np.ndarray]:
+    keys_a, ids_a, cells_i, cells_j, first_i_a, first_j_a = _box_cells(*boxes_a, cell_size)
+    keys_b, ids_b, _, _, first_i_b, first_j_b = _box_cells(*boxes_b, cell_size)
+    order = np.argsort(keys_b)
+    keys_b, ids_b = keys_b[order], ids_b[order]
+
+    low = np.searchsorted(keys_b, keys_a, side="left")
+    counts = np.searchsorted(keys_b, keys_a, side="right") - low
+    a = np.repeat(ids_a, counts)
+    b = ids_b[np.repeat(low, counts) + np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)]
+
+    # Boxes sharing several cells meet in each of them, keep the pair only
+    # in the lowest cell they share
+    cells_i, cells_j = np.repeat(cells_i, counts), np.repeat(cells_j, counts)
+    first = ((cells_i == np.maximum(first_i_a[a], first_i_b[b]))
+             & (cells_j == np.maximum(first_j_a[a], first_j_b[b])))
+    return a[first], b[first]
+
+def _candidate_pairs(boxes_a, boxes_b, strict: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    # Pairs of boxes from a and b that overlap (strict: with a positive
+    # area), found by bucketing both into a grid instead of testing all pairs
+    empty = np.zeros(0, dtype=np.intp)
+    if len(boxes_a[0]) == 0 or len(boxes_b[0]) == 0:
+        return empty, empty
+
+    cell_size = _cell_size(boxes_a, boxes_b)
+    large_a = _cell_counts(*boxes_a, cell_size) > MAX_BOX_CELLS
+    large_b = _cell_counts(*boxes_b, cell_size) > MAX_BOX_CELLS
+    small_a, small_b = np.flatnonzero(~large_a), np.flatnonzero(~large_b)
+
+    a, b = _grid_pairs([values[small_a] for values in boxes_a],
+                       [values[small_b] for values in boxes_b], cell_size)
+    pairs_a, pairs_b = [small_a[a]], [small_b[b]]
+
+    # Large boxes of a meet every box of b, large boxes of b the small ones
+    # of a; the overlap test below drops the pairs that do not touch
+    for box in np.flatnonzero(large_a):
+        pairs_a.append(np.full(len(boxes_b[0]), box))
+        pairs_b.append(np.arange(len(boxes_b[0])))
+    for box in np.flatnonzero(large_b):
+        pairs_a.append(small_a)
+        pairs_b.append(np.full(len(small_a), box))
+    a, b = np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+    a_min_x, a_min_y, a_max_x, a_max_y = (values[a] for values in boxes_a)
+    b_min_x, b_min_y, b_max_x, b_max_y = (values[b] for values in boxes_b)
+    if strict:
+        overlap = (a_min_x < b_max_x) & (b_min_x < a_max_x) & (a_min_y < b_max_y) & (b_min_y < a_max_y)
+    else:
+        overlap = (a_min_x <= b_max_x) & (b_min_x <= a_max_x) & (a_min_y <= b_max_y) & (b_min_y <= a_max_y)
+    return a[overlap].astype(np.intp), b[overlap].astype(np.intp)
+
+def _orientations(ax, ay, bx, by, cx, cy) -> np.ndarray:
+    return np.sign((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+def _proper_crossings(ax, ay, bx, by, cx, cy, dx, dy) -> np.ndarray:
+    # Segments crossing at a single point inside both; touching ends and
+    # collinear overlaps do not count
+    o1 = _orientations(ax, ay, bx, by, cx, cy)
+    o2 = _orientations(ax, ay, bx, by, dx, dy)
+    o3 = _orientations(cx, cy, dx, dy, ax, ay)
+    o4 = _orientations(cx, cy, dx, dy, bx, by)
+    return (o1 * o2 < 0) & (o3 * o4 < 0)
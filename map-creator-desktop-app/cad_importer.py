@@ -0,0 +1,579 @@
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from typing import Callable, Iterator, BinaryIO
+
+from model import Floor, Node, Wall, Zone, PointOfInterest, Point
+
+# Imports DXF and SVG drawings into a floor. Files are read entity by entity
+# and turned into elements right away, so only the floor being built grows
+# with the file, never a parsed copy of it:
+#   - the layer of an entity picks what it becomes (LayerMapping),
+#   - lines and polylines on wall layers become walls, closed polylines on
+#     zone layers become zones, points and texts on POI layers become points
+#     of interest,
+#   - coordinates are scaled from the file's units to centimetres, DXF's y
+#     axis pointing up is flipped,
+#   - everything else (arcs, splines, hatches, block references, ...) is
+#     counted as skipped.
+# Elements go into the floor in chunks through Floor.add_many, all within one
+# batch, so listeners hear of the import once, and a new floor that is not
+# on screen yet gets no graphics items at all.
+
+class CadEntity:
+    __slots__ = ("kind", "layer", "points", "closed", "text")
+
+    # kind is "polyline" (lines too), "point" or "text"
+    def __init__(self, kind: str, layer: str, points: list[tuple[float, float]],
+                 closed: bool = False, text: str = ""):
+        self.kind = kind
+        self.layer = layer
+        self.points = points
+        self.closed = closed
+        self.text = text
+
+
+class LayerMapping:
+    # Layers named like these map to an element type unless mapped explicitly
+    DEFAULT_KEYWORDS = {
+        Wall: ("wall", "mur", "wand"),
+        Zone: ("room", "zone", "space", "area"),
+        PointOfInterest: ("poi", "text", "label", "anno"),
+    }
+
+    def __init__(self, layers: dict[str, type] = None, keywords: dict[type, tuple[str, ...]] = None):
+        self._layers = {name.lower(): element_type for name, element_type in (layers or {}).items()}
+        self._keywords = self.DEFAULT_KEYWORDS if keywords is None else keywords
+        self._cache: dict[str, type | None] = {}
+
+    def element_type(self, layer: str) -> type | None:
+        try:
+            return self._cache[layer]
+        except KeyError:
+            pass
+
+        name = layer.lower()
+        element_type = self._layers.get(name)
+        if element_type is None and name not in self._layers:
+            element_type = next(
+                (t for t, words in self._keywords.items() if any(word in name for word in words)),
+                None
+            )
+        self._cache[layer] = element_type
+        return element_type
+
+
+class CadImportResult:
+    __slots__ = ("entities", "walls", "zones", "points_of_interest", "skipped", "unit_scale")
+
+    def __init__(self):
+        self.entities = 0
+        self.walls = 0
+        self.zones = 0
+        self.points_of_interest = 0
+        self.skipped = 0
+        self.unit_scale = 1.0
+
+    @property
+    def elements(self) -> int:
+        return self.walls + self.zones + self.points_of_interest
+
+
+class CadImporter:
+    def __init__(self, mapping: LayerMapping = None, unit_scale: float = None):
+        # unit_scale overrides the file's units, in centimetres per unit
+        self._mapping = mapping or LayerMapping()
+        self._unit_scale = unit_scale
+
+    def import_file(self,
+                    file_path: str,
+                    floor: Floor,
+                    progress: Callable[[int, int], None] = None) -> CadImportResult:
+        total = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            reader = SvgReader(f) if is_svg_file(file_path) else DxfReader(f)
+            return self.import_entities(reader, floor, lambda: progress(f.tell(), total) if progress else None)
+
+    def import_entities(self, reader, floor: Floor, report: Callable[[], None] = None) -> CadImportResult:
+        result = CadImportResult()
+        builder = _FloorBuilder(floor)
+
+        with floor.batch():
+            for entity in reader.entities():
+                result.entities += 1
+                if report is not None and result.entities % 5000 == 0:
+                    report()
+
+                scale = self._unit_scale if self._unit_scale is not None else reader.unit_scale
+                element_type = self._mapping.element_type(entity.layer)
+                if element_type is Wall and entity.kind == "polyline":
+                    result.walls += builder.add_walls(entity, scale)
+                elif element_type is Zone and entity.kind == "polyline" and entity.closed:
+                    result.zones += builder.add_zone(entity, scale)
+                elif element_type is PointOfInterest and entity.kind in ("point", "text"):
+                    result.points_of_interest += builder.add_point_of_interest(entity, scale)
+                else:
+                    result.skipped += 1
+
+            builder.flush()
+            result.skipped += reader.skipped
+            result.unit_scale = self._unit_scale if self._unit_scale is not None else reader.unit_scale
+
+        if report is not None:
+            report()
+        return result
+
+
+class _FloorBuilder:
+    # Points are scaled here, ends meeting in the drawing share a node
+    CHUNK_SIZE = 4096
+
+    def __init__(self, floor: Floor):
+        self._floor = floor
+        self._nodes: dict[tuple[float, float], Node] = {}
+        self._pending: list = []
+
+    def _add(self, element):
+        self._pending.append(element)
+        if len(self._pending) >= self.CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        self._floor.add_many(self._pending)
+        self._pending = []
+
+    def _node(self, x: float, y: float) -> Node:
+        # + 0.0 turns the -0.0 of flipped y axes into 0.0
+        key = (round(x, 3) + 0.0, round(y, 3) + 0.0)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = Node(key[0], key[1])
+        return node
+
+    def _scaled_nodes(self, entity: CadEntity, scale: float) -> list[Node]:
+        nodes = []
+        for x, y in entity.points:
+            node = self._node(x * scale, y * scale)
+            if not nodes or nodes[-1] is not node:
+                nodes.append(node)
+        if len(nodes) > 1 and nodes[0] is nodes[-1]:
+            nodes.pop()
+        return nodes
+
+    def add_walls(self, entity: CadEntity, scale: float) -> int:
+        nodes = self._scaled_nodes(entity, scale)
+        if len(nodes) < 2:
+            return 0
+
+        pairs = list(zip(nodes, nodes[1:]))
+        if entity.closed and len(nodes) > 2:
+            pairs.append((nodes[-1], nodes[0]))
+
+        for start, end in pairs:
+            self._add(Wall(start, end))
+        return len(pairs)
+
+    def add_zone(self, entity: CadEntity, scale: float) -> int:
+        nodes = self._scaled_nodes(entity, scale)
+        if len(nodes) < 3 or len(set(nodes)) != len(nodes):
+            return 0
+
+        self._add(Zone(nodes, entity.text or entity.layer))
+        return 1
+
+    def add_point_of_interest(self, entity: CadEntity, scale: float) -> int:
+        x, y = entity.points[0]
+        self._add(PointOfInterest(Point(x * scale + 0.0, y * scale + 0.0), entity.text or entity.layer))
+        return 1
+
+
+def is_svg_file(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() == ".svg"
+
+
+# ------------------------------------
+# --------------- DXF ----------------
+# ------------------------------------
+
+# $INSUNITS codes to centimetres
+DXF_UNITS = {
+    1: 2.54,            # inches
+    2: 30.48,           # feet
+    3: 160934.4,        # miles
+    4: 0.1,             # millimetres
+    5: 1.0,             # centimetres
+    6: 100.0,           # metres
+    7: 100000.0,        # kilometres
+    8: 2.54e-6,         # microinches
+    9: 2.54e-3,         # mils
+    10: 91.44,          # yards
+    14: 10.0,           # decimetres
+}
+
+# Drawings without units are taken to be in millimetres, as architects draw
+DXF_UNITLESS_SCALE = 0.1
+
+class DxfReader:
+    # ASCII DXF only. Entities are read from the ENTITIES section, the ones
+    # inside BLOCKS would only be drawn through block references.
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self.unit_scale = DXF_UNITLESS_SCALE
+        self.skipped = 0
+
+    def _pairs(self) -> Iterator[tuple[int, str]]:
+        # Group code and value lines taken two at a time
+        lines = iter(self._file)
+        for code_line, value_line in zip(lines, lines):
+            try:
+                code = int(code_line)
+            except ValueError:
+                raise ValueError(f"Not an ASCII DXF file, bad group code {code_line[:20]!r}")
+            yield code, value_line.rstrip(b"\r\n").decode("utf-8", "replace")
+
+    def entities(self) -> Iterator[CadEntity]:
+        pairs = self._pairs()
+        section = None
+        header_variable = None
+
+        for code, value in pairs:
+            if code == 0 and value == "SECTION":
+                code, value = next(pairs, (None, None))
+                section = value if code == 2 else None
+                if section == "ENTITIES":
+                    yield from self._section_entities(pairs)
+                    section = None
+            elif code == 0 and value == "ENDSEC":
+                section = None
+            elif section == "HEADER":
+                if code == 9:
+                    header_variable = value
+                elif code == 70 and header_variable == "$INSUNITS":
+                    self.unit_scale = DXF_UNITS.get(int(value), DXF_UNITLESS_SCALE)
+
+    def _section_entities(self, pairs: Iterator[tuple[int, str]]) -> Iterator[CadEntity]:
+        entity_type, groups = None, []
+
+        # Old style POLYLINEs come as VERTEX entities up to a SEQEND
+        polyline = None
+
+        for code, value in pairs:
+            if code != 0:
+                groups.append((code, value))
+                continue
+
+            if entity_type == "POLYLINE":
+                polyline = self._polyline_start(groups)
+            elif entity_type == "VERTEX":
+                if polyline is not None:
+                    x, y = self._point(groups, 10, 20)
+                    polyline.points.append((x, -y))
+            elif entity_type == "SEQEND":
+                if polyline is not None and polyline.points:
+                    yield polyline
+                polyline = None
+            elif entity_type is not None:
+                entity = self._entity(entity_type, groups)
+                if entity is not None:
+                    yield entity
+                else:
+                    self.skipped += 1
+
+            if value == "ENDSEC" or value == "EOF":
+                return
+            entity_type, groups = value, []
+
+    def _polyline_start(self, groups: list[tuple[int, str]]) -> CadEntity | None:
+        flags = int(self._value(groups, 70, "0"))
+
+        # 3D meshes and polyface meshes are no floor plan
+        if flags & (16 | 64):
+            self.skipped += 1
+            return None
+        return CadEntity("polyline", self._value(groups, 8, "0"), [], bool(flags & 1))
+
+    def _entity(self, entity_type: str, groups: list[tuple[int, str]]) -> CadEntity | None:
+        layer = self._value(groups, 8, "0")
+
+        if entity_type == "LINE":
+            x1, y1 = self._point(groups, 10, 20)
+            x2, y2 = self._point(groups, 11, 21)
+            return CadEntity("polyline", layer, [(x1, -y1), (x2, -y2)])
+
+        if entity_type == "LWPOLYLINE":
+            xs = [float(value) for code, value in groups if code == 10]
+            ys = [float(value) for code, value in groups if code == 20]
+            closed = bool(int(self._value(groups, 70, "0")) & 1)
+            return CadEntity("polyline", layer, [(x, -y) for x, y in zip(xs, ys)], closed)
+
+        if entity_type == "POINT":
+            x, y = self._point(groups, 10, 20)
+            return CadEntity("point", layer, [(x, -y)])
+
+        if entity_type in ("TEXT", "MTEXT"):
+            x, y = self._point(groups, 10, 20)
+            text = "".join(value for code, value in groups if code in (3, 1))
+            return CadEntity("text", layer, [(x, -y)], text=_plain_mtext(text))
+
+        return None
+
+    @staticmethod
+    def _value(groups: list[tuple[int, str]], code: int, default: str = None) -> str:
+        for group_code, value in groups:
+            if group_code == code:
+                return value.strip()
+        return default
+
+    @classmethod
+    def _point(cls, groups: list[tuple[int, str]], x_code: int, y_code: int) -> tuple[float, float]:
+        return float(cls._value(groups, x_code, "0")), float(cls._value(groups, y_code, "0"))
+
+def _plain_mtext(text: str) -> str:
+    # Formatting codes like \P (new paragraph) or {\fArial;...}
+    text = re.sub(r"\\P", " ", text)
+    text = re.sub(r"\\[A-Za-z][^;\\{}]*;", "", text)
+    return text.replace("{", "").replace("}", "").strip()
+
+
+# ------------------------------------
+# --------------- SVG ----------------
+# ------------------------------------
+
+# Length units to centimetres, user units are CSS pixels at 96 per inch
+SVG_UNITS = {
+    "": 2.54 / 96,
+    "px": 2.54 / 96,
+    "pt": 2.54 / 72,
+    "pc": 2.54 / 6,
+    "in": 2.54,
+    "mm": 0.1,
+    "cm": 1.0,
+    "m": 100.0,
+}
+
+_SVG_NS = "{http://www.w3.org/2000/svg}"
+_INKSCAPE_LABEL = "{http://www.inkscape.org/namespaces/inkscape}label"
+
+_LENGTH = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-z]*)\s*$")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_PATH_TOKEN = re.compile(r"[MmLlHhVvZzCcSsQqTtAa]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+class SvgReader:
+    # Layers are the nearest enclosing group's label or id. Curves in paths
+    # are followed by their end points only.
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self.unit_scale = SVG_UNITS[""]
+        self.skipped = 0
+
+    def entities(self) -> Iterator[CadEntity]:
+        # (element, transform, layer) of every open element
+        stack = []
+
+        # Open text elements, whose spans are only read at their end
+        text_depth = 0
+
+        for event, element in ET.iterparse(self._file, events=("start", "end")):
+            tag = element.tag.rsplit("}", 1)[-1]
+
+            if event == "start":
+                if tag == "svg" and not stack:
+                    self._read_units(element)
+
+                transform, layer = stack[-1][1:] if stack else (_IDENTITY, "0")
+                own = element.get("transform")
+                if own:
+                    transform = _compose(transform, _parse_transform(own))
+                if tag == "g":
+                    layer = element.get(_INKSCAPE_LABEL) or element.get("id") or layer
+                elif tag == "text":
+                    text_depth += 1
+                stack.append((element, transform, layer))
+                continue
+
+            _, transform, layer = stack.pop()
+            if tag == "text":
+                text_depth -= 1
+            elif text_depth:
+                continue
+
+            if tag in _SVG_SHAPES:
+                entities = _SVG_SHAPES[tag](element)
+                if entities is None:
+                    self.skipped += 1
+                for entity in entities or ():
+                    entity.layer = layer
+                    entity.points = [_apply(transform, x, y) for x, y in entity.points]
+                    yield entity
+            elif tag not in _SVG_CONTAINERS:
+                self.skipped += 1
+
+            # Done with, the parent would keep it and its subtree alive
+            element.clear()
+            if stack:
+                del stack[-1][0][:]
+
+    def _read_units(self, root: ET.Element):
+        width = _LENGTH.match(root.get("width") or "")
+        view_box = _NUMBER.findall(root.get("viewBox") or "")
+        if width is None or width.group(2) not in SVG_UNITS:
+            return
+
+        width_cm = float(width.group(1)) * SVG_UNITS[width.group(2)]
+        if len(view_box) == 4 and float(view_box[2]) > 0:
+            self.unit_scale = width_cm / float(view_box[2])
+        elif float(width.group(1)) > 0:
+            self.unit_scale = SVG_UNITS[width.group(2)]
+
+_SVG_CONTAINERS = {"svg", "g", "defs", "symbol", "title", "desc", "metadata", "tspan", "namedview", "style"}
+
+def _numbers(element: ET.Element, *names: str) -> list[float]:
+    return [_length(element.get(name)) for name in names]
+
+def _length(value: str | None) -> float:
+    if not value:
+        return 0.0
+    match = _NUMBER.match(value.strip())
+    return float(match.group(0)) if match else 0.0
+
+def _point_list(value: str | None) -> list[tuple[float, float]]:
+    numbers = [float(n) for n in _NUMBER.findall(value or "")]
+    return list(zip(numbers[0::2], numbers[1::2]))
+
+def _svg_line(element: ET.Element):
+    x1, y1, x2, y2 = _numbers(element, "x1", "y1", "x2", "y2")
+    return [CadEntity("polyline", "", [(x1, y1), (x2, y2)])]
+
+def _svg_polyline(element: ET.Element):
+    return [CadEntity("polyline", "", _point_list(element.get("points")))]
+
+def _svg_polygon(element: ET.Element):
+    return [CadEntity("polyline", "", _point_list(element.get("points")), True)]
+
+def _svg_rect(element: ET.Element):
+    x, y, width, height = _numbers(element, "x", "y", "width", "height")
+    if width <= 0 or height <= 0:
+        return None
+    return [CadEntity("polyline", "", [(x, y), (x + width, y), (x + width, y + height), (x, y + height)], True,
+                      element.get("id") or "")]
+
+def _svg_circle(element: ET.Element):
+    cx, cy = _numbers(element, "cx", "cy")
+    return [CadEntity("point", "", [(cx, cy)])]
+
+def _svg_text(element: ET.Element):
+    x, y = _numbers(element, "x", "y")
+    text = " ".join("".join(element.itertext()).split())
+    return [CadEntity("text", "", [(x, y)], text=text)]
+
+def _svg_path(element: ET.Element):
+    tokens = _PATH_TOKEN.findall(element.get("d") or "")
+    entities = []
+    points, closed = [], False
+    x = y = start_x = start_y = 0.0
+    command = None
+    i = 0
+
+    # Numbers each command takes, its end point being the last two
+    arity = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+    def flush():
+        if len(points) > 1:
+            entities.append(CadEntity("polyline", "", points, closed))
+
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            command = token
+            i += 1
+            if command in "Zz":
+                closed = True
+                x, y = start_x, start_y
+                flush()
+                points, closed = [], False
+                command = None
+            continue
+
+        if command is None:
+            return None
+
+        upper = command.upper()
+        count = arity[upper]
+        if i + count > len(tokens):
+            break
+        try:
+            args = [float(t) for t in tokens[i:i + count]]
+        except ValueError:
+            return None
+        i += count
+
+        relative = command.islower()
+        if upper == "H":
+            x = args[0] + (x if relative else 0)
+        elif upper == "V":
+            y = args[0] + (y if relative else 0)
+        else:
+            end_x, end_y = args[-2], args[-1]
+            x, y = (x + end_x, y + end_y) if relative else (end_x, end_y)
+
+        if upper == "M":
+            flush()
+            points, closed = [(x, y)], False
+            start_x, start_y = x, y
+            # Pairs after a moveto are linetos
+            command = "l" if relative else "L"
+        else:
+            points.append((x, y))
+
+    flush()
+    return entities
+
+_SVG_SHAPES = {
+    "line": _svg_line,
+    "polyline": _svg_polyline,
+    "polygon": _svg_polygon,
+    "rect": _svg_rect,
+    "circle": _svg_circle,
+    "text": _svg_text,
+    "path": _svg_path,
+}
+
+def _parse_transform(value: str) -> tuple:
+    transform = _IDENTITY
+    for name, args in _TRANSFORM.findall(value):
+        numbers = [float(n) for n in _NUMBER.findall(args)]
+        if name == "matrix" and len(numbers) == 6:
+            step = tuple(numbers)
+        elif name == "translate" and numbers:
+            step = (1.0, 0.0, 0.0, 1.0, numbers[0], numbers[1] if len(numbers) > 1 else 0.0)
+        elif name == "scale" and numbers:
+            step = (numbers[0], 0.0, 0.0, numbers[1] if len(numbers) > 1 else numbers[0], 0.0, 0.0)
+        elif name == "rotate" and numbers:
+            angle = math.radians(numbers[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step = (cos, sin, -sin, cos, 0.0, 0.0)
+            if len(numbers) == 3:
+                cx, cy = numbers[1], numbers[2]
+                step = _compose(_compose((1.0, 0.0, 0.0, 1.0, cx, cy), step), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewX" and numbers:
+            step = (1.0, 0.0, math.tan(math.radians(numbers[0])), 1.0, 0.0, 0.0)
+        elif name == "skewY" and numbers:
+            step = (1.0, math.tan(math.radians(numbers[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            continue
+        transform = _compose(transform, step)
+    return transform
+
+def _compose(outer: tuple, inner: tuple) -> tuple:
+    a, b, c, d, e, f = outer
+    g, h, i, j, k, l = inner
+    return (a * g + c * h, b * g + d * h, a * i + c * j, b * i + d * j, a * k + c * l + e, b * k + d * l + f)
+
+def _apply(transform: tuple, x: float, y: float) -> tuple[float, float]:
+    a, b, c, d, e, f = transform
+    return a * x + c * y + e, b * x + d * y + f
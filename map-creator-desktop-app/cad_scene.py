@@ -1,11 +1,14 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-import math
 
-from PySide6.QtGui import QPen, QColor, QPainter
+from PySide6.QtGui import QColor, QPainter
 from PySide6.QtCore import Qt, QRectF, QPointF
 from PySide6.QtWidgets import QGraphicsScene
 
+from underlay_tiles import UnderlayRenderer
+from grid_tiles import GridRenderer
+from view import FloorLayerItem, LevelOfDetail
+
 if TYPE_CHECKING:
     from main_map_controller import MainMapController
 
@@ -18,88 +21,151 @@ class InteractiveScene(QGraphicsScene):
         self._presenter = presenter
         self.setBackgroundBrush(background_color)
         
-        self._grid_color = QColor(220, 220, 220)
-        self._axis_color = QColor(80, 80, 80)
-        self._text_color = QColor(50, 50, 50)
+        self._grid_renderer = GridRenderer()
 
         self._active_type = None
 
-    def set_controller(self, presenter):
-        self._presenter = presenter
-
-    def drawBackground(self, painter: QPainter, rect: QRectF):
-        super().drawBackground(painter, rect)
-        
-        if self._presenter is None or not self._presenter.show_grid:
-            return
+        self._level_of_detail = LevelOfDetail(self)
 
-        grid_size = self._presenter.grid_size
-        if grid_size <= 0: return
+        self._underlay_renderer = UnderlayRenderer(parent=self)
+        self._underlay_renderer.changed.connect(self.update)
 
-        grid_pen = QPen(self._grid_color, 0)
-        axis_pen = QPen(self._axis_color, 0)
+    @property
+    def underlay_renderer(self) -> UnderlayRenderer:
+        return self._underlay_renderer
 
-        font = painter.font()
-        font.setPixelSize(int(grid_size * 0.35)) 
-        painter.setFont(font)
+    @property
+    def level_of_detail(self) -> LevelOfDetail:
+        return self._level_of_detail
 
-        left    = int(math.floor(rect.left() / grid_size) * grid_size)
-        right   = int(math.ceil(rect.right() / grid_size) * grid_size)
-        top     = int(math.floor(rect.top() / grid_size) * grid_size)
-        bottom  = int(math.ceil(rect.bottom() / grid_size) * grid_size)
+    @property
+    def grid_renderer(self) -> GridRenderer:
+        return self._grid_renderer
 
-        painter.setPen(grid_pen)
+    # Drops the cached grid tiles, e.g. when the map theme changes
+    def invalidate_grid(self):
+        self._grid_renderer.clear()
+        self.update()
 
-        for x in range(left, right + 1, int(grid_size)):
-            if x == 0: continue
-            painter.drawLine(x, top, x, bottom)
+    def set_controller(self, presenter):
+        self._presenter = presenter
 
-        for y in range(top, bottom + 1, int(grid_size)):
-            if y == 0: continue
-            painter.drawLine(left, y, right, y)
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        super().drawBackground(painter, rect)
 
-        painter.setPen(axis_pen)
-        
-        if left <= 0 <= right:
-            painter.drawLine(0, top, 0, bottom)
-            
-            for y in range(top, bottom + 1, int(grid_size)):
-                if y % 50 != 0 or y == 0: 
-                    continue
+        if self._presenter is None:
+            return
 
-                label = str(-y / 100) + 'm'
-                painter.drawText(QRectF(-grid_size, y, grid_size - 2, grid_size), 
-                                 Qt.AlignRight | Qt.AlignTop, label)
+        floor = self._presenter.current_floor
+        if floor is not None and floor.underlay is not None:
+            self._underlay_renderer.draw(painter, rect, floor.underlay)
 
-        if top <= 0 <= bottom:
-            painter.drawLine(left, 0, right, 0)
-            
-            for x in range(left, right + 1, int(grid_size)):
-                if x % 50 != 0 or x == 0: 
-                    continue
+        if not self._presenter.show_grid:
+            return
 
-                label = str(x / 100) + 'm'
-                painter.drawText(QRectF(x, 2, grid_size, grid_size), 
-                                 Qt.AlignLeft | Qt.AlignTop, label)
+        self._grid_renderer.draw(painter, rect, self._presenter.grid_size)
 
     def addItem(self, item):
-        super().addItem(item)    
-        
+        super().addItem(item)
+        self._on_item_shown(item)
+
+    # Adds an item to a floor layer, which is already in the scene
+    def add_item(self, item, layer: FloorLayerItem):
+        item.setParentItem(layer)
+        if layer.isVisible():
+            self._on_item_shown(item)
+        else:
+            layer.items_synced = False
+
+    def _on_item_shown(self, item):
         model = self._presenter.get_model_for_item(item)
         if model is None:
             return
 
-        if model is not None:
-            item_type = type(model)
-            is_active = self._active_type is None or item_type == self._active_type
-            self._set_active_state(item, is_active)
+        self._set_active_state(item, self._active_type is None or self._is_on_active_layer(model))
+        self._level_of_detail.add_items([item])
+
+        for dep in model.dependencies:
+            dep_item = self._presenter.get_item_for_model(dep)
+            self._set_active_state(dep_item, self._active_type is None or self._is_on_active_layer(dep))
+
+    # Adds many items at once, to a floor layer when one is given. Every model
+    # they show is added with its dependencies, so each item's state follows
+    # from its own model.
+    def add_items(self, items, layer: FloorLayerItem = None):
+        if layer is not None and not layer.isVisible():
+            # Brought up to date by show_layer
+            for item in items:
+                item.setParentItem(layer)
+            layer.items_synced = False
+            return
 
-            for dep in model.dependencies:
-                dep_item = self._presenter.get_item_for_model(dep)
-                self._set_active_state(dep_item, is_active)
+        shown = []
+        for item in items:
+            if layer is None:
+                super().addItem(item)
+            else:
+                item.setParentItem(layer)
 
-            if hasattr(model, 'owner') and type(model.owner) == self._active_type:
-                self._set_active_state(item, True)
+            model = self._presenter.get_model_for_item(item)
+            if model is None:
+                continue
+
+            self._set_active_state(item, self._active_type is None or self._is_on_active_layer(model))
+            shown.append(item)
+
+        self._level_of_detail.add_items(shown)
+
+    # Layers start hidden, shown by show_layer once their items are in
+    def add_layer(self, layer: FloorLayerItem):
+        layer.setVisible(False)
+        super().addItem(layer)
+
+    # Shows a floor layer hidden by hide_layer. Its items catch up with the
+    # active layer type and the level of detail, which may have changed since.
+    def show_layer(self, layer: FloorLayerItem):
+        layer.setVisible(True)
+
+        items = layer.childItems()
+        stale = not layer.items_synced or layer.active_type != self._active_type
+        if stale and self._presenter is not None:
+            layer.items_synced = True
+            layer.active_type = self._active_type
+            for item in items:
+                model = self._presenter.get_model_for_item(item)
+                if model is not None:
+                    self._set_active_state(item, self._active_type is None or self._is_on_active_layer(model))
+
+        self._level_of_detail.add_items(items)
+
+    def hide_layer(self, layer: FloorLayerItem):
+        self._level_of_detail.remove_items(layer.childItems())
+        layer.setVisible(False)
+
+    def remove_layer(self, layer: FloorLayerItem):
+        items = layer.childItems()
+        if layer.isVisible():
+            self._level_of_detail.remove_items(items)
+        super().removeItem(layer)
+        self._release(items)
+
+    # Items showing a model stop following it once they leave the scene
+    def removeItem(self, item):
+        self._level_of_detail.remove_items([item])
+        super().removeItem(item)
+        self._release([item])
+
+    # QGraphicsScene.clear deletes the cluster markers too
+    def clear(self):
+        self._level_of_detail.clear()
+        self._release(self.items())
+        super().clear()
+
+    def _release(self, items):
+        for item in items:
+            release = getattr(item, "release", None)
+            if release is not None:
+                release()
 
     def itemAt(self, pos: QPointF, transform):
         items = self.items(pos, Qt.IntersectsItemShape, Qt.DescendingOrder)
@@ -117,21 +183,22 @@ class InteractiveScene(QGraphicsScene):
     def active_item_type(self, item_type: type):
         self._active_type = item_type
 
-        checked = set()
-
         for item in self.items():
-            model = self._presenter.get_model_for_item(item)
-            if model is None or item in checked:
+            if isinstance(item, FloorLayerItem):
+                # Hidden layers catch up in show_layer
+                if item.isVisible():
+                    item.active_type = item_type
                 continue
 
-            is_active = type(model) == self._active_type
-            self._set_active_state(item, is_active)
-            checked.add(item)
-
-            for dep in model.dependencies:
-                dep_item = self._presenter.get_item_for_model(dep)
-                self._set_active_state(dep_item, is_active)
-                checked.add(dep_item)
+            model = self._presenter.get_model_for_item(item)
+            if model is not None:
+                self._set_active_state(item, self._is_on_active_layer(model))
+
+    # Nodes are on the layer of every wall or zone they belong to
+    def _is_on_active_layer(self, model) -> bool:
+        if type(model) == self._active_type:
+            return True
+        return any(type(owner) == self._active_type for owner in getattr(model, 'owners', ()))
 
     def _set_active_state(self, item, is_active: bool):
         if item is None:
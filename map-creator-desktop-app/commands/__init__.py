@@ -4,12 +4,15 @@ from .zone_add_command import ZoneAddCommand
 from .point_of_interest_add_command import PointOfInterestAddCommand
 from .floor_add_command import FloorAddCommand
 from .floor_remove_command import FloorRemoveCommand
+from .set_floor_underlay_command import SetFloorUnderlayCommand
 
 # edit commands
 from .delete_command import DeleteElementsCommand
 from .move_command import MoveElementsCommand
 from .zone_attributes_changed import ZoneAttributesChangedCommand
 from .point_of_interes_attributes_changed import PointOfInterestAttributesChangedCommand
+from .weld_nodes_command import WeldNodesCommand
+from .simplify_walls_command import SimplifyWallsCommand
 
 from .zone_connection_add_command import ZoneConnectionAddCommand
 from .zone_connection_remove_command import ZoneConnectionRemoveCommand
@@ -21,8 +24,11 @@ __all__ = [
     "ZoneAttributesChangedCommand",
     "PointOfInterestAddCommand",
     "PointOfInterestAttributesChangedCommand",
+    "WeldNodesCommand",
+    "SimplifyWallsCommand",
     "FloorAddCommand",
     "FloorRemoveCommand",
+    "SetFloorUnderlayCommand",
     "DeleteElementsCommand",
     "MoveElementsCommand",
     "ZoneConnectionAddCommand",
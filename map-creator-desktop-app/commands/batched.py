@@ -0,0 +1,10 @@
+from functools import wraps
+
+# Runs an undo command step inside a batch of the floor it edits, so the
+# scene is updated once per step instead of once per element
+def batched(step):
+    @wraps(step)
+    def wrapper(self):
+        with self._model.batch():
+            step(self)
+    return wrapper
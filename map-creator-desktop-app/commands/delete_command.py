@@ -1,21 +1,29 @@
 from PySide6.QtGui import QUndoCommand
 
+from model import Node
+from .batched import batched
+
 class DeleteElementsCommand(QUndoCommand):
     def __init__(self, model, elements: list):
         super().__init__("Delete Item")
         self._model = model
-        self._elements = elements
 
-    def undo(self):
-        for element in self._elements:
-            for dep in element.dependencies:
-                self._model.add(dep)
+        # Deleting a node deletes what is built on it. The floor drops nodes
+        # nothing uses any more by itself, and keeps shared ones.
+        to_delete = {}
+        for element in elements:
+            if type(element) is Node and element.owners:
+                to_delete.update(dict.fromkeys(element.owners))
+            else:
+                to_delete[element] = None
+        self._elements = list(to_delete)
 
+    @batched
+    def undo(self):
+        for element in reversed(self._elements):
             self._model.add(element)
 
+    @batched
     def redo(self):
         for element in self._elements:
-            for dep in element.dependencies:
-                self._model.remove(dep)
-                
-            self._model.remove(element)
\ No newline at end of file
+            self._model.remove(element)
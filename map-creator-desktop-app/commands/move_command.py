@@ -4,15 +4,30 @@ from PySide6.QtCore import QPointF
 from model import MapObject
 
 class MoveElementsCommand(QUndoCommand):
-    def __init__(self, elements: list[MapObject], delta_pos: QPointF):
+    # applied: the elements were already moved, e.g. while being dragged
+    def __init__(self, elements: list[MapObject], delta_pos: QPointF, applied: bool = False):
         super().__init__("Move Element")
         self._elements = elements
         self._delta_pos = delta_pos
+        self._applied = applied
 
     def redo(self):
-        for element in self._elements:
-            element.moveBy(self._delta_pos)
+        if self._applied:
+            self._applied = False
+            return
+        self._translate(self._delta_pos.x(), self._delta_pos.y())
 
     def undo(self):
+        self._translate(-self._delta_pos.x(), -self._delta_pos.y())
+
+    def _translate(self, dx: float, dy: float):
+        elements_by_floor = {}
         for element in self._elements:
-            element.moveBy(-self._delta_pos)
\ No newline at end of file
+            elements_by_floor.setdefault(element.floor, []).append(element)
+
+        for floor, elements in elements_by_floor.items():
+            if floor is None:
+                for element in elements:
+                    element.moveBy(QPointF(dx, dy))
+            else:
+                floor.translate(elements, dx, dy)
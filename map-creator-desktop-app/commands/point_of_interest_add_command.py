@@ -1,6 +1,7 @@
 from PySide6.QtGui import QUndoCommand
 
 from model import PointOfInterest, PointOfInterestType
+from .batched import batched
 
 class PointOfInterestAddCommand(QUndoCommand):
     def __init__(self, model, position, name="Place", type=PointOfInterestType.GENERIC):
@@ -8,8 +9,10 @@ class PointOfInterestAddCommand(QUndoCommand):
         self._model = model
         self._point_of_interest = PointOfInterest(position, name, type)
 
+    @batched
     def redo(self):
         self._model.add(self._point_of_interest)
 
+    @batched
     def undo(self):
         self._model.remove(self._point_of_interest)
\ No newline at end of file
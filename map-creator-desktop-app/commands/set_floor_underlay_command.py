@@ -0,0 +1,16 @@
+from PySide6.QtGui import QUndoCommand
+
+from model import Floor, FloorUnderlay
+
+class SetFloorUnderlayCommand(QUndoCommand):
+    def __init__(self, floor: Floor, underlay: FloorUnderlay | None):
+        super().__init__("Import Floor Plan" if underlay is not None else "Remove Floor Plan")
+        self._floor = floor
+        self._old_underlay = floor.underlay
+        self._new_underlay = underlay
+
+    def redo(self):
+        self._floor.underlay = self._new_underlay
+
+    def undo(self):
+        self._floor.underlay = self._old_underlay
@@ -0,0 +1,91 @@
+import json
+
+from PySide6.QtGui import QUndoCommand
+
+from model import Floor, MapObject, Wall, WallSimplifier
+
+# Bytes an element takes in a saved JSON file, where it sits four levels
+# deep and is followed by a comma
+def _json_size(element: MapObject) -> int:
+    lines = json.dumps(element.to_dict(), indent=4).split("\n")
+    return sum(len(line) + 17 for line in lines) + 1
+
+class SimplifyWallsCommand(QUndoCommand):
+    def __init__(self, model: Floor, simplifier: WallSimplifier):
+        super().__init__("Simplify Walls")
+        self._model = model
+        self._simplifier = simplifier
+
+        # Filled in by the first redo, each pass is planned on the result
+        # of the one before; later redos replay them
+        self._applied = False
+        self._micro_walls = []
+        self._merges = []
+        self._moved_owners = []
+        self._replaced = []
+
+        # Result of the first redo, for reporting
+        self.removed_walls = 0
+        self.removed_nodes = 0
+        self.removed_bytes = 0
+
+    def redo(self):
+        with self._model.batch():
+            if not self._applied:
+                self._apply()
+            else:
+                self._replay()
+
+    def undo(self):
+        model = self._model
+        with model.batch():
+            for old_walls, new_walls in reversed(self._replaced):
+                for wall in old_walls:
+                    model.add(wall)
+                for wall in new_walls:
+                    model.remove(wall)
+
+            for (node, into), owners in zip(reversed(self._merges), reversed(self._moved_owners)):
+                model.split_node(node, into, owners)
+
+            for wall in self._micro_walls:
+                model.add(wall)
+
+    def _apply(self):
+        model = self._model
+        walls_before, nodes_before = set(model.walls), set(model.nodes)
+
+        self._micro_walls, self._merges = self._simplifier.plan_snap(model)
+        for wall in self._micro_walls:
+            model.remove(wall)
+        self._moved_owners = [model.merge_node(node, into) for node, into in self._merges]
+
+        for old_walls, chain in self._simplifier.plan_merge(model):
+            new_walls = [Wall(start, end) for start, end in zip(chain, chain[1:])]
+            self._replaced.append((old_walls, new_walls))
+            self._add_replacing(old_walls, new_walls)
+
+        # Zones only swap corner ids of the same length, so the file shrinks
+        # by what the removed walls and nodes took, less the new walls
+        removed = (walls_before - set(model.walls)) | (nodes_before - set(model.nodes))
+        added = set(model.walls) - walls_before
+        self.removed_walls = len(walls_before) - len(model.walls)
+        self.removed_nodes = len(nodes_before) - len(model.nodes)
+        self.removed_bytes = sum(map(_json_size, removed)) - sum(map(_json_size, added))
+        self._applied = True
+
+    def _replay(self):
+        model = self._model
+        for wall in self._micro_walls:
+            model.remove(wall)
+        self._moved_owners = [model.merge_node(node, into) for node, into in self._merges]
+
+        for old_walls, new_walls in self._replaced:
+            self._add_replacing(old_walls, new_walls)
+
+    def _add_replacing(self, old_walls: list[Wall], new_walls: list[Wall]):
+        # New walls first, so the nodes they keep never lose all owners
+        for wall in new_walls:
+            self._model.add(wall)
+        for wall in old_walls:
+            self._model.remove(wall)
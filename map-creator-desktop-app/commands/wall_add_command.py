@@ -1,18 +1,74 @@
+import math
+
 from PySide6.QtGui import QUndoCommand
-from model import Node, Wall
+from model import Node, Wall, Point
+from .batched import batched
 
 class WallAddCommand(QUndoCommand):
     name = "Add Wall"
-    
-    def __init__(self, model, start_pos, end_pos):
+
+    def __init__(self, model, start_pos, end_pos, snap_distance: float = 0.0):
         super().__init__("Add Wall")
         self._model = model
-        self.start_node = Node(start_pos.x(), start_pos.y())
-        self.end_node = Node(end_pos.x(), end_pos.y())
+
+        self._walls = []
+        if start_pos is None or end_pos is None:
+            return
+
+        # Walls meeting at a point share its node
+        index = model.spatial_index
+        self.start_node = index.nearest_node(start_pos, snap_distance) or Node(start_pos.x(), start_pos.y())
+        self.end_node = index.nearest_node(end_pos, snap_distance)
+        if self.end_node is None or self.end_node is self.start_node:
+            self.end_node = Node(end_pos.x(), end_pos.y())
+
         self.wall = Wall(self.start_node, self.end_node)
+        self._walls.append(self.wall)
+
+    # One step adding a wall for each (x1, y1, x2, y2) segment, such as the
+    # walls traced from a floor plan. Ends within snap_distance of an existing
+    # node or of each other share a node.
+    @classmethod
+    def from_segments(cls, model, segments, snap_distance: float = 0.0):
+        cmd = cls(model, None, None)
+        cmd.setText("Add Walls")
+
+        index = model.spatial_index
+        size = max(snap_distance, 1e-9)
+        cells: dict[tuple[int, int], list[Node]] = {}
+
+        def node_at(x: float, y: float) -> Node:
+            node = index.nearest_node(Point(x, y), snap_distance)
+            if node is not None:
+                return node
+
+            ci, cj = math.floor(x / size), math.floor(y / size)
+            for i in (ci - 1, ci, ci + 1):
+                for j in (cj - 1, cj, cj + 1):
+                    for node in cells.get((i, j), ()):
+                        if math.hypot(node.x - x, node.y - y) <= snap_distance:
+                            return node
+
+            node = Node(x, y)
+            cells.setdefault((ci, cj), []).append(node)
+            return node
+
+        for x1, y1, x2, y2 in segments:
+            start_node, end_node = node_at(x1, y1), node_at(x2, y2)
+            if start_node is not end_node:
+                cmd._walls.append(Wall(start_node, end_node))
+        return cmd
+
+    @property
+    def walls(self) -> list[Wall]:
+        return self._walls
 
+    @batched
     def redo(self):
-        self._model.add(self.wall)
+        for wall in self._walls:
+            self._model.add(wall)
 
+    @batched
     def undo(self):
-        self._model.remove(self.wall)
\ No newline at end of file
+        for wall in reversed(self._walls):
+            self._model.remove(wall)
@@ -0,0 +1,27 @@
+from PySide6.QtGui import QUndoCommand
+
+from model import Building
+
+class WeldNodesCommand(QUndoCommand):
+    def __init__(self, building: Building, tolerance: float = 0.0):
+        super().__init__("Weld Coincident Nodes")
+        self._merges = [(floor, floor.find_coincident_nodes(tolerance)) for floor in building.floors]
+
+        # Owners each merged node handed over, filled in by redo
+        self._moved_owners = []
+
+    @property
+    def removed_count(self) -> int:
+        return sum(len(merges) for _, merges in self._merges)
+
+    def redo(self):
+        self._moved_owners = []
+        for floor, merges in self._merges:
+            with floor.batch():
+                self._moved_owners.append([floor.merge_node(node, into) for node, into in merges])
+
+    def undo(self):
+        for (floor, merges), moved_owners in zip(self._merges, self._moved_owners):
+            with floor.batch():
+                for (node, into), owners in zip(reversed(merges), reversed(moved_owners)):
+                    floor.split_node(node, into, owners)
@@ -1,16 +1,48 @@
 from PySide6.QtGui import QUndoCommand
 
 from model import Zone, Node
+from .batched import batched
 
 class ZoneAddCommand(QUndoCommand):
-    def __init__(self, model, corner_points, name = "", zone_type=None):
+    def __init__(self, model, corner_points, name = "", zone_type=None, snap_distance: float = 0.0):
         super().__init__("Add Zone")
         self._model = model
         self._corner_points = corner_points
-        self._zone = Zone([Node(pt.x(), pt.y()) for pt in corner_points], name, zone_type)
-        
+
+        self._zones = []
+        if corner_points:
+            corner_nodes = self._snap_corners(corner_points, snap_distance)
+            self._zones.append(Zone(corner_nodes, name, zone_type))
+
+    # One step adding a zone for each list of corner nodes, such as the
+    # rooms found by FaceExtractor
+    @classmethod
+    def from_corner_nodes(cls, model, corner_node_lists: list[list[Node]], name_prefix="Room", zone_type=None):
+        cmd = cls(model, [])
+        cmd.setText("Add Zones")
+        cmd._zones = [
+            Zone(corner_nodes, f"{name_prefix} {i}", zone_type)
+            for i, corner_nodes in enumerate(corner_node_lists, start=1)
+        ]
+        return cmd
+
+    def _snap_corners(self, corner_points, snap_distance: float) -> list[Node]:
+        # Corners on existing nodes share them, each node at most once
+        index = self._model.spatial_index
+        corner_nodes = []
+        for pt in corner_points:
+            node = index.nearest_node(pt, snap_distance)
+            if node is None or node in corner_nodes:
+                node = Node(pt.x(), pt.y())
+            corner_nodes.append(node)
+        return corner_nodes
+
+    @batched
     def redo(self):
-        self._model.add(self._zone)
+        for zone in self._zones:
+            self._model.add(zone)
 
+    @batched
     def undo(self):
-        self._model.remove(self._zone)
\ No newline at end of file
+        for zone in reversed(self._zones):
+            self._model.remove(zone)
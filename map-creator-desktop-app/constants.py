@@ -32,4 +32,36 @@ poi_colors = {
 SAVE_FILE_EXTENSION = ".json"
 DEFAULT_SAVE_FILE_NAME = "building" + SAVE_FILE_EXTENSION
 
-GRID_SIZE_DEFAULT = 25
\ No newline at end of file
+BUILDING_FILE_EXTENSION = ".inmap"
+COMPACT_BUILDING_FILE_EXTENSION = ".inmapb"
+
+GRID_SIZE_DEFAULT = 25
+
+# New walls and zone corners this close to an existing node reuse it
+NODE_SNAP_DISTANCE = 1.0
+
+# Room detection closes gaps in walls up to this wide by default
+ROOM_GAP_TOLERANCE_DEFAULT = GRID_SIZE_DEFAULT
+
+# Wall simplification snaps wall ends this close together by default
+WALL_SIMPLIFY_TOLERANCE_DEFAULT = 5.0
+
+# Walls traced from a floor plan are at least this long, and at most this
+# thick, in map units
+WALL_TRACE_MIN_LENGTH = 50.0
+WALL_TRACE_MAX_THICKNESS = 60.0
+
+# Level of detail by view zoom: nodes are hidden below LOD_NODE_MIN_ZOOM,
+# labels lose their outline below LOD_LABEL_OUTLINE_MIN_ZOOM and are hidden
+# below LOD_LABEL_MIN_ZOOM, and points of interest closer than
+# LOD_POI_CLUSTER_RADIUS screen pixels merge into one marker below
+# LOD_POI_CLUSTER_MAX_ZOOM
+LOD_NODE_MIN_ZOOM = 0.5
+LOD_LABEL_OUTLINE_MIN_ZOOM = 0.6
+LOD_LABEL_MIN_ZOOM = 0.35
+LOD_POI_CLUSTER_MAX_ZOOM = 0.6
+LOD_POI_CLUSTER_RADIUS = 48
+
+# Floors whose graphics items stay in the scene, hidden, after switching away
+# from them, the current floor included
+FLOOR_SCENE_CACHE_SIZE = 3
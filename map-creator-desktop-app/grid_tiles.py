@@ -0,0 +1,202 @@
+import math
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QLineF, QPointF, QRectF
+from PySide6.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPen, QPixmap
+
+# Device pixels on each side of a cached grid tile
+GRID_TILE_SIZE = 256
+
+# Tile scales per doubling of the view scale, fine enough that a tile matches
+# the view scale to well under a pixel across its width
+LEVEL_RESOLUTION = 4096
+
+# Grid lines closer than this on screen are thinned out
+MIN_LINE_SPACING = 6.0
+
+# Axis labels are never smaller than this on screen, and they are spaced at
+# least this many label widths apart
+MIN_LABEL_PIXELS = 9.0
+LABEL_GAP = 1.25
+
+# Labels mark every multiple of this many scene units (half a metre)
+LABEL_STEP = 50
+
+# 1, 2, 5, 10, 20, 50, ... multiples used when thinning lines and labels
+def _thinned_step(step: float, min_step: float) -> float:
+    factor = 1
+    while step * factor < min_step:
+        for m in (2, 5, 10):
+            if step * factor * m >= min_step or m == 10:
+                factor *= m
+                break
+    return step * factor
+
+# Paints the grid, the axes and their metre labels. The same drawing fills the
+# cached tiles and, with caching turned off, the view itself.
+class GridRenderer:
+    def __init__(self,
+                 grid_color=QColor(220, 220, 220),
+                 axis_color=QColor(80, 80, 80),
+                 text_color=QColor(50, 50, 50),
+                 capacity: int = 192):
+        self.grid_color = QColor(grid_color)
+        self.axis_color = QColor(axis_color)
+        self.text_color = QColor(text_color)
+        self.capacity = capacity
+        self.cache_enabled = True
+
+        self._tiles: OrderedDict[tuple[int, int, int], QPixmap] = OrderedDict()
+        self._grid_size = None
+
+    def set_colors(self, grid_color: QColor, axis_color: QColor, text_color: QColor):
+        self.grid_color = QColor(grid_color)
+        self.axis_color = QColor(axis_color)
+        self.text_color = QColor(text_color)
+        self.clear()
+
+    def clear(self):
+        self._tiles.clear()
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles)
+
+    def draw(self, painter: QPainter, rect: QRectF, grid_size: float):
+        if grid_size <= 0:
+            return
+
+        transform = painter.worldTransform()
+        scale = math.hypot(transform.m11(), transform.m12())
+        if scale <= 0:
+            return
+
+        if not self.cache_enabled:
+            self.paint(painter, rect, grid_size, scale)
+            return
+
+        if grid_size != self._grid_size:
+            self.clear()
+            self._grid_size = grid_size
+
+        # Zoom steps give a handful of distinct scales, each with its own
+        # tiles drawn pixel for pixel
+        ratio = painter.device().devicePixelRatioF()
+        level = round(math.log2(scale * ratio) * LEVEL_RESOLUTION)
+        tile_scale = 2.0 ** (level / LEVEL_RESOLUTION)
+        span = GRID_TILE_SIZE / tile_scale
+
+        first_col, last_col = math.floor(rect.left() / span), math.floor(rect.right() / span)
+        first_row, last_row = math.floor(rect.top() / span), math.floor(rect.bottom() / span)
+
+        tiles = [
+            (col, row, self._tile(level, col, row, tile_scale, span, grid_size))
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        ]
+
+        painter.save()
+        if transform.isRotating():
+            # Tiles are cut in scene space, so they follow a rotated view too
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+            source = QRectF(0, 0, GRID_TILE_SIZE, GRID_TILE_SIZE)
+            for col, row, tile in tiles:
+                painter.drawPixmap(QRectF(col * span, row * span, span, span), tile, source)
+        else:
+            # Plain copies at whole device pixels, so every tile shares the
+            # same rounding and no seams open between them
+            painter.resetTransform()
+            origin = transform.map(QPointF(0, 0))
+            x0, y0 = round(origin.x() * ratio), round(origin.y() * ratio)
+            flip_x, flip_y = transform.m11() < 0, transform.m22() < 0
+            for col, row, tile in tiles:
+                x = x0 + (-(col + 1) if flip_x else col) * GRID_TILE_SIZE
+                y = y0 + (-(row + 1) if flip_y else row) * GRID_TILE_SIZE
+                painter.drawPixmap(QPointF(x / ratio, y / ratio), tile)
+        painter.restore()
+
+    def _tile(self, level: int, col: int, row: int, tile_scale: float, span: float, grid_size: float) -> QPixmap:
+        key = (level, col, row)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        tile = QPixmap(GRID_TILE_SIZE, GRID_TILE_SIZE)
+        tile.fill(Qt.transparent)
+
+        painter = QPainter(tile)
+        painter.scale(tile_scale, tile_scale)
+        painter.translate(-col * span, -row * span)
+        self.paint(painter, QRectF(col * span, row * span, span, span), grid_size, tile_scale)
+        painter.end()
+
+        self._tiles[key] = tile
+        while len(self._tiles) > self.capacity:
+            self._tiles.popitem(last=False)
+        return tile
+
+    # Draws the part of the grid inside rect, scale being the painter's pixels
+    # per scene unit. Lines and labels packed too tightly for that scale are thinned.
+    def paint(self, painter: QPainter, rect: QRectF, grid_size: float, scale: float):
+        step = _thinned_step(grid_size, MIN_LINE_SPACING / scale)
+
+        left    = math.floor(rect.left() / step) * step
+        right   = math.ceil(rect.right() / step) * step
+        top     = math.floor(rect.top() / step) * step
+        bottom  = math.ceil(rect.bottom() / step) * step
+
+        painter.setPen(QPen(self.grid_color, 0))
+
+        for i in range(round(left / step), round(right / step) + 1):
+            if i != 0:
+                painter.drawLine(QLineF(i * step, top, i * step, bottom))
+
+        for j in range(round(top / step), round(bottom / step) + 1):
+            if j != 0:
+                painter.drawLine(QLineF(left, j * step, right, j * step))
+
+        painter.setPen(QPen(self.axis_color, 0))
+        if left <= 0 <= right:
+            painter.drawLine(QLineF(0, top, 0, bottom))
+        if top <= 0 <= bottom:
+            painter.drawLine(QLineF(left, 0, right, 0))
+
+        self._paint_labels(painter, rect, grid_size, scale)
+
+    def _paint_labels(self, painter: QPainter, rect: QRectF, grid_size: float, scale: float):
+        font = QFont(painter.font())
+        font.setPixelSize(max(1, round(max(grid_size * 0.35, MIN_LABEL_PIXELS / scale) * scale)))
+
+        # Laid out in device pixels so the text is hinted at its real size
+        metrics = QFontMetricsF(font)
+        height = metrics.height() / scale
+        # Sized for labels up to a kilometre, the same for every tile
+        width = metrics.horizontalAdvance("-000.0m") / scale
+
+        step = _thinned_step(LABEL_STEP, width * LABEL_GAP)
+        gap = 2 / scale
+
+        painter.save()
+        painter.setFont(font)
+        painter.setPen(QPen(self.text_color, 0))
+        painter.scale(1 / scale, 1 / scale)
+
+        def draw_label(x: float, y: float, w: float, align, label: str):
+            painter.drawText(QRectF(x * scale, y * scale, w * scale, height * scale), align, label)
+
+        # Labels reaching into rect from just outside it are drawn too, so
+        # neighbouring tiles line up
+        if rect.left() - width - gap <= 0 <= rect.right():
+            for j in range(math.floor((rect.top() - height) / step), math.ceil(rect.bottom() / step) + 1):
+                if j != 0:
+                    y = j * step
+                    draw_label(-width - gap, y, width, Qt.AlignRight | Qt.AlignTop, str(-y / 100) + 'm')
+
+        if rect.top() - height - gap <= 0 <= rect.bottom():
+            for i in range(math.floor((rect.left() - width) / step), math.ceil(rect.right() / step) + 1):
+                if i != 0:
+                    x = i * step
+                    draw_label(x, gap, width, Qt.AlignLeft | Qt.AlignTop, str(x / 100) + 'm')
+
+        painter.restore()
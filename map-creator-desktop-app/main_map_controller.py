@@ -1,9 +1,24 @@
+from collections import OrderedDict
+
 from PySide6.QtWidgets import QGraphicsScene
 from PySide6.QtCore import QObject, QPointF, Signal
 from PySide6.QtGui import QUndoStack
 
 from tools import Tool
 from model import Floor, MapObject, Building
+from view import FloorLayerItem
+from constants import FLOOR_SCENE_CACHE_SIZE
+
+# The graphics items of one floor, under a layer item of their own, and the
+# maps between them and the floor's elements. Kept in sync with the floor
+# while it is not the one shown.
+class _FloorSceneState:
+    def __init__(self, floor: Floor):
+        self.floor = floor
+        self.layer = FloorLayerItem()
+        self.model_to_view = {}
+        self.view_to_model = {}
+        self.connections = []
 
 class MainMapController(QObject):
     pointer_canvas_moved = Signal(QPointF)
@@ -13,29 +28,32 @@ class MainMapController(QObject):
                  model: Building, 
                  scene: QGraphicsScene, 
                  grid_size: int = 50,
-                 type_to_graphics_item: dict[type, type] = None):
+                 type_to_graphics_item: dict[type, type] = None,
+                 floor_cache_size: int = FLOOR_SCENE_CACHE_SIZE):
         super().__init__()
         self.model = model
         self.scene = scene
         self._grid_size = grid_size
         self._current_tool = None
         self._show_grid = True
-        self._model_to_view_map = {}
-        self._view_to_model_map = {}
         self._undo_stack = QUndoStack()
 
+        # Scene states of recently shown floors, most recent last
+        self._floor_states: OrderedDict[Floor, _FloorSceneState] = OrderedDict()
+        self._floor_cache_size = max(1, floor_cache_size)
+        self._state: _FloorSceneState = None
+
         if not type_to_graphics_item:
             raise ValueError("type_to_graphics_item mapping must be provided.")
 
         self._model_class_to_view_class = type_to_graphics_item
 
         self._current_floor = self.model.get_floor(0)
-        self._current_floor.item_added.connect(self._on_item_added)
-        self._current_floor.item_removed.connect(self._on_item_removed)
-        
         if self._current_floor is None:
             raise ValueError("Building must have at least one floor.")
 
+        self._show_floor(self._current_floor)
+
     # ------------------------------------
     # ---------- Grid methods ------------
     # ------------------------------------
@@ -107,8 +125,13 @@ class MainMapController(QObject):
         self._current_tool = type(self._current_tool)(self, self.scene) if self._current_tool else None
         self.model = building
         self.building_changed.emit(self.model)
+
+        # Floors of the old building are gone for good
+        for state in list(self._floor_states.values()):
+            self._drop_floor_state(state)
+        self._state = None
+
         self.current_floor = self.model.get_floor(0)
-        self._redraw_scene()
 
     @property
     def current_floor(self) -> Floor:
@@ -116,51 +139,119 @@ class MainMapController(QObject):
     
     @current_floor.setter
     def current_floor(self, floor: Floor):
-        try:
-            self._current_floor.item_added.disconnect(self._on_item_added)
-            self._current_floor.item_removed.disconnect(self._on_item_removed)
-        except TypeError:
-            pass
-
         self._current_floor = floor
-        self._current_floor.item_added.connect(self._on_item_added)
-        self._current_floor.item_removed.connect(self._on_item_removed)
         
         if self._current_tool:
             self._current_tool.deactivate()
 
-        self._redraw_scene()
+        self._show_floor(floor)
+
+    @property
+    def _model_to_view_map(self) -> dict:
+        return self._state.model_to_view
+
+    @property
+    def _view_to_model_map(self) -> dict:
+        return self._state.view_to_model
 
     def get_model_for_item(self, item) -> MapObject:
-        return self._view_to_model_map.get(item, None)
+        return self._state.view_to_model.get(item, None)
     
     def get_item_for_model(self, model):
-        return self._model_to_view_map.get(model, None)
-    
-    def _redraw_scene(self):
-        self.scene.clear()
-        self._model_to_view_map.clear()
-        self._view_to_model_map.clear()
+        return self._state.model_to_view.get(model, None)
 
-        floor = self._current_floor
-        for element in floor.elements:
-            self._on_item_added(element)
+    # Floors shown recently keep their items, hidden, and follow their floor's
+    # signals, so switching back to them only swaps which layer is visible
+    def _show_floor(self, floor: Floor):
+        state = self._floor_states.get(floor)
+        if state is None:
+            state = self._create_floor_state(floor)
+        self._floor_states.move_to_end(floor)
 
-    def _on_item_added(self, item):
-        view_class = self._model_class_to_view_class.get(type(item), None)
-        if view_class is None:
+        previous = self._state
+        if previous is state:
             return
 
-        new_item = view_class(item)
-        self._model_to_view_map[item] = new_item
-        self._view_to_model_map[new_item] = item
-        self.scene.addItem(new_item)
+        if previous is not None:
+            self.scene.hide_layer(previous.layer)
+
+        self._state = state
+        self.scene.show_layer(state.layer)
 
-    def _on_item_removed(self, element):
-        item = self._model_to_view_map.pop(element, None)
+        while len(self._floor_states) > self._floor_cache_size:
+            _, oldest = self._floor_states.popitem(last=False)
+            self._drop_floor_state(oldest)
+
+    def _create_floor_state(self, floor: Floor) -> _FloorSceneState:
+        state = _FloorSceneState(floor)
+        self.scene.add_layer(state.layer)
+        self._floor_states[floor] = state
+
+        state.connections = [
+            (floor.item_added, lambda element: self._on_item_added(state, element)),
+            (floor.item_removed, lambda element: self._on_item_removed(state, element)),
+            (floor.items_added, lambda elements: self._on_items_added(state, elements)),
+            (floor.items_removed, lambda elements: self._on_items_removed(state, elements)),
+            (floor.elements_updated, lambda elements: self._on_elements_updated(state, elements)),
+            (floor.underlay_changed, lambda underlay: self._on_underlay_changed(state)),
+        ]
+        for signal, slot in state.connections:
+            signal.connect(slot)
+
+        self._on_items_added(state, floor.elements)
+        return state
+
+    def _drop_floor_state(self, state: _FloorSceneState):
+        for signal, slot in state.connections:
+            signal.disconnect(slot)
+        state.connections.clear()
+
+        self._floor_states.pop(state.floor, None)
+
+        # Items leaving the scene stop listening to their models
+        self.scene.remove_layer(state.layer)
+        state.model_to_view.clear()
+        state.view_to_model.clear()
+
+    def _create_item(self, state: _FloorSceneState, element):
+        view_class = self._model_class_to_view_class.get(type(element), None)
+        if view_class is None:
+            return None
+
+        new_item = view_class(element)
+        state.model_to_view[element] = new_item
+        state.view_to_model[new_item] = element
+        return new_item
+
+    def _on_item_added(self, state: _FloorSceneState, element):
+        new_item = self._create_item(state, element)
+        if new_item is not None:
+            self.scene.add_item(new_item, state.layer)
+
+    def _on_items_added(self, state: _FloorSceneState, elements):
+        new_items = [self._create_item(state, element) for element in elements]
+        self.scene.add_items([item for item in new_items if item is not None], state.layer)
+
+    def _on_elements_updated(self, state: _FloorSceneState, elements):
+        for element in elements:
+            item = state.model_to_view.get(element, None)
+            if item is not None:
+                item.update_item()
+
+    # The floor plan is drawn in the scene background
+    def _on_underlay_changed(self, state: _FloorSceneState):
+        if state is self._state:
+            self.scene.update()
+
+    def _on_item_removed(self, state: _FloorSceneState, element):
+        item = state.model_to_view.pop(element, None)
         if item:
             self.scene.removeItem(item)
-            del self._view_to_model_map[item]
+            del state.view_to_model[item]
+
+    def _on_items_removed(self, state: _FloorSceneState, elements):
+        for element in elements:
+            self._on_item_removed(state, element)
 
     # ------------------------------------
     # ------- View event handling --------
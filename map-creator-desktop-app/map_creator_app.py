@@ -1,10 +1,13 @@
 import json
-from PySide6.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QDockWidget, QMessageBox
-from PySide6.QtGui import QShortcut, QKeySequence
+from PySide6.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QDockWidget, QMessageBox, QInputDialog
+from PySide6.QtGui import QShortcut, QKeySequence, QImageReader
 from PySide6.QtCore import Qt
 
 from main_map_controller import MainMapController
 from cad_scene import InteractiveScene
+from building_saver import BuildingSaver
+from background_validator import BackgroundValidator
+from background_vectorizer import BackgroundVectorizer
 
 from tools import (
     WallAddTool, SelectTool, ZoneAddTool, 
@@ -12,7 +15,8 @@ from tools import (
 )
 
 from model import (
-    Building, Floor, Node, Wall, Zone, PointOfInterest
+    Building, Floor, Node, Wall, Zone, PointOfInterest, FaceExtractor, WallSimplifier,
+    FloorUnderlay, WallVectorizer
 )
 
 from view import (
@@ -21,14 +25,21 @@ from view import (
 )
 
 from widgets import (
-    Toolbar, AppMenu, FloorView, AutoSyncFloorList, LayersPanel, RightPanelDock
+    Toolbar, AppMenu, FloorView, AutoSyncFloorList, LayersPanel, RightPanelDock,
+    ValidationPanel
 )
 
-from commands import FloorAddCommand, FloorRemoveCommand
+from commands import (
+    FloorAddCommand, FloorRemoveCommand, WeldNodesCommand, ZoneAddCommand, SimplifyWallsCommand,
+    WallAddCommand, SetFloorUnderlayCommand
+)
 
-from utils.general import ask_floor_name, load_building, save_building
+from utils.general import ask_floor_name, load_building, save_building, load_file_dialog, import_cad_floor
 
-from constants import icons, GRID_SIZE_DEFAULT
+from constants import (
+    icons, GRID_SIZE_DEFAULT, NODE_SNAP_DISTANCE, ROOM_GAP_TOLERANCE_DEFAULT,
+    WALL_SIMPLIFY_TOLERANCE_DEFAULT, WALL_TRACE_MIN_LENGTH, WALL_TRACE_MAX_THICKNESS
+)
 
 class MapCreatorApp(QMainWindow):
     def __init__(self,
@@ -42,6 +53,14 @@ class MapCreatorApp(QMainWindow):
         self._scene: InteractiveScene = None
         self._controller: MainMapController = None
         self._floor_view: FloorView = None
+        self._building_saver: BuildingSaver = None
+        self._validator: BackgroundValidator = None
+        self._vectorizer: BackgroundVectorizer = None
+        self._tracing_floor: Floor = None
+        self._layers_panel: LayersPanel = None
+        self._floor_list: AutoSyncFloorList = None
+        self._validation_panel: ValidationPanel = None
+        self._validation_dock: QDockWidget = None
 
         self._setup_core()
         self._setup_ui()
@@ -71,6 +90,24 @@ class MapCreatorApp(QMainWindow):
         
         self._scene.set_controller(self._controller)
 
+        self._building_saver = BuildingSaver(self)
+        self._building_saver.save_failed.connect(self._on_save_failed)
+
+        self._validator = BackgroundValidator(self)
+
+        self._vectorizer = BackgroundVectorizer(self)
+        self._vectorizer.progress.connect(
+            lambda done, total: self.statusBar().showMessage(f"Tracing walls... {done * 100 // total}%")
+        )
+        self._vectorizer.finished.connect(self._on_walls_traced)
+        self._vectorizer.cancelled.connect(self.statusBar().clearMessage)
+        self._vectorizer.failed.connect(self._on_wall_tracing_failed)
+        self._controller.building_changed.connect(lambda _: self._vectorizer.cancel())
+
+        underlay_renderer = self._scene.underlay_renderer
+        underlay_renderer.build_progress.connect(self._on_underlay_build_progress)
+        underlay_renderer.build_failed.connect(self._on_underlay_build_failed)
+
     def _setup_ui(self):
         # Add main floor view
         self._floor_view = FloorView(self._controller)
@@ -100,8 +137,38 @@ class MapCreatorApp(QMainWindow):
         right_panel = RightPanelDock(self, layers_panel, floor_list)
         self.addDockWidget(Qt.RightDockWidgetArea, right_panel)
 
+        self._layers_panel = layers_panel
+        self._floor_list = floor_list
+
+        # Add validation results dock
+        self._setup_validation_panel()
+
         self._create_menu_bar(self._controller, self._floor_view)
 
+    def _setup_validation_panel(self):
+        panel = ValidationPanel()
+        panel.run_requested.connect(self._validate_building)
+        panel.cancel_requested.connect(self._validator.cancel)
+        panel.issue_selected.connect(self._show_issue)
+
+        self._validator.progress.connect(panel.set_progress)
+        self._validator.finished.connect(panel.show_issues)
+        self._validator.cancelled.connect(panel.show_cancelled)
+        self._validator.failed.connect(panel.show_failed)
+
+        # Results of another building are no use
+        self._controller.building_changed.connect(lambda _: self._validator.cancel())
+        self._controller.building_changed.connect(lambda _: panel.clear())
+
+        dock = QDockWidget("Problems", self)
+        dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.RightDockWidgetArea)
+        dock.setWidget(panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, dock)
+        dock.hide()
+
+        self._validation_panel = panel
+        self._validation_dock = dock
+
     def _setup_shortcuts(self):
         delete_shortcut = QShortcut(QKeySequence(Qt.Key_Escape), self)
         delete_shortcut.activated.connect(self._controller.reset_current_tool)
@@ -160,6 +227,205 @@ class MapCreatorApp(QMainWindow):
         if new_name:
             floor.name = new_name
     
+    def _import_cad(self):
+        imported = import_cad_floor(self)
+        if imported is None:
+            return
+
+        floor, result = imported
+        if result.elements == 0:
+            QMessageBox.information(
+                self,
+                "Import CAD Drawing",
+                f"Nothing to import: none of the {result.entities} entities is on a wall, room or label layer."
+            )
+            return
+
+        self._controller.execute(FloorAddCommand(self._controller.building, floor))
+        QMessageBox.information(
+            self,
+            "Import CAD Drawing",
+            f"Added floor \"{floor.name}\" with {result.walls} walls, {result.zones} zones "
+            f"and {result.points_of_interest} points of interest.\n"
+            f"{result.skipped} unsupported entities were skipped."
+        )
+
+    def _on_save_failed(self, path: str, error: str):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to save building to file: {path}\n{error}"
+        )
+
+    def _validate_building(self):
+        # start() cancels a run in progress, which resets the panel
+        self._validator.start(self._controller.building)
+        self._validation_panel.set_running(True)
+        self._validation_dock.show()
+
+    def _weld_nodes(self):
+        cmd = WeldNodesCommand(self._controller.building)
+        if cmd.removed_count:
+            self._controller.execute(cmd)
+
+        QMessageBox.information(
+            self,
+            "Weld Coincident Nodes",
+            f"Removed {cmd.removed_count} duplicate nodes."
+        )
+
+    def _detect_rooms(self):
+        gap, ok = QInputDialog.getDouble(
+            self, "Detect Rooms", "Close gaps in walls up to:",
+            ROOM_GAP_TOLERANCE_DEFAULT, 0, 10000, 1
+        )
+        if not ok:
+            return
+
+        floor = self._controller.current_floor
+        faces = FaceExtractor(NODE_SNAP_DISTANCE, gap).extract(floor)
+        if not faces:
+            QMessageBox.information(self, "Detect Rooms", "No new rooms found.")
+            return
+
+        answer = QMessageBox.question(
+            self,
+            "Detect Rooms",
+            f"Found {len(faces)} rooms without a zone. Add them as zones?"
+        )
+        if answer == QMessageBox.Yes:
+            self._controller.execute(ZoneAddCommand.from_corner_nodes(floor, faces))
+
+    def _simplify_walls(self):
+        tolerance, ok = QInputDialog.getDouble(
+            self, "Simplify Walls", "Snap wall ends closer than:",
+            WALL_SIMPLIFY_TOLERANCE_DEFAULT, 0.01, 1000, 2
+        )
+        if not ok:
+            return
+
+        cmd = SimplifyWallsCommand(self._controller.current_floor, WallSimplifier(tolerance))
+        self._controller.execute(cmd)
+
+        QMessageBox.information(
+            self,
+            "Simplify Walls",
+            f"Removed {cmd.removed_walls} walls and {cmd.removed_nodes} nodes, "
+            f"about {cmd.removed_bytes / 1024:.1f} KB of the saved file."
+        )
+
+    def _trace_walls(self):
+        floor = self._controller.current_floor
+        underlay = floor.underlay
+        if underlay is None:
+            QMessageBox.information(self, "Trace Walls", "Import a floor plan for this floor first.")
+            return
+
+        # Limits are in map units, the image is traced in pixels
+        vectorizer = WallVectorizer(
+            min_length=max(8.0, WALL_TRACE_MIN_LENGTH / underlay.scale),
+            max_thickness=max(4.0, WALL_TRACE_MAX_THICKNESS / underlay.scale),
+        )
+        self._tracing_floor = floor
+        self._vectorizer.start(underlay, vectorizer)
+        self.statusBar().showMessage("Tracing walls...")
+
+    def _on_walls_traced(self, segments: list):
+        floor, self._tracing_floor = self._tracing_floor, None
+        self.statusBar().clearMessage()
+        if floor not in self._controller.building.floors:
+            return
+
+        if not segments:
+            QMessageBox.information(self, "Trace Walls", "No walls found in the floor plan.")
+            return
+
+        cmd = WallAddCommand.from_segments(floor, segments, NODE_SNAP_DISTANCE)
+        self._controller.execute(cmd)
+        self.statusBar().showMessage(f"Traced {len(cmd.walls)} walls on {floor.name}", 5000)
+
+    def _on_wall_tracing_failed(self, error: str):
+        self._tracing_floor = None
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to trace walls:\n{error}"
+        )
+
+    def _import_underlay(self):
+        path = load_file_dialog(self, "Import Floor Plan", "Images (*.png *.jpg *.jpeg *.bmp *.tif *.tiff)")
+        if path is None:
+            return
+
+        size = QImageReader(path).size()
+        if size.isEmpty():
+            QMessageBox.critical(self, "Error", f"Can't read image: {path}")
+            return
+
+        scale, ok = QInputDialog.getDouble(
+            self, "Import Floor Plan", "Map units per image pixel:", 1.0, 0.0001, 1000, 4
+        )
+        if not ok:
+            return
+
+        # Tiles are cut in the background the first time the plan is drawn
+        underlay = FloorUnderlay(path, size.width(), size.height(), scale)
+        self._controller.execute(SetFloorUnderlayCommand(self._controller.current_floor, underlay))
+
+    def _remove_underlay(self):
+        floor = self._controller.current_floor
+        if floor.underlay is not None:
+            self._controller.execute(SetFloorUnderlayCommand(floor, None))
+
+    def _on_underlay_build_progress(self, path: str, done: int, total: int):
+        if done < total:
+            self.statusBar().showMessage(f"Preparing floor plan... {done * 100 // total}%")
+        else:
+            self.statusBar().showMessage("Floor plan ready", 3000)
+
+    def _on_underlay_build_failed(self, path: str, error: str):
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to prepare floor plan: {path}\n{error}"
+        )
+
+    def _show_issue(self, issue):
+        if issue.floor not in self._controller.building.floors:
+            return
+
+        if self._controller.current_floor is not issue.floor:
+            # The list selection switches the controller's floor
+            self._floor_list.select_floor(issue.floor)
+
+        elements = [element for element in issue.elements if element.floor is issue.floor]
+        if elements:
+            # Nodes are edited on the layer of what they belong to
+            element = elements[0]
+            owner = next(iter(element.owners), None) if isinstance(element, Node) else None
+            layer = type(owner) if owner is not None else type(element)
+            self._layers_panel.select_type(layer)
+
+        self._scene.clearSelection()
+        for element in elements:
+            item = self._controller.get_item_for_model(element)
+            if item is not None:
+                item.setSelected(True)
+
+        if issue.position is not None:
+            self._floor_view.centerOn(*issue.position)
+
+    def closeEvent(self, event):
+        self._validator.cancel()
+        self._validator.wait()
+        self._vectorizer.cancel()
+        self._vectorizer.wait()
+        self._scene.underlay_renderer.wait()
+        self._building_saver.wait()
+        super().closeEvent(event)
+
     def _reset_state(self):
         building = Building()
         building.add_floor(Floor("Ground Floor"))
@@ -172,11 +438,23 @@ class MapCreatorApp(QMainWindow):
         # File signals
         # self.menu_bar.new_file_requested.connect(self._reset_state)
         self.menu_bar.load_requested.connect(lambda: setattr(self._controller, 'building', load_building(self)))
-        self.menu_bar.save_requested.connect(lambda: save_building(self, self._controller.building))
+        self.menu_bar.import_cad_requested.connect(self._import_cad)
+        self.menu_bar.save_requested.connect(
+            lambda: save_building(self, self._controller.building, self._building_saver)
+        )
         
         # Edit signals
         self.menu_bar.redo_triggered.connect(presenter.redo)
         self.menu_bar.undo_triggered.connect(presenter.undo)
 
+        # Tools signals
+        self.menu_bar.validate_requested.connect(self._validate_building)
+        self.menu_bar.weld_nodes_requested.connect(self._weld_nodes)
+        self.menu_bar.detect_rooms_requested.connect(self._detect_rooms)
+        self.menu_bar.simplify_walls_requested.connect(self._simplify_walls)
+        self.menu_bar.trace_walls_requested.connect(self._trace_walls)
+
         # View signals
-        self.menu_bar.map_theme_triggered.connect(lambda theme: setattr(view, 'map_theme', theme))
\ No newline at end of file
+        self.menu_bar.map_theme_triggered.connect(lambda theme: setattr(view, 'map_theme', theme))
+        self.menu_bar.import_underlay_requested.connect(self._import_underlay)
+        self.menu_bar.remove_underlay_requested.connect(self._remove_underlay)
\ No newline at end of file
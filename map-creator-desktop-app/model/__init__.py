@@ -1,19 +1,40 @@
 from .building import Building
+from .observable import Observable, Signal
+from .point import Point
 from .map_object import MapObject
 from .node import Node
 from .wall import Wall
 from .point_of_interest import PointOfInterest, PointOfInterestType
 from .zone import Zone, ZoneType
+from .zone_geometry import ZoneGeometry
+from .fingerprints import Fingerprints
 from .floor import Floor
+from .floor_underlay import FloorUnderlay
+from .indexed_list import IndexedList
+from .spatial_index import SpatialIndex
+from .face_extraction import FaceExtractor
+from .wall_simplification import WallSimplifier
+from .wall_vectorization import WallVectorizer
 
 __all__ = [
     "Building", 
     "Zone", 
     "ZoneType",
+    "ZoneGeometry",
+    "Fingerprints",
     "Node",
     "Floor", 
+    "FloorUnderlay",
     "MapObject", 
     "Wall", 
     "PointOfInterest",
-    "PointOfInterestType"
+    "PointOfInterestType",
+    "Point",
+    "Observable",
+    "Signal",
+    "SpatialIndex",
+    "IndexedList",
+    "FaceExtractor",
+    "WallSimplifier",
+    "WallVectorizer",
 ]
\ No newline at end of file
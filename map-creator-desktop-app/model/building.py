@@ -1,10 +1,13 @@
-from PySide6.QtCore import QObject, Signal
-
 import uuid
 
 from .floor import Floor
+from .observable import Observable, Signal
+from .zone import Zone
+
+class Building(Observable):
+    __slots__ = ("id", "_floors", "_zone_connections", "_parked_connections", "_zone_floors",
+                 "_lazy_connections", "__weakref__")
 
-class Building(QObject):
     floor_added = Signal(Floor)
     floor_removed = Signal(Floor)
     floor_name_changed = Signal(str)
@@ -13,26 +16,171 @@ class Building(QObject):
         super().__init__()
         self.id = id if id else uuid.uuid4()
         self._floors: list[Floor] = []
-        self._zone_connections = {}
+
+        # Connections between zones that are both on a floor of the building
+        self._zone_connections: dict[Zone, set[Zone]] = {}
+
+        # Connections of removed zones, restored when the zone or its floor
+        # comes back (undo of a delete or floor removal)
+        self._parked_connections: dict[Zone, set[Zone]] = {}
+
+        # Every zone on a loaded floor of the building
+        self._zone_floors: dict[Zone, Floor] = {}
+
+        # zone uuid -> [(zone1 uuid, floor1, zone2 uuid, floor2)] for
+        # connections touching floors that are not loaded yet
+        self._lazy_connections = {}
 
     def add_connection(self, zone1, zone2):
-        self._zone_connections.setdefault(zone1, set()).add(zone2)
-        self._zone_connections.setdefault(zone2, set()).add(zone1)
+        if zone1 in self._zone_floors and zone2 in self._zone_floors:
+            self._zone_connections.setdefault(zone1, set()).add(zone2)
+            self._zone_connections.setdefault(zone2, set()).add(zone1)
+        else:
+            self._parked_connections.setdefault(zone1, set()).add(zone2)
+            self._parked_connections.setdefault(zone2, set()).add(zone1)
+
+    def add_lazy_connection(self, zone1_id: uuid.UUID, floor1: Floor, zone2_id: uuid.UUID, floor2: Floor):
+        connection = (zone1_id, floor1, zone2_id, floor2)
+        self._lazy_connections.setdefault(zone1_id, []).append(connection)
+        self._lazy_connections.setdefault(zone2_id, []).append(connection)
+
+        if floor1.is_loaded and floor2.is_loaded:
+            self._resolve_lazy_connections([connection])
+
+    def on_floor_loaded(self, floor: Floor):
+        self._index_zones(floor)
+
+        ready = {
+            connection
+            for zone in floor.zones
+            for connection in self._lazy_connections.get(zone.uuid, [])
+            if connection[1].is_loaded and connection[3].is_loaded
+        }
+        self._resolve_lazy_connections(ready)
+
+    def _resolve_lazy_connections(self, connections):
+        zones_by_floor = {}
+
+        def find_zone(floor: Floor, zone_id: uuid.UUID):
+            if floor not in zones_by_floor:
+                zones_by_floor[floor] = {zone.uuid: zone for zone in floor.zones}
+            return zones_by_floor[floor].get(zone_id)
+
+        for connection in connections:
+            zone1_id, floor1, zone2_id, floor2 = connection
+            zone1 = find_zone(floor1, zone1_id)
+            zone2 = find_zone(floor2, zone2_id)
+
+            for zone_id in (zone1_id, zone2_id):
+                pending = self._lazy_connections.get(zone_id, [])
+                if connection in pending:
+                    pending.remove(connection)
+                if not pending:
+                    self._lazy_connections.pop(zone_id, None)
+
+            if zone1 is not None and zone2 is not None:
+                self.add_connection(zone1, zone2)
+
+    def _load_connected_floors(self, zone):
+        for _, floor1, _, floor2 in list(self._lazy_connections.get(zone.uuid, [])):
+            floor1.ensure_loaded()
+            floor2.ensure_loaded()
 
     def remove_connection(self, zone1, zone2):
-        self._zone_connections.get(zone1, set()).discard(zone2)
-        self._zone_connections.get(zone2, set()).discard(zone1)
+        for connections in (self._zone_connections, self._parked_connections):
+            self._discard_edge(connections, zone1, zone2)
+            self._discard_edge(connections, zone2, zone1)
+
+    @staticmethod
+    def _discard_edge(connections: dict, zone1, zone2):
+        connected = connections.get(zone1)
+        if connected is not None:
+            connected.discard(zone2)
+            if not connected:
+                del connections[zone1]
 
     def get_zones_connected_to(self, zone):
-        connected = self._zone_connections.get(zone, None)
-        if connected is None:
-            return set()
-        
-        all_zones = self.get_all_zones()
-        result = filter(lambda z: z in all_zones, connected)
-
-        return set(result)
-        
+        self._load_connected_floors(zone)
+        return set(self._zone_connections.get(zone, ()))
+
+    def get_zone_floor(self, zone) -> Floor | None:
+        return self._zone_floors.get(zone)
+
+    def _connection_pairs(self):
+        for zone, connected_zones in self._zone_connections.items():
+            for connected_zone in connected_zones:
+                # Each connection is stored both ways, report it once
+                if id(zone) < id(connected_zone):
+                    yield zone, connected_zone
+
+    # ------------------------------------
+    # ------------ Zone index ------------
+    # ------------------------------------
+    def _index_zones(self, floor: Floor):
+        for zone in floor.zones:
+            self._zone_restored(zone, floor)
+
+    def _unindex_zones(self, floor: Floor):
+        for zone in floor.zones:
+            self._zone_removed(zone)
+
+    def _on_item_added(self, element):
+        if type(element) is Zone:
+            floor = element.floor
+            if floor is not None and floor.building is self:
+                self._zone_restored(element, floor)
+
+    def _on_item_removed(self, element):
+        if type(element) is Zone:
+            self._zone_removed(element)
+
+    def _on_items_added(self, elements):
+        for element in elements:
+            self._on_item_added(element)
+
+    def _on_items_removed(self, elements):
+        for element in elements:
+            self._on_item_removed(element)
+
+    def _zone_restored(self, zone, floor: Floor):
+        self._zone_floors[zone] = floor
+
+        for connected_zone in self._parked_connections.pop(zone, ()):
+            if connected_zone in self._zone_floors:
+                self._discard_edge(self._parked_connections, connected_zone, zone)
+                self._zone_connections.setdefault(zone, set()).add(connected_zone)
+                self._zone_connections.setdefault(connected_zone, set()).add(zone)
+            else:
+                # Stays parked under the other zone until it is back too
+                self._parked_connections.setdefault(connected_zone, set()).add(zone)
+
+    def _zone_removed(self, zone):
+        if self._zone_floors.pop(zone, None) is None:
+            return
+
+        connected_zones = self._zone_connections.pop(zone, ())
+        for connected_zone in connected_zones:
+            self._discard_edge(self._zone_connections, connected_zone, zone)
+        if connected_zones:
+            self._parked_connections.setdefault(zone, set()).update(connected_zones)
+
+    def get_connection_records(self) -> list[tuple]:
+        floors = set(self._floors)
+
+        records = {}
+        for zone, connected_zone in self._connection_pairs():
+            records[frozenset((zone.uuid, connected_zone.uuid))] = (
+                zone.uuid, self._zone_floors[zone], connected_zone.uuid, self._zone_floors[connected_zone]
+            )
+
+        for pending in self._lazy_connections.values():
+            for connection in pending:
+                zone1_id, floor1, zone2_id, floor2 = connection
+                if floor1 in floors and floor2 in floors:
+                    records[frozenset((zone1_id, zone2_id))] = connection
+
+        return list(records.values())
+
     def get_all_zones(self):
         zones = []
         for floor in self._floors:
@@ -43,20 +191,48 @@ class Building(QObject):
         if floor not in self._floors:
             floor.building = self
             self._floors.append(floor)
+            self._attach_floor(floor)
             self.floor_added.emit(floor)
-            floor.name_changed.connect(self.floor_name_changed)
 
     def remove_floor(self, floor: Floor):
         if floor in self._floors:
-            self._floors.remove(floor)
-            self.floor_removed.emit(floor)
-            floor.name_changed.disconnect(self.floor_name_changed)
+            self.remove_floor_at(self._floors.index(floor))
 
     def remove_floor_at(self, index: int):
         if 0 <= index < len(self._floors):
+            # A removed stub could outlive the file it would be loaded from
+            self._floors[index].ensure_loaded()
+
             floor = self._floors.pop(index)
+            self._detach_floor(floor)
             self.floor_removed.emit(floor)
 
+    def _attach_floor(self, floor: Floor):
+        floor.name_changed.connect(self.floor_name_changed)
+        floor.item_added.connect(self._on_item_added)
+        floor.item_removed.connect(self._on_item_removed)
+        floor.items_added.connect(self._on_items_added)
+        floor.items_removed.connect(self._on_items_removed)
+
+        # Stubs are indexed by on_floor_loaded once they are read
+        if floor.is_loaded:
+            self._index_zones(floor)
+
+    def _detach_floor(self, floor: Floor):
+        floor.name_changed.disconnect(self.floor_name_changed)
+        floor.item_added.disconnect(self._on_item_added)
+        floor.item_removed.disconnect(self._on_item_removed)
+        floor.items_added.disconnect(self._on_items_added)
+        floor.items_removed.disconnect(self._on_items_removed)
+        self._unindex_zones(floor)
+
+    def get_element(self, element_id: uuid.UUID):
+        for floor in self._floors:
+            element = floor.get_element(element_id)
+            if element is not None:
+                return element
+        return None
+
     def get_floor(self, index: int) -> Floor | None:
         if 0 <= index < len(self._floors):
             return self._floors[index]
@@ -68,22 +244,21 @@ class Building(QObject):
     
     @floors.setter
     def floors(self, new_floors: list[Floor]):
+        for floor in self._floors:
+            self._detach_floor(floor)
+
         self._floors = new_floors
+        for floor in new_floors:
+            floor.building = self
+            self._attach_floor(floor)
 
     def to_dict(self) -> dict:
-        all_zones = [z for floor in self._floors for z in floor.zones]
-        connections = set()
-
-        for zone in all_zones:
-            connected_zones = self.get_zones_connected_to(zone)
-            for connected_zone in connected_zones:
-                conn = (zone, connected_zone)
-                if (connected_zone, zone) not in connections:
-                    connections.add(conn)
+        floors = [floor.to_dict() for floor in self._floors]
+        connections = list(self._connection_pairs())
 
         return {
             "id": str(self.id),
-            "floors": [floor.to_dict() for floor in self._floors],
+            "floors": floors,
             "zone_connections": [
                 {
                     "zone1_id": str(zone1.uuid), 
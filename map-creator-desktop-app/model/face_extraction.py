@@ -0,0 +1,295 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+import math
+
+from .node import Node
+from .point import Point
+from .spatial_index import polygon_contains
+
+if TYPE_CHECKING:
+    from .floor import Floor
+    from .wall import Wall
+
+# Finds the rooms enclosed by a floor's walls. The walls are turned into a
+# planar graph first:
+#   - wall ends closer than tolerance are one vertex,
+#   - a wall ending on another wall splits that wall there,
+#   - a loose end within gap_tolerance of another wall or end is joined to it,
+#   - dead ends are pruned.
+# Every bounded face of the graph is a room. Faces are returned as lists of
+# corner nodes, the floor's own nodes where there is one so that zones made
+# from them share nodes with the walls, and new nodes where a wall was split.
+
+class FaceExtractor:
+    def __init__(self, tolerance: float = 1.0, gap_tolerance: float = 0.0):
+        if tolerance < 0 or gap_tolerance < 0:
+            raise ValueError("Tolerances cannot be negative.")
+
+        self._tolerance = float(tolerance)
+        self._gap_tolerance = max(float(gap_tolerance), self._tolerance)
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    @property
+    def gap_tolerance(self) -> float:
+        return self._gap_tolerance
+
+    def extract(self, floor: Floor, skip_zoned: bool = True) -> list[list[Node]]:
+        graph = _WallGraph(floor.walls, self._tolerance, self._gap_tolerance)
+        graph.join_loose_ends()
+        graph.prune()
+
+        faces = []
+        for face in graph.faces():
+            points = [(graph.xs[v], graph.ys[v]) for v in face]
+
+            # Rooms that already have a zone are not offered again
+            if skip_zoned and floor.spatial_index.zones_at(Point(*_interior_point(points))):
+                continue
+
+            faces.append([graph.nodes[v] for v in face])
+        return faces
+
+
+class _WallGraph:
+    def __init__(self, walls: Iterable[Wall], tolerance: float, gap_tolerance: float):
+        self._tolerance = tolerance
+        self._gap_tolerance = gap_tolerance
+
+        self.nodes: list[Node] = []
+        self.xs: list[float] = []
+        self.ys: list[float] = []
+        self.adjacency: list[set[int]] = []
+
+        walls = list(walls)
+        self._node_vertex: dict[Node, int] = {}
+
+        # Vertices are looked up within the gap tolerance, walls by the
+        # cells around a loose end
+        self._vertex_cell_size = gap_tolerance if gap_tolerance > 0 else 1.0
+        self._vertex_cells: dict[tuple[int, int], list[int]] = {}
+
+        lengths = [wall.length() for wall in walls]
+        mean_length = sum(lengths) / len(lengths) if lengths else 1.0
+        self._edge_cell_size = max(mean_length, 2 * gap_tolerance, 1.0)
+        self._edge_cells: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+        for wall in walls:
+            a = self._vertex(wall.start_node)
+            b = self._vertex(wall.end_node)
+            self._add_edge(a, b)
+
+    # ------------------------------------
+    # ------------ Building --------------
+    # ------------------------------------
+    def _vertex(self, node: Node) -> int:
+        v = self._node_vertex.get(node)
+        if v is None:
+            x, y = node.x, node.y
+            v = self._nearest_vertex(x, y, self._tolerance)
+            if v is None:
+                v = self._new_vertex(node, x, y)
+            self._node_vertex[node] = v
+        return v
+
+    def _new_vertex(self, node: Node, x: float, y: float) -> int:
+        v = len(self.nodes)
+        self.nodes.append(node)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.adjacency.append(set())
+
+        size = self._vertex_cell_size
+        self._vertex_cells.setdefault((math.floor(x / size), math.floor(y / size)), []).append(v)
+        return v
+
+    def _add_edge(self, a: int, b: int):
+        if a == b or b in self.adjacency[a]:
+            return
+
+        self.adjacency[a].add(b)
+        self.adjacency[b].add(a)
+
+        edge = (min(a, b), max(a, b))
+        for cell in self._edge_cell_range(edge):
+            self._edge_cells.setdefault(cell, set()).add(edge)
+
+    def _remove_edge(self, a: int, b: int):
+        self.adjacency[a].discard(b)
+        self.adjacency[b].discard(a)
+
+        edge = (min(a, b), max(a, b))
+        for cell in self._edge_cell_range(edge):
+            edges = self._edge_cells.get(cell)
+            if edges is not None:
+                edges.discard(edge)
+
+    def _edge_cell_range(self, edge: tuple[int, int]):
+        a, b = edge
+        size = self._edge_cell_size
+        min_i = math.floor(min(self.xs[a], self.xs[b]) / size)
+        max_i = math.floor(max(self.xs[a], self.xs[b]) / size)
+        min_j = math.floor(min(self.ys[a], self.ys[b]) / size)
+        max_j = math.floor(max(self.ys[a], self.ys[b]) / size)
+        return [(i, j) for i in range(min_i, max_i + 1) for j in range(min_j, max_j + 1)]
+
+    # ------------------------------------
+    # ------------- Lookups --------------
+    # ------------------------------------
+    def _nearest_vertex(self, x: float, y: float, max_distance: float,
+                        exclude: set[int] = ()) -> int | None:
+        size = self._vertex_cell_size
+        reach = math.ceil(max_distance / size)
+        center_i, center_j = math.floor(x / size), math.floor(y / size)
+
+        best, best_distance = None, max_distance
+        for i in range(center_i - reach, center_i + reach + 1):
+            for j in range(center_j - reach, center_j + reach + 1):
+                for v in self._vertex_cells.get((i, j), ()):
+                    if v in exclude:
+                        continue
+                    distance = math.hypot(self.xs[v] - x, self.ys[v] - y)
+                    if distance <= best_distance:
+                        best, best_distance = v, distance
+        return best
+
+    def _nearest_edge(self, x: float, y: float, max_distance: float, v: int):
+        size = self._edge_cell_size
+        min_i, max_i = math.floor((x - max_distance) / size), math.floor((x + max_distance) / size)
+        min_j, max_j = math.floor((y - max_distance) / size), math.floor((y + max_distance) / size)
+
+        candidates = set()
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                candidates.update(self._edge_cells.get((i, j), ()))
+
+        best, best_point, best_distance = None, None, max_distance
+        for edge in candidates:
+            a, b = edge
+            if v in edge:
+                continue
+
+            px, py = _project(x, y, self.xs[a], self.ys[a], self.xs[b], self.ys[b])
+            distance = math.hypot(px - x, py - y)
+            if distance <= best_distance:
+                best, best_point, best_distance = edge, (px, py), distance
+        return best, best_point, best_distance
+
+    # ------------------------------------
+    # ------------- Repairs --------------
+    # ------------------------------------
+    def join_loose_ends(self):
+        loose_ends = [v for v, neighbours in enumerate(self.adjacency) if len(neighbours) == 1]
+        for v in loose_ends:
+            # Joined by an earlier end meanwhile
+            if len(self.adjacency[v]) != 1:
+                continue
+
+            x, y = self.xs[v], self.ys[v]
+            edge, point, edge_distance = self._nearest_edge(x, y, self._gap_tolerance, v)
+
+            # Ending on a wall, the wall is split at the end
+            if edge is not None and edge_distance <= self._tolerance:
+                self._split_edge(edge, v)
+                continue
+
+            u = self._nearest_vertex(x, y, self._gap_tolerance, self.adjacency[v] | {v})
+            if u is not None:
+                self._add_edge(v, u)
+            elif edge is not None:
+                px, py = point
+                split = self._new_vertex(Node(px, py), px, py)
+                self._split_edge(edge, split)
+                self._add_edge(v, split)
+
+    def _split_edge(self, edge: tuple[int, int], v: int):
+        a, b = edge
+        self._remove_edge(a, b)
+        self._add_edge(a, v)
+        self._add_edge(v, b)
+
+    def prune(self):
+        # Dead ends enclose nothing
+        stack = [v for v, neighbours in enumerate(self.adjacency) if len(neighbours) == 1]
+        while stack:
+            v = stack.pop()
+            for u in list(self.adjacency[v]):
+                self._remove_edge(v, u)
+                if len(self.adjacency[u]) == 1:
+                    stack.append(u)
+
+    # ------------------------------------
+    # -------------- Faces ---------------
+    # ------------------------------------
+    def faces(self) -> list[list[int]]:
+        xs, ys = self.xs, self.ys
+
+        # Neighbours of every vertex counter-clockwise, and where each one is
+        rings = {}
+        ring_index = {}
+        for v, neighbours in enumerate(self.adjacency):
+            if not neighbours:
+                continue
+            ring = sorted(neighbours, key=lambda u: math.atan2(ys[u] - ys[v], xs[u] - xs[v]))
+            rings[v] = ring
+            for i, u in enumerate(ring):
+                ring_index[(v, u)] = i
+
+        # Turning as far right as possible at every vertex walks bounded faces
+        # counter-clockwise and the outside of each component clockwise
+        min_area = max(self._tolerance ** 2, 1e-9)
+        visited = set()
+        faces = []
+        for v, ring in rings.items():
+            for u in ring:
+                if (v, u) in visited:
+                    continue
+
+                face = []
+                a, b = v, u
+                while (a, b) not in visited:
+                    visited.add((a, b))
+                    face.append(a)
+                    next_ring = rings[b]
+                    a, b = b, next_ring[ring_index[(b, a)] - 1]
+
+                # Faces running along a wall twice would make a broken zone
+                if len(set(face)) == len(face) and _signed_area(face, xs, ys) > min_area:
+                    faces.append(face)
+        return faces
+
+
+def _project(x: float, y: float, ax: float, ay: float, bx: float, by: float) -> tuple[float, float]:
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return ax, ay
+
+    t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / length_squared))
+    return ax + t * dx, ay + t * dy
+
+def _signed_area(face: list[int], xs: list[float], ys: list[float]) -> float:
+    area = 0.0
+    for i, v in enumerate(face):
+        u = face[i - 1]
+        area += xs[u] * ys[v] - xs[v] * ys[u]
+    return area / 2
+
+def _interior_point(points: list[tuple[float, float]]) -> tuple[float, float]:
+    count = len(points)
+    cx = sum(x for x, _ in points) / count
+    cy = sum(y for _, y in points) / count
+    if polygon_contains(points, cx, cy):
+        return cx, cy
+
+    # Concave faces: just left of an edge, which is inside going
+    # counter-clockwise
+    for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+        dx, dy = bx - ax, by - ay
+        x, y = (ax + bx) / 2 - dy * 1e-3, (ay + by) / 2 + dx * 1e-3
+        if polygon_contains(points, x, y):
+            return x, y
+    return cx, cy
@@ -0,0 +1,68 @@
+from array import array
+from itertools import accumulate
+
+# RSSI survey samples of a zone, one fingerprint per scan. Every
+# measurement of every fingerprint is kept in flat typed arrays (tag ids as
+# int16, RSSI as int8) with fingerprint i spanning offsets[i]:offsets[i + 1].
+class Fingerprints:
+    def __init__(self,
+                 tag_ids: array = None,
+                 rssis: array = None,
+                 offsets: array = None):
+        self.tag_ids = tag_ids if tag_ids is not None else array("h")
+        self.rssis = rssis if rssis is not None else array("b")
+        self.offsets = offsets if offsets is not None else array("I", [0])
+
+        if len(self.tag_ids) != len(self.rssis) or self.offsets[-1] != len(self.tag_ids):
+            raise ValueError("Fingerprint columns do not match.")
+
+    @classmethod
+    def from_sizes(cls, tag_ids: array, rssis: array, sizes: array) -> "Fingerprints":
+        return cls(tag_ids, rssis, array("I", accumulate(sizes, initial=0)))
+
+    @classmethod
+    def from_list(cls, data: list[dict]) -> "Fingerprints":
+        measurements = [fingerprint.get("measurements", []) for fingerprint in data]
+        flat = [measurement for scan in measurements for measurement in scan]
+
+        tag_ids = array("h", [measurement["tagId"] for measurement in flat])
+        rssis = array("b", [measurement["rssi"] for measurement in flat])
+        return cls.from_sizes(tag_ids, rssis, [len(scan) for scan in measurements])
+
+    @property
+    def sizes(self) -> array:
+        return array("I", (end - start for start, end in zip(self.offsets, self.offsets[1:])))
+
+    @property
+    def measurement_count(self) -> int:
+        return len(self.tag_ids)
+
+    def copy(self) -> "Fingerprints":
+        return Fingerprints(self.tag_ids[:], self.rssis[:], self.offsets[:])
+
+    def add(self, measurements: list[tuple[int, int]]):
+        tag_ids = array("h", (tag_id for tag_id, _ in measurements))
+        rssis = array("b", (rssi for _, rssi in measurements))
+
+        self.tag_ids.extend(tag_ids)
+        self.rssis.extend(rssis)
+        self.offsets.append(len(self.tag_ids))
+
+    def clear(self):
+        del self.tag_ids[:]
+        del self.rssis[:]
+        del self.offsets[1:]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            yield list(zip(self.tag_ids[start:end], self.rssis[start:end]))
+
+    def to_list(self) -> list[dict]:
+        return [
+            {
+                "measurements": [{"tagId": tag_id, "rssi": rssi} for tag_id, rssi in fingerprint]
+            } for fingerprint in self
+        ]
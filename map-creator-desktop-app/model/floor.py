@@ -1,42 +1,223 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-
-from PySide6.QtCore import QObject, Signal
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable
 
+from .observable import Observable, Signal
 from .node import Node
+from .indexed_list import IndexedList
+from .node_store import NodeStore
+from .spatial_index import SpatialIndex
+from .point import Point
 from .wall import Wall
 from .zone import Zone
 from .point_of_interest import PointOfInterest
 from .map_object import MapObject
+from .floor_underlay import FloorUnderlay
 
 import weakref
 import uuid
+import math
+
+import numpy as np
 
 if TYPE_CHECKING:
     from .building import Building
 
-class Floor(QObject):
+class Floor(Observable):
+    __slots__ = (
+        "_name", "_nodes", "_walls", "_zones", "_points_of_interest",
+        "_uuid", "_building", "_loader", "_source", "_revision", "_type_to_list",
+        "_node_store", "_spatial_index", "_batch", "_underlay",
+        "__weakref__",
+    )
+
     item_added = Signal(MapObject)
     item_removed = Signal(MapObject)
     name_changed = Signal(str)
+    underlay_changed = Signal(object)
+
+    # Emitted once by the bulk transforms below in place of the per-element
+    # updated signals, with every element whose geometry changed
+    elements_updated = Signal(object)
 
-    def __init__(self, name: str = "Unnamed Floor", id: uuid.UUID = None):
+    # Emitted when a batch() ends in place of item_added / item_removed,
+    # with the elements in the order they were added or removed
+    items_added = Signal(object)
+    items_removed = Signal(object)
+
+    def __init__(self,
+                 name: str = "Unnamed Floor",
+                 id: uuid.UUID = None,
+                 loader: Callable[[Floor], None] = None):
         super().__init__()
         self._name = name
-        self.nodes: list[Node] = []
-        self.walls: list[Wall] = []
-        self.zones: list[Zone] = []
-        self.points_of_interest: list[PointOfInterest] = []
+        self._nodes: IndexedList[Node] = IndexedList()
+        self._walls: IndexedList[Wall] = IndexedList()
+        self._zones: IndexedList[Zone] = IndexedList()
+        self._points_of_interest: IndexedList[PointOfInterest] = IndexedList()
+        self._node_store = NodeStore()
+
+        # Built on the first spatial query
+        self._spatial_index: SpatialIndex = None
+
+        # Open batch() collecting changes, if any
+        self._batch: _FloorBatch = None
+
+        self._underlay: FloorUnderlay = None
 
         self._uuid = id if id else uuid.uuid4()
+        self._building = None
+
+        # Floors opened from an indexed building file stay stubs until
+        # their elements are first needed
+        self._loader = loader
+
+        # Saved chunk this floor still matches, dropped on any change so
+        # that only modified floors are serialized again
+        self._source = None
+        self._revision = 0
+
+        self.item_added.connect(self._on_changed)
+        self.item_removed.connect(self._on_changed)
 
         self._type_to_list = {
-            Node: self.nodes,
-            Wall: self.walls,
-            Zone: self.zones,
-            PointOfInterest: self.points_of_interest,
+            Node: self._nodes,
+            Wall: self._walls,
+            Zone: self._zones,
+            PointOfInterest: self._points_of_interest,
+        }
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None
+
+    def ensure_loaded(self):
+        if self._loader is None:
+            return
+
+        loader = self._loader
+        self._loader = None
+
+        self.block_signals(True)
+        try:
+            loader(self)
+        finally:
+            self.block_signals(False)
+
+        building = self.building
+        if building is not None:
+            building.on_floor_loaded(self)
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._source is None
+
+    def mark_saved(self, source):
+        self._source = source
+
+    def mark_changed(self):
+        self._revision += 1
+        self._source = None
+
+    def element_updated(self, element: MapObject):
+        self.mark_changed()
+
+        if self._spatial_index is not None:
+            self._spatial_index.update(element)
+            # walls and zones change shape with their nodes
+            for owner in getattr(element, "owners", ()):
+                self._spatial_index.update(owner)
+
+    @contextmanager
+    def batch(self):
+        # Batches nest, only the outermost one emits
+        if self._batch is not None:
+            self._batch.depth += 1
+            try:
+                yield self
+            finally:
+                self._batch.depth -= 1
+            return
+
+        batch = self._batch = _FloorBatch()
+        try:
+            yield self
+        finally:
+            self._batch = None
+            self._commit_batch(batch)
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch is not None
+
+    def _commit_batch(self, batch: _FloorBatch):
+        removed = list(batch.removed)
+        added = list(batch.added)
+        updated = {
+            element for element in batch.updated
+            if element not in batch.removed and element not in batch.added
         }
 
+        if removed or added or updated:
+            self.mark_changed()
+
+        if removed:
+            self.items_removed.emit(removed)
+        if added:
+            self.items_added.emit(added)
+        if updated:
+            self.elements_updated.emit(updated)
+
+    def _on_changed(self, element: MapObject):
+        self.mark_changed()
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        self.ensure_loaded()
+
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex()
+            for element in self.elements:
+                self._spatial_index.insert(element)
+
+        return self._spatial_index
+
+    @property
+    def nodes(self) -> IndexedList[Node]:
+        self.ensure_loaded()
+        return self._nodes
+
+    @property
+    def walls(self) -> IndexedList[Wall]:
+        self.ensure_loaded()
+        return self._walls
+
+    @property
+    def zones(self) -> IndexedList[Zone]:
+        self.ensure_loaded()
+        return self._zones
+
+    @property
+    def points_of_interest(self) -> IndexedList[PointOfInterest]:
+        self.ensure_loaded()
+        return self._points_of_interest
+
+    def get_element(self, element_id: uuid.UUID) -> MapObject | None:
+        self.ensure_loaded()
+        for el_list in self._type_to_list.values():
+            element = el_list.get(element_id)
+            if element is not None:
+                return element
+        return None
+
     @property
     def building(self) -> Building:
         return self._building() if self._building else None
@@ -47,11 +228,20 @@ class Floor(QObject):
 
     @property
     def elements(self) -> list[MapObject]:
+        self.ensure_loaded()
         all_elements = []
         for lst in self._type_to_list.values():
             all_elements.extend(lst)
         return all_elements
 
+    @property
+    def uuid(self) -> uuid.UUID:
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, new_uuid: uuid.UUID):
+        self._uuid = new_uuid
+
     @property
     def name(self) -> str:
         return self._name
@@ -61,10 +251,22 @@ class Floor(QObject):
         self._name = new_name
         self.name_changed.emit(new_name)
 
+    @property
+    def underlay(self) -> FloorUnderlay | None:
+        return self._underlay
+
+    @underlay.setter
+    def underlay(self, underlay: FloorUnderlay | None):
+        self._underlay = underlay
+        self.mark_changed()
+        self.underlay_changed.emit(underlay)
+
     def add(self, element: MapObject):
         if element is None:
             return
 
+        self.ensure_loaded()
+
         el_type = type(element)
         el_list = self._get_list_for_type(el_type)
         
@@ -72,44 +274,290 @@ class Floor(QObject):
             el_list.append(element)
             element.floor = self
 
+            if el_type is Node:
+                element.bind(self._node_store)
+
+            if self._spatial_index is not None:
+                self._spatial_index.insert(element)
+
             for dependency in element.dependencies:
                 self.add(dependency)
-                dependency.floor = self
+                if type(dependency) is Node:
+                    dependency.owners.add(element)
+
+            if self._batch is not None:
+                self._batch.record_added(element)
+            else:
+                self.item_added.emit(element)
+
+    def add_many(self, elements: Iterable[MapObject]):
+        # Bulk add() of new elements such as imported ones, as one batch.
+        # Their nodes are added along, but unlike add() a node does not
+        # bring back owners that are not in the list.
+        self.ensure_loaded()
+
+        added = []
+        nodes = self._nodes
+        for element in elements:
+            for dependency in element.dependencies:
+                if type(dependency) is Node:
+                    if dependency not in nodes:
+                        nodes.append(dependency)
+                        dependency.floor = self
+                        dependency.bind(self._node_store)
+                        added.append(dependency)
+                    dependency.owners.add(element)
+
+            el_list = self._get_list_for_type(type(element))
+            if el_list is not None and element not in el_list:
+                el_list.append(element)
+                element.floor = self
+                if type(element) is Node:
+                    element.bind(self._node_store)
+                added.append(element)
 
-            if hasattr(element, 'owner'):
-                if element.owner:    
-                    self.add(element.owner)
-                    element.owner.floor = self
+        if self._spatial_index is not None:
+            for element in added:
+                self._spatial_index.insert(element)
 
-            self.item_added.emit(element)
+        with self.batch():
+            for element in added:
+                self._batch.record_added(element)
 
     def remove(self, element: MapObject):
         if element is None:
             return
 
+        self.ensure_loaded()
+
         el_type = type(element)
         el_list = self._get_list_for_type(el_type)
         
         if el_list is not None and element in el_list:
             el_list.remove(element)
 
+            if el_type is Node:
+                element.unbind()
+
+            if self._spatial_index is not None:
+                self._spatial_index.remove(element)
+
+            # Shared nodes stay for as long as something else uses them
             for dependency in element.dependencies:
+                if type(dependency) is Node:
+                    dependency.owners.discard(element)
+                    if dependency.owners:
+                        continue
                 self.remove(dependency)
 
-            if hasattr(element, 'owner'):
-                self.remove(element.owner)
+            # and nothing stays without the nodes it is built on. This only
+            # goes one way: adding the node back does not bring its owners
+            # along, so DeleteElementsCommand deletes the owners itself.
+            if el_type is Node:
+                for owner in list(element.owners):
+                    self.remove(owner)
+
+            if self._batch is not None:
+                self._batch.record_removed(element)
+            else:
+                self.item_removed.emit(element)
+
+    # ------------------------------------
+    # ------------- Topology -------------
+    # ------------------------------------
+    def merge_node(self, node: Node, into: Node) -> list[MapObject]:
+        # Hands everything built on node over to into and drops node,
+        # returns the owners that moved so that split_node can undo it
+        owners = list(node.owners)
+        with self.batch():
+            for owner in owners:
+                owner.replace_node(node, into)
+                self._owner_changed(owner)
+            self.remove(node)
+        return owners
+
+    def split_node(self, node: Node, into: Node, owners: list[MapObject]):
+        with self.batch():
+            self.add(node)
+            for owner in owners:
+                owner.replace_node(into, node)
+                self._owner_changed(owner)
+
+    def find_coincident_nodes(self, tolerance: float = 0.0) -> list[tuple[Node, Node]]:
+        # (node, node to merge it into) for every node sharing its position
+        # with another one, rounded to the tolerance. A node is never merged
+        # into one that already belongs to the same wall or zone, which
+        # would collapse it.
+        self.ensure_loaded()
+
+        nodes = list(self._nodes)
+        if len(nodes) < 2:
+            return []
+
+        indices = np.fromiter((node.store_index for node in nodes), dtype=np.intp, count=len(nodes))
+        xs = self._node_store.xs[indices]
+        ys = self._node_store.ys[indices]
+        if tolerance > 0:
+            xs = np.round(xs / tolerance)
+            ys = np.round(ys / tolerance)
+
+        order = np.lexsort((ys, xs))
+        xs, ys = xs[order], ys[order]
+        same = (xs[1:] == xs[:-1]) & (ys[1:] == ys[:-1])
+        if not same.any():
+            return []
+
+        group_starts = np.flatnonzero(np.concatenate(([True], ~same)))
+        group_ends = np.append(group_starts[1:], len(order))
+
+        merges = []
+        for start, end in zip(group_starts, group_ends):
+            if end - start < 2:
+                continue
+
+            # Kept node -> owners it will have once the group is merged
+            keepers: dict[Node, set] = {}
+            for i in order[start:end]:
+                node = nodes[i]
+                into = next((keeper for keeper, owners in keepers.items()
+                             if not owners & node.owners), None)
+                if into is None:
+                    keepers[node] = set(node.owners)
+                else:
+                    merges.append((node, into))
+                    keepers[into].update(node.owners)
 
-            self.item_removed.emit(element)
+        return merges
 
-    def _get_list_for_type(self, el_type: type) -> list[MapObject] | None:
+    def _owner_changed(self, owner: MapObject):
+        if self._spatial_index is not None:
+            self._spatial_index.update(owner)
+        self._batch.updated.add(owner)
+
+    # ------------------------------------
+    # --------- Bulk transforms ----------
+    # ------------------------------------
+    @property
+    def node_store(self) -> NodeStore:
+        return self._node_store
+
+    def reserve_nodes(self, count: int):
+        self._node_store.reserve(count)
+
+    def translate(self, elements: list[MapObject], dx: float, dy: float):
+        self._transform(elements, lambda xs, ys: (xs + dx, ys + dy))
+
+    def rotate(self, elements: list[MapObject], angle: float, center: Point):
+        # angle in degrees, counter-clockwise in model coordinates
+        radians = math.radians(angle)
+        cos, sin = math.cos(radians), math.sin(radians)
+        cx, cy = center.x(), center.y()
+
+        def rotate(xs, ys):
+            offset_x = xs - cx
+            offset_y = ys - cy
+            return cx + offset_x * cos - offset_y * sin, cy + offset_x * sin + offset_y * cos
+
+        self._transform(elements, rotate)
+
+    def scale(self, elements: list[MapObject], factor: float, center: Point):
+        cx, cy = center.x(), center.y()
+        self._transform(elements, lambda xs, ys: (cx + (xs - cx) * factor, cy + (ys - cy) * factor))
+
+    def snap_to_grid(self, elements: list[MapObject], grid_size: float):
+        if grid_size <= 0:
+            return
+        self._transform(elements, lambda xs, ys: (np.round(xs / grid_size) * grid_size,
+                                                  np.round(ys / grid_size) * grid_size))
+
+    def _transform(self, elements: list[MapObject], transform):
+        self.ensure_loaded()
+
+        # dicts keep the selection order and drop nodes shared by elements
+        nodes = {}
+        others = {}
+        for element in elements:
+            for movable in element.movables or []:
+                if type(movable) is Node and movable.store is self._node_store:
+                    nodes[movable] = None
+                else:
+                    others[movable] = None
+
+        if nodes:
+            store = self._node_store
+            indices = np.fromiter((node.store_index for node in nodes), dtype=np.intp, count=len(nodes))
+            store.xs[indices], store.ys[indices] = transform(store.xs[indices], store.ys[indices])
+
+        # points of interest (and strays from other floors) move one by one,
+        # without notifying on their own
+        for movable in others:
+            position = movable.position
+            xs, ys = transform(np.array([position.x()]), np.array([position.y()]))
+
+            blocked = movable.block_signals(True)
+            try:
+                movable.position = Point(xs[0], ys[0])
+            finally:
+                movable.block_signals(blocked)
+
+        owners = {owner for node in nodes for owner in node.owners}
+        for owner in owners:
+            owner.invalidate_geometry()
+
+        changed = set(nodes)
+        changed.update(others)
+        changed.update(owners)
+
+        if changed:
+            self.mark_changed()
+            if self._spatial_index is not None:
+                for element in changed:
+                    self._spatial_index.update(element)
+
+            if self._batch is not None:
+                self._batch.updated.update(changed)
+            else:
+                self.elements_updated.emit(changed)
+
+    def _get_list_for_type(self, el_type: type) -> IndexedList | None:
         return self._type_to_list.get(el_type, None)
     
     def to_dict(self) -> dict:
-        return {
+        self.ensure_loaded()
+        data = {
             "id": str(self._uuid),
             "name": self._name,
             "nodes": [node.to_dict() for node in self.nodes],
             "walls": [wall.to_dict() for wall in self.walls],
             "zones": [zone.to_dict() for zone in self.zones],
             "points_of_interest": [poi.to_dict() for poi in self.points_of_interest],
-        }
\ No newline at end of file
+        }
+        if self._underlay is not None:
+            data["underlay"] = self._underlay.to_dict()
+        return data
+
+
+# Net changes of a Floor.batch(). An element added and removed again within
+# the batch cancels out, so listeners only hear about the end result.
+class _FloorBatch:
+    __slots__ = ("depth", "added", "removed", "updated")
+
+    def __init__(self):
+        self.depth = 0
+        self.added: dict[MapObject, None] = {}
+        self.removed: dict[MapObject, None] = {}
+        self.updated: set[MapObject] = set()
+
+    def record_added(self, element: MapObject):
+        if element in self.removed:
+            # Back where it was, though possibly somewhere else
+            del self.removed[element]
+            self.updated.add(element)
+        else:
+            self.added[element] = None
+
+    def record_removed(self, element: MapObject):
+        if element in self.added:
+            del self.added[element]
+        else:
+            self.removed[element] = None
@@ -0,0 +1,52 @@
+# Floor plan image drawn beneath a floor. Pixel (0, 0) of the image lies at
+# (x, y) in scene coordinates and every pixel is scale scene units wide.
+class FloorUnderlay:
+    __slots__ = ("image_path", "width", "height", "scale", "x", "y", "opacity")
+
+    def __init__(self,
+                 image_path: str,
+                 width: int,
+                 height: int,
+                 scale: float = 1.0,
+                 x: float = 0.0,
+                 y: float = 0.0,
+                 opacity: float = 0.5):
+        if width <= 0 or height <= 0:
+            raise ValueError("Underlay image has no pixels.")
+        if scale <= 0:
+            raise ValueError("Underlay scale must be positive.")
+
+        self.image_path = image_path
+        self.width = int(width)
+        self.height = int(height)
+        self.scale = float(scale)
+        self.x = float(x)
+        self.y = float(y)
+        self.opacity = float(opacity)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        return self.x, self.y, self.x + self.width * self.scale, self.y + self.height * self.scale
+
+    def to_dict(self) -> dict:
+        return {
+            "image_path": self.image_path,
+            "width": self.width,
+            "height": self.height,
+            "scale": self.scale,
+            "x": self.x,
+            "y": self.y,
+            "opacity": self.opacity,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FloorUnderlay":
+        return cls(
+            data["image_path"],
+            data["width"],
+            data["height"],
+            data.get("scale", 1.0),
+            data.get("x", 0.0),
+            data.get("y", 0.0),
+            data.get("opacity", 0.5),
+        )
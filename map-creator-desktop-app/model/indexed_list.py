@@ -0,0 +1,98 @@
+from __future__ import annotations
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import uuid
+
+if TYPE_CHECKING:
+    from .map_object import MapObject
+
+_HOLE = object()
+
+# Insertion ordered list of map elements with O(1) membership, removal and
+# lookup by uuid. Removed elements leave a hole that is compacted away once
+# holes make up half of the list or positional access needs exact indices.
+# Iterating while elements are removed is safe; holes are skipped.
+class IndexedList(Sequence):
+    __slots__ = ("_items", "_positions", "_by_uuid", "_holes")
+
+    def __init__(self, elements=()):
+        self._items: list = []
+        self._positions: dict[MapObject, int] = {}
+        self._by_uuid: dict[uuid.UUID, MapObject] = {}
+        self._holes = 0
+
+        for element in elements:
+            self.append(element)
+
+    def append(self, element: MapObject) -> bool:
+        if element in self._positions:
+            return False
+
+        self._positions[element] = len(self._items)
+        self._items.append(element)
+        self._by_uuid[element.uuid] = element
+        return True
+
+    def remove(self, element: MapObject) -> bool:
+        position = self._positions.pop(element, None)
+        if position is None:
+            return False
+
+        self._items[position] = _HOLE
+        self._holes += 1
+        if self._by_uuid.get(element.uuid) is element:
+            del self._by_uuid[element.uuid]
+
+        if self._holes * 2 > len(self._items):
+            self._compact()
+        return True
+
+    def get(self, element_id: uuid.UUID, default=None) -> MapObject | None:
+        return self._by_uuid.get(element_id, default)
+
+    def index(self, element: MapObject, start: int = 0, stop: int = None) -> int:
+        self._compact()
+        position = self._positions.get(element)
+        if position is None or position < start or (stop is not None and position >= stop):
+            raise ValueError(f"{element!r} is not in list")
+        return position
+
+    def count(self, element: MapObject) -> int:
+        return 1 if element in self._positions else 0
+
+    def _compact(self):
+        if self._holes == 0:
+            return
+
+        # A fresh list, iterators over the old one keep working
+        self._items = [element for element in self._items if element is not _HOLE]
+        self._positions = {element: i for i, element in enumerate(self._items)}
+        self._holes = 0
+
+    def __contains__(self, element) -> bool:
+        return element in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self):
+        for element in self._items:
+            if element is not _HOLE:
+                yield element
+
+    def __reversed__(self):
+        self._compact()
+        return reversed(self._items)
+
+    def __getitem__(self, index):
+        self._compact()
+        return self._items[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (IndexedList, list, tuple)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IndexedList({list(self)!r})"
@@ -1,29 +1,58 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QObject, Signal
+from .observable import Observable, Signal
 
 import uuid
-import weakref
 
 if TYPE_CHECKING:
     from .floor import Floor
-    
 
-class MapObject(QObject):
+
+class MapObject(Observable):
+    __slots__ = ("_uuid", "_floor")
+
     updated = Signal()
 
     def __init__(self, id: uuid.UUID = None):
         super().__init__()
-        self.uuid = id if id else uuid.uuid4()
+        # Generated on first use, transient objects such as previews never need one
+        self._uuid = id
+        self._floor = None
+
+    @property
+    def uuid(self) -> uuid.UUID:
+        if self._uuid is None:
+            self._uuid = uuid.uuid4()
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, new_uuid: uuid.UUID):
+        self._uuid = new_uuid
+
+    def notify_updated(self):
+        self.updated.emit()
+
+        floor = self._floor
+        if floor is not None:
+            floor.element_updated(self)
 
     @property
     def floor(self) -> Floor:
-        return self._floor() if self._floor else None
-    
+        return self._floor
+
     @floor.setter
     def floor(self, new_floor: Floor):
-        self._floor = weakref.ref(new_floor) if new_floor else None
+        self._floor = new_floor
+
+    # (min x, min y, max x, max y), None for elements without a shape
+    @property
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        return None
+
+    # Drops anything derived from the positions of the element's nodes
+    def invalidate_geometry(self):
+        pass
 
     @property
     def movables(self):
@@ -31,4 +60,4 @@ class MapObject(QObject):
 
     @property
     def dependencies(self) -> list:
-        return []
\ No newline at end of file
+        return []
@@ -1,60 +1,124 @@
 import uuid
-from PySide6.QtCore import QPointF
 
 from math import sqrt
 
 from .map_object import MapObject
+from .node_store import NodeStore
+from .point import Point
 
 class Node(MapObject):
-    def __init__(self, x: float, y: float, owner=None, id:uuid.UUID=None):
+    __slots__ = ("_x", "_y", "_store", "_index", "owners")
+
+    def __init__(self, x: float, y: float, owners=None, id:uuid.UUID=None):
         super().__init__(id)
-        self.pos = QPointF(x, y)
-        self.owner = owner
+        # Own coordinates are only used while the node is on no floor, the
+        # floor's NodeStore holds them afterwards
+        self._x = float(x)
+        self._y = float(y)
+        self._store: NodeStore = None
+        self._index = -1
+
+        # Walls and zones built on this node; a node shared by several of
+        # them keeps them joined when it moves
+        self.owners: set[MapObject] = set(owners) if owners else set()
+
+    def bind(self, store: NodeStore):
+        if self._store is store:
+            return
+
+        x, y = self.x, self.y
+        self.unbind()
+        self._index = store.allocate(x, y)
+        self._store = store
+
+    def unbind(self):
+        if self._store is None:
+            return
+
+        self._x = float(self._store.xs[self._index])
+        self._y = float(self._store.ys[self._index])
+        self._store.release(self._index)
+        self._store = None
+        self._index = -1
+
+    @property
+    def store(self) -> NodeStore:
+        return self._store
+
+    @property
+    def store_index(self) -> int:
+        return self._index
+
+    def notify_updated(self):
+        super().notify_updated()
+
+        # Walls and zones follow the nodes they are built from
+        for owner in self.owners:
+            owner.invalidate_geometry()
+            owner.updated.emit()
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        x, y = self.x, self.y
+        return x, y, x, y
 
     @property
     def movables(self) -> list["Node"]:
         return [self]
 
     @property
-    def position(self) -> QPointF:
-        return self.pos
-    
+    def position(self) -> Point:
+        return Point(self.x, self.y)
+
     @position.setter
-    def position(self, pos: QPointF):
-        if self.pos != pos:
-            self.pos = pos
-            self.updated.emit()
+    def position(self, pos: Point):
+        x, y = pos.x(), pos.y()
+        if self.x != x or self.y != y:
+            self._set(x, y)
+            self.notify_updated()
 
     @property
     def x(self) -> float:
-        return self.pos.x()
-    
+        if self._store is not None:
+            return float(self._store.xs[self._index])
+        return self._x
+
     @x.setter
     def x(self, value: float) -> None:
-        if self.pos.x() != value:
-            self.pos.setX(value)
-            self.updated.emit()
+        if self.x != value:
+            self._set(value, self.y)
+            self.notify_updated()
 
     @property
     def y(self) -> float:
-        return self.pos.y()
-    
+        if self._store is not None:
+            return float(self._store.ys[self._index])
+        return self._y
+
     @y.setter
     def y(self, value: float) -> None:
-        if self.pos.y() != value:
-            self.pos.setY(value)
-            self.updated.emit()
+        if self.y != value:
+            self._set(self.x, value)
+            self.notify_updated()
+
+    def _set(self, x: float, y: float):
+        if self._store is not None:
+            self._store.xs[self._index] = x
+            self._store.ys[self._index] = y
+        else:
+            self._x = float(x)
+            self._y = float(y)
 
-    def moveBy(self, delta: QPointF) -> None:
+    def moveBy(self, delta: Point) -> None:
         self.position = self.position + delta
-        self.updated.emit()
-        
+        self.notify_updated()
+
     def distance_to(self, other: 'Node') -> float:
         return sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
-    
+
     def to_dict(self) -> dict:
         return {
             "id": str(self.uuid),
             "x": self.x,
             "y": self.y
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Contiguous x / y coordinates of every node on a floor. A node keeps its
+# slot for as long as it belongs to the floor; freed slots are reused.
+class NodeStore:
+    __slots__ = ("xs", "ys", "_size", "_free")
+
+    def __init__(self, capacity: int = 64):
+        self.xs = np.zeros(capacity, dtype=np.float64)
+        self.ys = np.zeros(capacity, dtype=np.float64)
+        self._size = 0
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def reserve(self, count: int):
+        needed = self._size + count - len(self._free)
+        if needed > len(self.xs):
+            self._grow(needed)
+
+    def allocate(self, x: float, y: float) -> int:
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == len(self.xs):
+                self._grow(self._size + 1)
+            index = self._size
+            self._size += 1
+
+        self.xs[index] = x
+        self.ys[index] = y
+        return index
+
+    def release(self, index: int):
+        self._free.append(index)
+
+    def _grow(self, needed: int):
+        capacity = max(needed, len(self.xs) * 2)
+
+        xs = np.zeros(capacity, dtype=np.float64)
+        ys = np.zeros(capacity, dtype=np.float64)
+        xs[:self._size] = self.xs[:self._size]
+        ys[:self._size] = self.ys[:self._size]
+
+        self.xs = xs
+        self.ys = ys
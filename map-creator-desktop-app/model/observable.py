@@ -0,0 +1,83 @@
+from typing import Callable
+
+# Minimal replacement for Qt signals on model objects. Signals are declared
+# on the class like Qt's and keep the connect / disconnect / emit API, but
+# an object only pays for a listener table once something connects to it.
+# Unlike Qt, slots are called with every emitted argument and exceptions
+# propagate to the emitter.
+
+class Signal:
+    __slots__ = ("_name",)
+
+    def __init__(self, *types):
+        self._name = None
+
+    def __set_name__(self, owner, name: str):
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return BoundSignal(instance, self._name)
+
+
+class BoundSignal:
+    __slots__ = ("_instance", "_name")
+
+    def __init__(self, instance: "Observable", name: str):
+        self._instance = instance
+        self._name = name
+
+    def connect(self, slot: Callable):
+        instance = self._instance
+        if instance._observers is None:
+            instance._observers = {}
+        instance._observers.setdefault(self._name, []).append(slot)
+
+    def disconnect(self, slot: Callable):
+        observers = self._instance._observers
+        slots = observers.get(self._name) if observers else None
+        if not slots or slot not in slots:
+            raise TypeError(f"{slot!r} is not connected to {self._name}.")
+
+        slots.remove(slot)
+        if not slots:
+            del observers[self._name]
+
+    def emit(self, *args):
+        instance = self._instance
+        if instance._observers is None or instance._signals_blocked:
+            return
+
+        slots = instance._observers.get(self._name)
+        if slots:
+            # slots may disconnect themselves while being called
+            for slot in tuple(slots):
+                slot(*args)
+
+    # Lets one signal be connected straight to another
+    __call__ = emit
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, BoundSignal)
+                and other._instance is self._instance
+                and other._name == self._name)
+
+    def __hash__(self) -> int:
+        return hash((id(self._instance), self._name))
+
+
+class Observable:
+    __slots__ = ("_observers", "_signals_blocked")
+
+    def __init__(self):
+        self._observers = None
+        self._signals_blocked = False
+
+    def block_signals(self, blocked: bool) -> bool:
+        previous = self._signals_blocked
+        self._signals_blocked = blocked
+        return previous
+
+    def signals_blocked(self) -> bool:
+        return self._signals_blocked
@@ -0,0 +1,64 @@
+from math import hypot
+
+# Immutable 2D point used by the model instead of QPointF. It keeps QPointF's
+# x() / y() accessors, so either can be passed wherever the model expects a
+# position.
+class Point:
+    __slots__ = ("_x", "_y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self._x = float(x)
+        self._y = float(y)
+
+    @classmethod
+    def from_point(cls, point) -> "Point":
+        if isinstance(point, Point):
+            return point
+        return cls(point.x(), point.y())
+
+    def x(self) -> float:
+        return self._x
+
+    def y(self) -> float:
+        return self._y
+
+    def distance_to(self, other) -> float:
+        return hypot(self._x - other.x(), self._y - other.y())
+
+    def __add__(self, other) -> "Point":
+        return Point(self._x + other.x(), self._y + other.y())
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Point":
+        return Point(self._x - other.x(), self._y - other.y())
+
+    def __rsub__(self, other) -> "Point":
+        return Point(other.x() - self._x, other.y() - self._y)
+
+    def __neg__(self) -> "Point":
+        return Point(-self._x, -self._y)
+
+    def __mul__(self, factor: float) -> "Point":
+        return Point(self._x * factor, self._y * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor: float) -> "Point":
+        return Point(self._x / divisor, self._y / divisor)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self._x == other.x() and self._y == other.y()
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._x, self._y))
+
+    def __iter__(self):
+        yield self._x
+        yield self._y
+
+    def __repr__(self) -> str:
+        return f"Point({self._x}, {self._y})"
@@ -1,9 +1,9 @@
 import uuid
-from PySide6.QtCore import QPointF
 
 from enum import Enum
 
 from .map_object import MapObject
+from .point import Point
 
 class PointOfInterestType(Enum):
     GENERIC = 1
@@ -13,13 +13,15 @@ class PointOfInterestType(Enum):
     EXIT = 5
 
 class PointOfInterest(MapObject):
+    __slots__ = ("_position", "_name", "_type")
+
     def __init__(self, 
-                 position: QPointF, 
+                 position: Point, 
                  name="Point of Interest", 
                  type=PointOfInterestType.GENERIC,
                  id:uuid.UUID=None):
         super().__init__(id)
-        self._position: QPointF = position
+        self._position: Point = Point.from_point(position)
         self._name: str = name
         self._type: PointOfInterestType = type
 
@@ -30,24 +32,29 @@ class PointOfInterest(MapObject):
     @name.setter
     def name(self, value: str):
         self._name = value
-        self.updated.emit()
+        self.notify_updated()
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        x, y = self._position.x(), self._position.y()
+        return x, y, x, y
 
     @property
     def movables(self) -> list:
         return [self]
     
-    def moveBy(self, delta: QPointF):
+    def moveBy(self, delta: Point):
         self._position = self._position + delta
-        self.updated.emit()
+        self.notify_updated()
 
     @property
-    def position(self) -> QPointF:
+    def position(self) -> Point:
         return self._position
     
     @position.setter
-    def position(self, pos: QPointF):
-        self._position = pos
-        self.updated.emit()
+    def position(self, pos: Point):
+        self._position = Point.from_point(pos)
+        self.notify_updated()
 
     @property
     def type(self) -> PointOfInterestType:
@@ -56,7 +63,7 @@ class PointOfInterest(MapObject):
     @type.setter
     def type(self, value: PointOfInterestType):
         self._type = value
-        self.updated.emit()
+        self.notify_updated()
 
     def to_dict(self) -> dict:
         return {
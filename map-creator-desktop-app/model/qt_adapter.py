@@ -0,0 +1,96 @@
+from PySide6.QtCore import QObject, Signal
+
+from .building import Building
+from .floor import Floor
+
+# The model itself has no Qt dependency. Widgets that want Qt semantics for
+# model notifications (queued delivery, slots living as long as their
+# QObject, lenient slot signatures) attach this adapter to a building and
+# connect to its signals instead.
+class QtBuildingAdapter(QObject):
+    floor_added = Signal(object)
+    floor_removed = Signal(object)
+    floor_name_changed = Signal(str)
+    item_added = Signal(object)
+    item_removed = Signal(object)
+    items_added = Signal(object)
+    items_removed = Signal(object)
+    elements_updated = Signal(object)
+
+    def __init__(self, building: Building = None, parent: QObject = None):
+        super().__init__(parent)
+        self._building = None
+        self._floors: list[Floor] = []
+
+        if building is not None:
+            self.attach(building)
+
+    @property
+    def building(self) -> Building:
+        return self._building
+
+    def attach(self, building: Building):
+        self.detach()
+
+        self._building = building
+        building.floor_added.connect(self._on_floor_added)
+        building.floor_removed.connect(self._on_floor_removed)
+        building.floor_name_changed.connect(self._on_floor_name_changed)
+
+        for floor in building.floors:
+            self._attach_floor(floor)
+
+    def detach(self):
+        if self._building is None:
+            return
+
+        for floor in list(self._floors):
+            self._detach_floor(floor)
+
+        self._building.floor_added.disconnect(self._on_floor_added)
+        self._building.floor_removed.disconnect(self._on_floor_removed)
+        self._building.floor_name_changed.disconnect(self._on_floor_name_changed)
+        self._building = None
+
+    def _attach_floor(self, floor: Floor):
+        floor.item_added.connect(self._on_item_added)
+        floor.item_removed.connect(self._on_item_removed)
+        floor.items_added.connect(self._on_items_added)
+        floor.items_removed.connect(self._on_items_removed)
+        floor.elements_updated.connect(self._on_elements_updated)
+        self._floors.append(floor)
+
+    def _detach_floor(self, floor: Floor):
+        floor.item_added.disconnect(self._on_item_added)
+        floor.item_removed.disconnect(self._on_item_removed)
+        floor.items_added.disconnect(self._on_items_added)
+        floor.items_removed.disconnect(self._on_items_removed)
+        floor.elements_updated.disconnect(self._on_elements_updated)
+        self._floors.remove(floor)
+
+    def _on_floor_added(self, floor: Floor):
+        self._attach_floor(floor)
+        self.floor_added.emit(floor)
+
+    def _on_floor_removed(self, floor: Floor):
+        if floor in self._floors:
+            self._detach_floor(floor)
+        self.floor_removed.emit(floor)
+
+    def _on_floor_name_changed(self, name: str):
+        self.floor_name_changed.emit(name)
+
+    def _on_item_added(self, element):
+        self.item_added.emit(element)
+
+    def _on_item_removed(self, element):
+        self.item_removed.emit(element)
+
+    def _on_items_added(self, elements):
+        self.items_added.emit(elements)
+
+    def _on_items_removed(self, elements):
+        self.items_removed.emit(elements)
+
+    def _on_elements_updated(self, elements):
+        self.elements_updated.emit(elements)
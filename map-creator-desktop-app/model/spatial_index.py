@@ -0,0 +1,261 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+import math
+
+from .node import Node
+from .wall import Wall
+from .zone import Zone
+
+if TYPE_CHECKING:
+    from .map_object import MapObject
+    from .point import Point
+
+# Uniform grid over the bounding boxes of a floor's elements. Every element
+# is filed under each cell its bounds touch, so point and rectangle queries
+# only look at the few cells around them instead of the whole floor.
+#
+# Elements that change are only marked and re-filed on the next query, which
+# keeps dragging a selection cheap however often it notifies.
+
+class SpatialIndex:
+    def __init__(self, cell_size: float = 100.0):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive.")
+
+        self._cell_size = float(cell_size)
+        self._cells: dict[tuple[int, int], set] = {}
+        self._element_cells: dict[MapObject, tuple[int, int, int, int]] = {}
+        self._dirty: set = set()
+        self._node_count = 0
+
+        # Cells ever used, bounds the ring search of nearest_node
+        self._extent: list[int] = None
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    # ------------------------------------
+    # ------------- Updates --------------
+    # ------------------------------------
+    def insert(self, element: MapObject):
+        self._dirty.add(element)
+
+    def update(self, element: MapObject):
+        if element in self._element_cells:
+            self._dirty.add(element)
+
+    def remove(self, element: MapObject):
+        self._dirty.discard(element)
+        self._unfile(element)
+
+    def _flush(self):
+        if not self._dirty:
+            return
+
+        for element in self._dirty:
+            self._unfile(element)
+            self._file(element)
+        self._dirty.clear()
+
+    def _file(self, element: MapObject):
+        bounds = element.bounds
+        if bounds is None:
+            return
+
+        cells = self._cell_range(*bounds)
+        min_i, min_j, max_i, max_j = cells
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                self._cells.setdefault((i, j), set()).add(element)
+
+        self._element_cells[element] = cells
+        if type(element) is Node:
+            self._node_count += 1
+
+        if self._extent is None:
+            self._extent = list(cells)
+        else:
+            extent = self._extent
+            extent[0] = min(extent[0], min_i)
+            extent[1] = min(extent[1], min_j)
+            extent[2] = max(extent[2], max_i)
+            extent[3] = max(extent[3], max_j)
+
+    def _unfile(self, element: MapObject):
+        cells = self._element_cells.pop(element, None)
+        if cells is None:
+            return
+
+        min_i, min_j, max_i, max_j = cells
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                cell = self._cells.get((i, j))
+                if cell is not None:
+                    cell.discard(element)
+                    if not cell:
+                        del self._cells[(i, j)]
+
+        if type(element) is Node:
+            self._node_count -= 1
+
+    def _cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> tuple[int, int, int, int]:
+        size = self._cell_size
+        return (math.floor(min_x / size), math.floor(min_y / size),
+                math.floor(max_x / size), math.floor(max_y / size))
+
+    def _candidates(self, min_x: float, min_y: float, max_x: float, max_y: float) -> set:
+        self._flush()
+
+        min_i, min_j, max_i, max_j = self._cell_range(min_x, min_y, max_x, max_y)
+
+        # Huge query rectangles are cheaper to answer from the occupied cells
+        if (max_i - min_i + 1) * (max_j - min_j + 1) > len(self._cells):
+            cells = (
+                cell for (i, j), cell in self._cells.items()
+                if min_i <= i <= max_i and min_j <= j <= max_j
+            )
+        else:
+            cells = (
+                self._cells.get((i, j), ())
+                for i in range(min_i, max_i + 1)
+                for j in range(min_j, max_j + 1)
+            )
+
+        found = set()
+        for cell in cells:
+            found.update(cell)
+        return found
+
+    # ------------------------------------
+    # ------------- Queries --------------
+    # ------------------------------------
+    def elements_in_rect(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                         types: Iterable[type] = None) -> list[MapObject]:
+        if min_x > max_x:
+            min_x, max_x = max_x, min_x
+        if min_y > max_y:
+            min_y, max_y = max_y, min_y
+
+        types = tuple(types) if types is not None else None
+
+        result = []
+        for element in self._candidates(min_x, min_y, max_x, max_y):
+            if types is not None and not isinstance(element, types):
+                continue
+
+            e_min_x, e_min_y, e_max_x, e_max_y = element.bounds
+            if e_min_x <= max_x and e_max_x >= min_x and e_min_y <= max_y and e_max_y >= min_y:
+                result.append(element)
+        return result
+
+    def nearest_node(self, point: Point, max_distance: float = None) -> Node | None:
+        self._flush()
+        if self._node_count == 0:
+            return None
+
+        x, y = point.x(), point.y()
+        size = self._cell_size
+        center_i, center_j = math.floor(x / size), math.floor(y / size)
+
+        min_i, min_j, max_i, max_j = self._extent
+        max_ring = max(center_i - min_i, max_i - center_i, center_j - min_j, max_j - center_j, 0)
+        if max_distance is not None:
+            max_ring = min(max_ring, math.ceil(max_distance / size) + 1)
+
+        best = None
+        best_distance = math.inf if max_distance is None else max_distance
+
+        # Rings of cells around the point, until no closer node can exist
+        for ring in range(max_ring + 1):
+            if best is not None and (ring - 1) * size > best_distance:
+                break
+
+            for i, j in self._ring(center_i, center_j, ring):
+                for element in self._cells.get((i, j), ()):
+                    if type(element) is not Node:
+                        continue
+
+                    distance = math.hypot(element.x - x, element.y - y)
+                    if distance <= best_distance:
+                        best = element
+                        best_distance = distance
+
+        return best
+
+    def zones_at(self, point: Point) -> list[Zone]:
+        x, y = point.x(), point.y()
+        return [
+            element for element in self._candidates(x, y, x, y)
+            if type(element) is Zone and polygon_contains(element.geometry.points, x, y)
+        ]
+
+    def zone_at(self, point: Point) -> Zone | None:
+        zones = self.zones_at(point)
+        return zones[0] if zones else None
+
+    def walls_crossing(self, start: Point, end: Point) -> list[Wall]:
+        x1, y1, x2, y2 = start.x(), start.y(), end.x(), end.y()
+        candidates = self._candidates(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+        return [
+            element for element in candidates
+            if type(element) is Wall and segments_intersect(
+                x1, y1, x2, y2,
+                element.start_node.x, element.start_node.y,
+                element.end_node.x, element.end_node.y,
+            )
+        ]
+
+    @staticmethod
+    def _ring(center_i: int, center_j: int, ring: int):
+        if ring == 0:
+            yield center_i, center_j
+            return
+
+        for i in range(center_i - ring, center_i + ring + 1):
+            yield i, center_j - ring
+            yield i, center_j + ring
+        for j in range(center_j - ring + 1, center_j + ring):
+            yield center_i - ring, j
+            yield center_i + ring, j
+
+
+def polygon_contains(points: list[tuple[float, float]], x: float, y: float) -> bool:
+    inside = False
+    if not points:
+        return inside
+
+    xj, yj = points[-1]
+    for xi, yi in points:
+        if (yi > y) != (yj > y):
+            intersect_x = (xj - xi) * (y - yi) / (yj - yi) + xi
+            if x < intersect_x:
+                inside = not inside
+        xj, yj = xi, yi
+
+    return inside
+
+def segments_intersect(ax: float, ay: float, bx: float, by: float,
+                       cx: float, cy: float, dx: float, dy: float) -> bool:
+    def orientation(px, py, qx, qy, rx, ry):
+        value = (qx - px) * (ry - py) - (qy - py) * (rx - px)
+        return (value > 0) - (value < 0)
+
+    def on_segment(px, py, qx, qy, rx, ry):
+        return min(px, qx) <= rx <= max(px, qx) and min(py, qy) <= ry <= max(py, qy)
+
+    o1 = orientation(ax, ay, bx, by, cx, cy)
+    o2 = orientation(ax, ay, bx, by, dx, dy)
+    o3 = orientation(cx, cy, dx, dy, ax, ay)
+    o4 = orientation(cx, cy, dx, dy, bx, by)
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    # Collinear cases
+    return ((o1 == 0 and on_segment(ax, ay, bx, by, cx, cy)) or
+            (o2 == 0 and on_segment(ax, ay, bx, by, dx, dy)) or
+            (o3 == 0 and on_segment(cx, cy, dx, dy, ax, ay)) or
+            (o4 == 0 and on_segment(cx, cy, dx, dy, bx, by)))
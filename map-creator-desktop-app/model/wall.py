@@ -1,19 +1,18 @@
 import uuid
-from PySide6.QtCore import QPointF
 
 from .map_object import MapObject
 from .node import Node
+from .point import Point
 
 class Wall(MapObject):
+    __slots__ = ("start_node", "end_node")
+
     def __init__(self, start_node: Node, end_node: Node, id:uuid.UUID=None):
         super().__init__(id)
+        # Floor.add() makes the wall an owner of its nodes, so a wall
+        # that never reaches a floor leaves shared nodes untouched
         self.start_node = start_node
         self.end_node = end_node
-        self.start_node.owner = self
-        self.end_node.owner = self
-
-        self.start_node.updated.connect(self.updated)
-        self.end_node.updated.connect(self.updated)
 
     def length(self) -> float:
         return self.start_node.distance_to(self.end_node)
@@ -22,32 +21,47 @@ class Wall(MapObject):
     def dependencies(self) -> list[MapObject]:
         return [self.start_node, self.end_node]
 
+    def replace_node(self, old: Node, new: Node):
+        if self.start_node is old:
+            self.start_node = new
+        if self.end_node is old:
+            self.end_node = new
+
+        old.owners.discard(self)
+        new.owners.add(self)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        x1, y1 = self.start_node.x, self.start_node.y
+        x2, y2 = self.end_node.x, self.end_node.y
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
     @property
     def movables(self) -> list[Node]:
         return [self.start_node, self.end_node]
 
     @property
-    def position(self) -> QPointF:
+    def position(self) -> Point:
         return self.middle_point()
     
     @position.setter
-    def position(self, pos: QPointF):
+    def position(self, pos: Point):
         dx = pos.x() - self.middle_point().x()
         dy = pos.y() - self.middle_point().y()
 
-        delta = QPointF(dx, dy)
+        delta = Point(dx, dy)
         self.moveBy(delta)
     
-    def moveBy(self, delta: QPointF) -> None:
+    def moveBy(self, delta: Point) -> None:
         self.start_node.position = self.start_node.position + delta
         self.end_node.position = self.end_node.position + delta
 
-        self.updated.emit()
+        self.notify_updated()
     
-    def middle_point(self) -> QPointF:
+    def middle_point(self) -> Point:
         x = (self.start_node.x + self.end_node.x) / 2
         y = (self.start_node.y + self.end_node.y) / 2
-        return QPointF(x, y)
+        return Point(x, y)
     
     def to_dict(self) -> dict:
         return {
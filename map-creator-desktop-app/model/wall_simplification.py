@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import math
+
+from .node import Node
+from .wall import Wall
+
+if TYPE_CHECKING:
+    from .floor import Floor
+
+# Plans the clean-up of a floor's walls in two passes, each applied before
+# the next is planned:
+#   - snap: wall ends closer than tolerance become one node, and walls
+#     shorter than that disappear,
+#   - merge: walls on the same line that touch or overlap become one wall.
+#     A merged wall is only broken where a node on it is used by something
+#     else, such as a wall meeting it or a zone corner.
+# Nothing here changes the floor, SimplifyWallsCommand applies the plans.
+
+class WallSimplifier:
+    def __init__(self, tolerance: float = 1.0, angle_tolerance: float = 0.5):
+        # angle_tolerance in degrees
+        if tolerance <= 0 or angle_tolerance <= 0:
+            raise ValueError("Tolerances must be positive.")
+
+        self._tolerance = float(tolerance)
+        self._angle_tolerance = math.radians(angle_tolerance)
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    # ------------------------------------
+    # -------------- Snap ----------------
+    # ------------------------------------
+    def plan_snap(self, floor: Floor) -> tuple[list[Wall], list[tuple[Node, Node]]]:
+        # (walls to remove, (node, node to merge it into) pairs)
+        walls = list(floor.walls)
+        nodes = list(dict.fromkeys(node for wall in walls for node in (wall.start_node, wall.end_node)))
+        groups = self._near_groups(nodes)
+
+        group_of = {node: i for i, group in enumerate(groups) for node in group}
+        micro_walls = [wall for wall in walls if group_of[wall.start_node] == group_of[wall.end_node]]
+        removed = set(micro_walls)
+
+        merges = []
+        for group in groups:
+            if len(group) < 2:
+                continue
+
+            keeper = max(group, key=lambda node: len(node.owners))
+            claimed = keeper.owners - removed
+            for node in group:
+                if node is keeper:
+                    continue
+
+                # Merging would put the same node twice into a zone or wall
+                owners = node.owners - removed
+                if owners & claimed:
+                    continue
+
+                merges.append((node, keeper))
+                claimed |= owners
+
+        return micro_walls, merges
+
+    def _near_groups(self, nodes: list[Node]) -> list[list[Node]]:
+        # Nodes chained together by distances up to the tolerance
+        size = self._tolerance
+        xs = [node.x for node in nodes]
+        ys = [node.y for node in nodes]
+
+        parents = list(range(len(nodes)))
+
+        def find(i: int) -> int:
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i in range(len(nodes)):
+            ci, cj = math.floor(xs[i] / size), math.floor(ys[i] / size)
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    for j in cells.get((ci + di, cj + dj), ()):
+                        if math.hypot(xs[i] - xs[j], ys[i] - ys[j]) <= size:
+                            root_i, root_j = find(i), find(j)
+                            if root_i != root_j:
+                                parents[root_i] = root_j
+            cells.setdefault((ci, cj), []).append(i)
+
+        groups: dict[int, list[Node]] = {}
+        for i, node in enumerate(nodes):
+            groups.setdefault(find(i), []).append(node)
+        return list(groups.values())
+
+    # ------------------------------------
+    # -------------- Merge ---------------
+    # ------------------------------------
+    def plan_merge(self, floor: Floor) -> list[tuple[list[Wall], list[Node]]]:
+        # (walls to replace, nodes the replacing walls run through)
+        plans = []
+        for line in self._lines(floor.walls):
+            plans.extend(self._plan_line(line))
+        return plans
+
+    def _lines(self, walls) -> list[list[Wall]]:
+        # Walls grouped by the line they lie on: sorted by direction and split
+        # where the next one turns by more than the angle tolerance, then
+        # the same by distance from the origin
+        entries = []
+        for wall in walls:
+            x1, y1 = wall.start_node.x, wall.start_node.y
+            x2, y2 = wall.end_node.x, wall.end_node.y
+            if x1 != x2 or y1 != y2:
+                entries.append((math.atan2(y2 - y1, x2 - x1) % math.pi, wall))
+        entries.sort(key=lambda entry: entry[0])
+
+        directions = _split_sorted(entries, self._angle_tolerance)
+
+        # Directions just short of half a turn run along those just past none
+        if len(directions) > 1 and directions[0][0][0] + math.pi - directions[-1][-1][0] <= self._angle_tolerance:
+            last = directions.pop()
+            directions[0] = [(angle - math.pi, wall) for angle, wall in last] + directions[0]
+
+        lines = []
+        for direction in directions:
+            if len(direction) < 2:
+                continue
+
+            angle = sum(angle for angle, _ in direction) / len(direction)
+            sin, cos = math.sin(angle), math.cos(angle)
+            offsets = sorted(
+                ((-sin * wall.start_node.x + cos * wall.start_node.y, wall) for _, wall in direction),
+                key=lambda entry: entry[0],
+            )
+            lines.extend(
+                [wall for _, wall in line]
+                for line in _split_sorted(offsets, self._tolerance) if len(line) > 1
+            )
+        return lines
+
+    def _plan_line(self, walls: list[Wall]) -> list[tuple[list[Wall], list[Node]]]:
+        first = walls[0]
+        dx = first.end_node.x - first.start_node.x
+        dy = first.end_node.y - first.start_node.y
+        length = math.hypot(dx, dy)
+        ux, uy = dx / length, dy / length
+
+        def along(node: Node) -> float:
+            return node.x * ux + node.y * uy
+
+        spans = []
+        for wall in walls:
+            start, end = along(wall.start_node), along(wall.end_node)
+            spans.append((min(start, end), max(start, end), wall))
+        spans.sort(key=lambda span: span[0])
+
+        # Runs of walls touching or overlapping along the line
+        runs = []
+        run, run_end = [], -math.inf
+        for start, end, wall in spans:
+            if run and start > run_end + self._tolerance:
+                runs.append(run)
+                run = []
+            run.append(wall)
+            run_end = end if len(run) == 1 else max(run_end, end)
+        runs.append(run)
+
+        plans = []
+        for run in runs:
+            if len(run) < 2:
+                continue
+
+            run_walls = set(run)
+            nodes = sorted({node for wall in run for node in (wall.start_node, wall.end_node)}, key=along)
+
+            # Ends of the run, and the nodes in between something else uses
+            chain = [
+                node for i, node in enumerate(nodes)
+                if i == 0 or i == len(nodes) - 1 or node.owners - run_walls
+            ]
+
+            old_pairs = {frozenset((wall.start_node, wall.end_node)) for wall in run}
+            new_pairs = {frozenset(pair) for pair in zip(chain, chain[1:])}
+            if len(run) != len(new_pairs) or old_pairs != new_pairs:
+                plans.append((run, chain))
+        return plans
+
+
+def _split_sorted(entries: list[tuple[float, Wall]], gap: float) -> list[list[tuple[float, Wall]]]:
+    groups = []
+    for entry in entries:
+        if groups and entry[0] - groups[-1][-1][0] <= gap:
+            groups[-1].append(entry)
+        else:
+            groups.append([entry])
+    return groups
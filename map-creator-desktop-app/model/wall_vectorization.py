@@ -0,0 +1,475 @@
+import math
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable
+
+import numpy as np
+
+# Traces the walls of a scanned floor plan, given as a grayscale image with
+# dark lines on a light background:
+#   - the image is binarized at its Otsu threshold,
+#   - it is cut into tiles, each traced by a worker process:
+#       - dark runs along rows and columns at least min_length long that
+#         stack up to a stroke between min_thickness and max_thickness thick
+#         are horizontal and vertical walls,
+#       - what is left goes through a Hough transform for slanted walls,
+#   - the pieces of a wall split by tiles are merged back into one,
+#   - wall ends stopping at another wall are moved onto its center line, so
+#     that corners meet in a point.
+# Segments come back in pixel coordinates as (x1, y1, x2, y2).
+
+class VectorizationCancelled(Exception):
+    pass
+
+
+class WallVectorizer:
+    def __init__(self,
+                 min_length: float = 40,
+                 min_thickness: float = 2,
+                 max_thickness: float = 40,
+                 tile_size: int = 1024,
+                 workers: int = None):
+        if min_length <= 0 or min_thickness <= 0 or max_thickness < min_thickness:
+            raise ValueError("Invalid wall size limits.")
+        if tile_size <= 0:
+            raise ValueError("Tile size must be positive.")
+
+        self._min_length = float(min_length)
+        self._min_thickness = float(min_thickness)
+        self._max_thickness = float(max_thickness)
+        self._tile_size = int(tile_size)
+        self._workers = workers or os.cpu_count() or 1
+
+    def vectorize(self,
+                  gray: np.ndarray,
+                  progress: Callable[[int, int], None] = None,
+                  cancelled: Callable[[], bool] = None) -> list[tuple[float, float, float, float]]:
+        threshold = otsu_threshold(gray)
+        jobs = list(self._tile_jobs(gray, threshold))
+
+        if self._workers > 1 and len(jobs) > 1:
+            pieces = self._run_pool(jobs, progress, cancelled)
+        else:
+            pieces = []
+            for done, job in enumerate(jobs, start=1):
+                if cancelled is not None and cancelled():
+                    raise VectorizationCancelled()
+                pieces.extend(_trace_tile(*job))
+                if progress is not None:
+                    progress(done, len(jobs))
+
+        segments = self._merge(pieces)
+        segments = self._join_ends(segments)
+        return [
+            (x1, y1, x2, y2) for x1, y1, x2, y2, _ in segments
+            if math.hypot(x2 - x1, y2 - y1) >= self._min_length
+        ]
+
+    def _tile_jobs(self, gray: np.ndarray, threshold: int):
+        # Tiles overlap by more than a wall is thick or has to be long, each
+        # one keeps the walls whose center line is in its own part
+        height, width = gray.shape
+        size = self._tile_size
+        margin = int(math.ceil(max(self._min_length, self._max_thickness))) + 2
+        limits = (self._min_length, self._min_thickness, self._max_thickness)
+
+        for top in range(0, height, size):
+            for left in range(0, width, size):
+                y0, x0 = max(0, top - margin), max(0, left - margin)
+                y1, x1 = min(height, top + size + margin), min(width, left + size + margin)
+                core = (left - x0, top - y0, min(width, left + size) - x0, min(height, top + size) - y0)
+                yield np.ascontiguousarray(gray[y0:y1, x0:x1]), threshold, (x0, y0), core, limits
+
+    def _run_pool(self, jobs: list, progress, cancelled) -> list:
+        # Spawned rather than forked, the GUI process has threads running
+        context = multiprocessing.get_context("spawn")
+        total = len(jobs)
+        queued = iter(jobs)
+        pieces = []
+        done = 0
+
+        with ProcessPoolExecutor(max_workers=min(self._workers, total), mp_context=context) as executor:
+            # A couple of tiles per worker in flight, not the whole image pickled up front
+            pending = {executor.submit(_trace_tile, *job) for job in _take(queued, 2 * self._workers)}
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if cancelled is not None and cancelled():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise VectorizationCancelled()
+
+                for future in finished:
+                    pieces.extend(future.result())
+                    done += 1
+                    pending.update(executor.submit(_trace_tile, *job) for job in _take(queued, 1))
+
+                if finished and progress is not None:
+                    progress(done, total)
+        return pieces
+
+    # ------------------------------------
+    # -------------- Merge ---------------
+    # ------------------------------------
+    def _merge(self, pieces: list) -> list:
+        # Pieces on one line touching or overlapping become one segment
+        angle_tolerance = math.radians(2)
+        entries = []
+        for x1, y1, x2, y2, thickness in pieces:
+            if x1 != x2 or y1 != y2:
+                entries.append((math.atan2(y2 - y1, x2 - x1) % math.pi, (x1, y1, x2, y2, thickness)))
+        entries.sort(key=lambda entry: entry[0])
+
+        directions = _split_sorted(entries, angle_tolerance)
+        if len(directions) > 1 and directions[0][0][0] + math.pi - directions[-1][-1][0] <= angle_tolerance:
+            last = directions.pop()
+            directions[0] = [(angle - math.pi, piece) for angle, piece in last] + directions[0]
+
+        segments = []
+        for direction in directions:
+            angle = sum(angle for angle, _ in direction) / len(direction)
+            ux, uy = math.cos(angle), math.sin(angle)
+
+            offsets = sorted(
+                ((-uy * (piece[0] + piece[2]) / 2 + ux * (piece[1] + piece[3]) / 2, piece) for _, piece in direction),
+                key=lambda entry: entry[0],
+            )
+            for line in _split_sorted(offsets, max(2.0, self._min_thickness)):
+                segments.extend(self._merge_line(line, ux, uy))
+        return segments
+
+    def _merge_line(self, line: list, ux: float, uy: float) -> list:
+        spans = []
+        for offset, (x1, y1, x2, y2, thickness) in line:
+            a, b = x1 * ux + y1 * uy, x2 * ux + y2 * uy
+            spans.append((min(a, b), max(a, b), offset, thickness))
+        spans.sort(key=lambda span: span[0])
+
+        gap = max(2.0, self._min_thickness)
+        runs = []
+        run_end = -math.inf
+        for span in spans:
+            if runs and span[0] <= run_end + gap:
+                runs[-1].append(span)
+                run_end = max(run_end, span[1])
+            else:
+                runs.append([span])
+                run_end = span[1]
+
+        segments = []
+        for run in runs:
+            start = min(span[0] for span in run)
+            end = max(span[1] for span in run)
+            weights = [max(span[1] - span[0], 1e-6) for span in run]
+            total = sum(weights)
+            offset = sum(span[2] * w for span, w in zip(run, weights)) / total
+            thickness = sum(span[3] * w for span, w in zip(run, weights)) / total
+            segments.append((
+                start * ux - offset * uy, start * uy + offset * ux,
+                end * ux - offset * uy, end * uy + offset * ux,
+                thickness,
+            ))
+        return segments
+
+    # ------------------------------------
+    # ------------ Junctions -------------
+    # ------------------------------------
+    def _join_ends(self, segments: list) -> list:
+        # An end stopping at or inside another wall is moved onto that wall's
+        # center line, ends of walls meeting at a corner end up in one point
+        reach = self._max_thickness + 2
+        cell_size = max(4 * reach, 1.0)
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, (x1, y1, x2, y2, _) in enumerate(segments):
+            for ci in range(math.floor((min(x1, x2) - reach) / cell_size),
+                            math.floor((max(x1, x2) + reach) / cell_size) + 1):
+                for cj in range(math.floor((min(y1, y2) - reach) / cell_size),
+                                math.floor((max(y1, y2) + reach) / cell_size) + 1):
+                    cells.setdefault((ci, cj), []).append(i)
+
+        joined = []
+        for i, (x1, y1, x2, y2, thickness) in enumerate(segments):
+            ends = []
+            for x, y in ((x1, y1), (x2, y2)):
+                best, best_distance = None, None
+                for j in cells.get((math.floor(x / cell_size), math.floor(y / cell_size)), ()):
+                    if j == i:
+                        continue
+
+                    ax, ay, bx, by, other_thickness = segments[j]
+                    if _sin_between(x1, y1, x2, y2, ax, ay, bx, by) < 0.35:
+                        continue
+
+                    distance = _distance_to_segment(x, y, ax, ay, bx, by)
+                    if distance <= (thickness + other_thickness) / 2 + 2 and (
+                            best_distance is None or distance < best_distance):
+                        best, best_distance = j, distance
+
+                if best is not None:
+                    ax, ay, bx, by, _ = segments[best]
+                    point = _intersect_lines(x1, y1, x2, y2, ax, ay, bx, by)
+                    if point is not None and math.hypot(point[0] - x, point[1] - y) <= reach:
+                        x, y = point
+                ends.append((x, y))
+
+            (sx, sy), (ex, ey) = ends
+            joined.append((sx, sy, ex, ey, thickness))
+        return joined
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    histogram = np.bincount(gray.ravel(), minlength=256)[:256].astype(np.float64)
+    total = histogram.sum()
+    if total == 0:
+        return 128
+
+    levels = np.arange(256, dtype=np.float64)
+    weight_dark = np.cumsum(histogram)
+    weight_light = total - weight_dark
+    sum_dark = np.cumsum(histogram * levels)
+    mean_dark = sum_dark / np.maximum(weight_dark, 1)
+    mean_light = (sum_dark[-1] - sum_dark) / np.maximum(weight_light, 1)
+    between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+
+    # Pixels up to and including the threshold are dark
+    return int(np.argmax(between)) + 1
+
+
+# ------------------------------------
+# ------------- Workers --------------
+# ------------------------------------
+def _trace_tile(gray: np.ndarray, threshold: int, origin: tuple, core: tuple, limits: tuple) -> list:
+    min_length, min_thickness, max_thickness = limits
+    mask = gray < threshold
+    left, top, right, bottom = core
+    ox, oy = origin
+
+    pieces = []
+
+    # Horizontal walls, then the same on the transposed tile for vertical ones.
+    # Both clear their strokes from what the slanted walls are looked for in.
+    remaining = mask.copy()
+    for y, x1, x2, thickness in _axis_strokes(mask, remaining, min_length, min_thickness, max_thickness):
+        if top <= y < bottom:
+            x1, x2 = max(x1, left), min(x2, right)
+            if x2 > x1:
+                pieces.append((ox + x1, oy + y, ox + x2, oy + y, thickness))
+
+    for x, y1, y2, thickness in _axis_strokes(mask.T, remaining.T, min_length, min_thickness, max_thickness):
+        if left <= x < right:
+            y1, y2 = max(y1, top), min(y2, bottom)
+            if y2 > y1:
+                pieces.append((ox + x, oy + y1, ox + x, oy + y2, thickness))
+
+    for x1, y1, x2, y2, thickness in _slanted_strokes(remaining, min_length, min_thickness, max_thickness):
+        clipped = _clip_segment(x1, y1, x2, y2, left, top, right, bottom)
+        if clipped is not None:
+            x1, y1, x2, y2 = clipped
+            pieces.append((ox + x1, oy + y1, ox + x2, oy + y2, thickness))
+
+    return pieces
+
+def _axis_strokes(mask: np.ndarray, remaining: np.ndarray,
+                  min_length: float, min_thickness: float, max_thickness: float) -> list:
+    # Long dark runs of neighbouring rows overlapping by half their length
+    # stack up to a stroke. Found strokes are cleared from remaining.
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), np.int8)
+    padded[:, 1:-1] = mask
+    steps = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+
+    long_runs = ends - starts >= min_length
+    rows, starts, ends = rows[long_runs], starts[long_runs], ends[long_runs]
+    if len(rows) == 0:
+        return []
+
+    row_first = np.searchsorted(rows, np.arange(height + 1))
+    parents = list(range(len(rows)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    rows_list, starts_list, ends_list = rows.tolist(), starts.tolist(), ends.tolist()
+    for i, row in enumerate(rows_list):
+        if row == 0:
+            continue
+
+        first, last = int(row_first[row - 1]), int(row_first[row])
+        start, end = starts_list[i], ends_list[i]
+        j = first + int(np.searchsorted(starts[first:last], end)) - 1
+        while j >= first and ends_list[j] > start:
+            overlap = min(end, ends_list[j]) - max(start, starts_list[j])
+            if overlap * 2 >= min(end - start, ends_list[j] - starts_list[j]):
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parents[root_i] = root_j
+            j -= 1
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(rows_list)):
+        groups.setdefault(find(i), []).append(i)
+
+    strokes = []
+    for members in groups.values():
+        first_row, last_row = rows_list[members[0]], rows_list[members[-1]]
+        thickness = last_row - first_row + 1
+        if not min_thickness <= thickness <= max_thickness:
+            continue
+
+        index = np.array(members)
+        strokes.append((
+            (first_row + last_row + 1) / 2,
+            float(np.median(starts[index])),
+            float(np.median(ends[index])),
+            float(thickness),
+        ))
+        for i in members:
+            remaining[rows_list[i], starts_list[i]:ends_list[i]] = False
+    return strokes
+
+def _slanted_strokes(mask: np.ndarray, min_length: float, min_thickness: float, max_thickness: float,
+                     max_lines: int = 256, max_misses: int = 16) -> list:
+    # Strongest Hough peak first, its pixels taken out before the next one.
+    # Text and hatching make peaks without a stroke, after max_misses of
+    # those in a row the rest of the tile is left alone.
+    ys, xs = np.nonzero(mask)
+    if len(xs) < min_length:
+        return []
+
+    xs = xs.astype(np.float64) + 0.5
+    ys = ys.astype(np.float64) + 0.5
+    height, width = mask.shape
+    diagonal = int(math.ceil(math.hypot(width, height)))
+    bins = 2 * diagonal + 1
+
+    # Normals 1 degree apart, leaving out walls within 5 degrees of the axes
+    degrees = np.array([d for d in range(180) if 5 <= d % 90 <= 85], np.float64)
+    thetas = np.radians(degrees)
+    cos, sin = np.cos(thetas), np.sin(thetas)
+
+    accumulator = np.zeros(len(thetas) * bins, np.int64)
+    alive = np.ones(len(xs), bool)
+
+    def vote(points: np.ndarray, sign: int):
+        # In chunks, all the votes of a busy tile at once are too many
+        for chunk in np.array_split(points, max(1, len(points) // 20000)):
+            rho = np.rint(np.outer(xs[chunk], cos) + np.outer(ys[chunk], sin)).astype(np.int64) + diagonal
+            cells = (np.arange(len(thetas)) * bins)[None, :] + rho
+            votes = np.bincount(cells.ravel(), minlength=len(accumulator))
+            if sign > 0:
+                np.add(accumulator, votes, out=accumulator)
+            else:
+                np.subtract(accumulator, votes, out=accumulator)
+
+    vote(np.arange(len(xs)), 1)
+
+    gap = max(2.0, min_thickness)
+    strokes = []
+    misses = 0
+    for _ in range(max_lines):
+        peak = int(np.argmax(accumulator))
+        if accumulator[peak] < min_length:
+            break
+
+        t, rho = divmod(peak, bins)
+        rho -= diagonal
+        c, s = float(cos[t]), float(sin[t])
+
+        live = np.nonzero(alive)[0]
+        distances = xs[live] * c + ys[live] * s - rho
+        along = -xs[live] * s + ys[live] * c
+
+        found = []
+        on_line = np.abs(distances) <= 1.0
+        positions = np.sort(along[on_line])
+        if len(positions):
+            breaks = np.nonzero(np.diff(positions) > gap)[0]
+            for first, last in zip(np.concatenate(([0], breaks + 1)), np.concatenate((breaks, [len(positions) - 1]))):
+                if positions[last] - positions[first] >= min_length:
+                    found.append((positions[first], positions[last]))
+
+        # Pixels of this peak go either way, so the next peak is another one
+        removed = on_line.copy()
+        for start, end in found:
+            band = (np.abs(distances) <= max_thickness / 2) & (along >= start - gap) & (along <= end + gap)
+
+            # The peak can lie at the edge of a thick stroke, its pixels center it
+            center = rho + float(np.mean(distances[band]))
+            thickness = float(np.std(distances[band])) * math.sqrt(12)
+            removed |= band
+            if not min_thickness <= thickness <= max_thickness:
+                continue
+
+            strokes.append((
+                center * c - start * s, center * s + start * c,
+                center * c - end * s, center * s + end * c,
+                thickness,
+            ))
+
+        gone = live[removed]
+        alive[gone] = False
+        vote(gone, -1)
+
+        misses = 0 if found else misses + 1
+        if misses >= max_misses:
+            break
+
+    return strokes
+
+def _clip_segment(x1, y1, x2, y2, left, top, right, bottom):
+    # Liang-Barsky
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - left), (dx, right - x1), (-dy, y1 - top), (dy, bottom - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 >= t1:
+            return None
+    return x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy
+
+
+# ------------------------------------
+# ------------- Geometry -------------
+# ------------------------------------
+def _take(iterator, count: int) -> list:
+    return [job for _, job in zip(range(count), iterator)]
+
+def _split_sorted(entries: list, gap: float) -> list:
+    groups = []
+    for entry in entries:
+        if groups and entry[0] - groups[-1][-1][0] <= gap:
+            groups[-1].append(entry)
+        else:
+            groups.append([entry])
+    return groups
+
+def _sin_between(x1, y1, x2, y2, ax, ay, bx, by) -> float:
+    dx, dy, ex, ey = x2 - x1, y2 - y1, bx - ax, by - ay
+    lengths = math.hypot(dx, dy) * math.hypot(ex, ey)
+    return abs(dx * ey - dy * ex) / lengths if lengths else 0.0
+
+def _distance_to_segment(x, y, ax, ay, bx, by) -> float:
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    t = 0.0 if length_squared == 0 else max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / length_squared))
+    return math.hypot(ax + t * dx - x, ay + t * dy - y)
+
+def _intersect_lines(x1, y1, x2, y2, ax, ay, bx, by):
+    dx, dy, ex, ey = x2 - x1, y2 - y1, bx - ax, by - ay
+    denominator = dx * ey - dy * ex
+    if denominator == 0:
+        return None
+    t = ((ax - x1) * ey - (ay - y1) * ex) / denominator
+    return x1 + t * dx, y1 + t * dy
@@ -1,10 +1,12 @@
 import uuid
-from PySide6.QtCore import QPointF
 
 from enum import Enum
 
 from .node import Node
 from .map_object import MapObject
+from .fingerprints import Fingerprints
+from .point import Point
+from .zone_geometry import ZoneGeometry
 
 class ZoneType(Enum):
     GENERIC = 1
@@ -12,24 +14,34 @@ class ZoneType(Enum):
     ELEVATOR = 3
 
 class Zone(MapObject):
+    __slots__ = ("corner_nodes", "_name", "_type", "_fingerprints", "_geometry")
+
     def __init__(self, 
                  corner_nodes: list[Node], 
                  name="Zone", 
                  type=ZoneType.GENERIC,
-                 id:uuid.UUID=None):
+                 id:uuid.UUID=None,
+                 fingerprints: Fingerprints=None):
         super().__init__(id)
         self.corner_nodes = corner_nodes
         self._name = name
         self._type = type if type is not None else ZoneType.GENERIC
+        self._fingerprints = fingerprints if fingerprints is not None else Fingerprints()
 
-        for node in self.corner_nodes:
-            node.owner = self
-            node.updated.connect(self.updated)
+        # Computed on first use, dropped whenever a corner moves
+        self._geometry: ZoneGeometry = None
 
     @property
     def dependencies(self) -> list[Node]:
         return self.corner_nodes
 
+    def replace_node(self, old: Node, new: Node):
+        self.corner_nodes = [new if node is old else node for node in self.corner_nodes]
+
+        old.owners.discard(self)
+        new.owners.add(self)
+        self.invalidate_geometry()
+
     @property
     def name(self) -> str:
         return self._name
@@ -37,7 +49,7 @@ class Zone(MapObject):
     @name.setter
     def name(self, value: str) -> None:
         self._name = value
-        self.updated.emit()
+        self.notify_updated()
 
     @property
     def type(self) -> ZoneType:
@@ -46,32 +58,57 @@ class Zone(MapObject):
     @type.setter
     def type(self, value: ZoneType) -> None:
         self._type = value
-        self.updated.emit()
+        self.notify_updated()
+
+    @property
+    def fingerprints(self) -> Fingerprints:
+        return self._fingerprints
+
+    @fingerprints.setter
+    def fingerprints(self, value: Fingerprints) -> None:
+        self._fingerprints = value
+        self.notify_updated()
+
+    @property
+    def geometry(self) -> ZoneGeometry:
+        if self._geometry is None:
+            self._geometry = ZoneGeometry(tuple((node.x, node.y) for node in self.corner_nodes))
+        return self._geometry
+
+    def invalidate_geometry(self):
+        self._geometry = None
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        return self.geometry.bounds
+
+    @property
+    def area(self) -> float:
+        return self.geometry.area
+
+    @property
+    def perimeter(self) -> float:
+        return self.geometry.perimeter
 
     @property
     def movables(self) -> list[Node]:
         return self.corner_nodes
     
     @property
-    def position(self) -> QPointF:
-        x = sum(node.x for node in self.corner_nodes) / len(self.corner_nodes)
-        y = sum(node.y for node in self.corner_nodes) / len(self.corner_nodes)
-        return QPointF(x, y)
+    def position(self) -> Point:
+        return self.geometry.center
     
     @position.setter
-    def position(self, pos: QPointF) -> None:
-        dx = pos.x() - self.position.x()
-        dy = pos.y() - self.position.y()
-        delta = QPointF(dx, dy)
-
-        self.moveBy(delta)
-        self.updated.emit()
+    def position(self, pos: Point) -> None:
+        center = self.geometry.center
+        self.moveBy(Point(pos.x() - center.x(), pos.y() - center.y()))
+        self.notify_updated()
 
-    def moveBy(self, delta: QPointF) -> None:
+    def moveBy(self, delta: Point) -> None:
         for node in self.corner_nodes:
             node.moveBy(delta)
 
-        self.updated.emit()
+        self.notify_updated()
 
     def to_dict(self) -> dict:
         return {
@@ -79,4 +116,5 @@ class Zone(MapObject):
             "name": self._name,
             "type": self._type.name,
             "corner_node_ids": [str(node.uuid) for node in self.corner_nodes],
+            "fingerprints": self._fingerprints.to_list(),
         }
\ No newline at end of file
@@ -0,0 +1,63 @@
+import math
+
+from .point import Point
+
+# Shape of a zone computed once from its corners. Zones hand out the same
+# instance until one of their corners moves, so views can tell whether
+# they have anything to redraw by identity.
+class ZoneGeometry:
+    __slots__ = ("points", "bounds", "center", "centroid", "area", "perimeter")
+
+    def __init__(self, points: tuple[tuple[float, float], ...]):
+        self.points = points
+
+        if not points:
+            self.bounds = None
+            self.center = Point()
+            self.centroid = Point()
+            self.area = 0.0
+            self.perimeter = 0.0
+            return
+
+        count = len(points)
+        min_x = max_x = points[0][0]
+        min_y = max_y = points[0][1]
+        sum_x = sum_y = 0.0
+        twice_area = 0.0
+        centroid_x = centroid_y = 0.0
+        perimeter = 0.0
+
+        x0, y0 = points[-1]
+        for x1, y1 in points:
+            if x1 < min_x:
+                min_x = x1
+            elif x1 > max_x:
+                max_x = x1
+            if y1 < min_y:
+                min_y = y1
+            elif y1 > max_y:
+                max_y = y1
+
+            sum_x += x1
+            sum_y += y1
+
+            cross = x0 * y1 - x1 * y0
+            twice_area += cross
+            centroid_x += (x0 + x1) * cross
+            centroid_y += (y0 + y1) * cross
+            perimeter += math.hypot(x1 - x0, y1 - y0)
+
+            x0, y0 = x1, y1
+
+        self.bounds = (min_x, min_y, max_x, max_y)
+
+        # Mean of the corners, where zones have always been placed and labelled
+        self.center = Point(sum_x / count, sum_y / count)
+
+        if twice_area != 0.0:
+            self.centroid = Point(centroid_x / (3 * twice_area), centroid_y / (3 * twice_area))
+        else:
+            self.centroid = self.center
+
+        self.area = abs(twice_area) / 2
+        self.perimeter = perimeter if count > 1 else 0.0
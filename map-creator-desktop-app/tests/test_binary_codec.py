@@ -0,0 +1,76 @@
+import struct
+import zlib
+
+from pathlib import Path
+
+import pytest
+
+from building_binary_codec import BinaryBuildingCodec, VERSION, FLAG_COMPRESSED
+from building_serializer import BuildingSerializer
+
+
+BUILDING_PATH = Path(__file__).resolve().parent.parent / "some_building.json"
+
+
+def load_building():
+    return BuildingSerializer().load_from_file(str(BUILDING_PATH))
+
+
+def normalized(data: dict) -> dict:
+    data = dict(data)
+    data["zone_connections"] = sorted(
+        tuple(sorted(connection.values())) for connection in data["zone_connections"]
+    )
+    return data
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(compress):
+    data = load_building().to_dict()
+    codec = BinaryBuildingCodec()
+
+    encoded = codec.encode(data, compress)
+
+    assert normalized(codec.decode(encoded).to_dict()) == normalized(data)
+    assert normalized(codec.decode_to_dict(encoded)) == normalized(data)
+
+
+def test_lazy_open_matches_eager_decode(tmp_path):
+    data = load_building().to_dict()
+    codec = BinaryBuildingCodec()
+    path = tmp_path / "building.inmapb"
+    path.write_bytes(codec.encode(data))
+
+    building = codec.open_lazy(str(path))
+
+    assert not any(floor.is_loaded for floor in building.floors)
+    assert normalized(building.to_dict()) == normalized(data)
+
+
+def test_rejects_other_versions():
+    codec = BinaryBuildingCodec()
+    encoded = bytearray(codec.encode(load_building().to_dict()))
+    struct.pack_into("<H", encoded, 8, VERSION + 1)
+
+    with pytest.raises(ValueError):
+        codec.decode(bytes(encoded))
+
+
+def test_rejects_truncated_data():
+    codec = BinaryBuildingCodec()
+    encoded = codec.encode(load_building().to_dict())
+
+    with pytest.raises(ValueError):
+        codec.decode(encoded[:-1])
+
+
+def test_rejects_truncated_floor_payload():
+    codec = BinaryBuildingCodec()
+    floor_data = load_building().to_dict()["floors"][0]
+    body = codec.encode_payload(floor_data, compress=False)
+
+    # Cutting the fingerprint section must not read as "no fingerprints"
+    with pytest.raises(ValueError):
+        codec.decode_payload(body[:-1], 0)
+    with pytest.raises(ValueError):
+        codec.decode_payload(zlib.compress(body + b"\0"), FLAG_COMPRESSED)
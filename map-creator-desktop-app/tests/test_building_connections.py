@@ -0,0 +1,88 @@
+from PySide6.QtGui import QUndoStack
+
+from model import Building, Floor, Node, Zone
+from commands import FloorRemoveCommand, ZoneConnectionAddCommand
+
+
+def add_zone(floor: Floor, x: float, name: str) -> Zone:
+    corners = [Node(x, 0), Node(x + 10, 0), Node(x + 10, 10), Node(x, 10)]
+    zone = Zone(corners, name)
+    floor.add(zone)
+    return zone
+
+
+def records(building: Building) -> set:
+    return set(building.get_connection_records())
+
+
+def build():
+    building = Building()
+    floors = [Floor(f"Floor {i}") for i in range(3)]
+    for floor in floors:
+        building.add_floor(floor)
+
+    lobby = add_zone(floors[0], 0, "Lobby")
+    office = add_zone(floors[0], 20, "Office")
+    stairs = add_zone(floors[1], 0, "Stairs")
+    hall = add_zone(floors[1], 20, "Hall")
+    roof = add_zone(floors[2], 0, "Roof")
+
+    stack = QUndoStack()
+    for zone1, zone2 in [(lobby, office), (lobby, stairs), (stairs, hall), (hall, roof), (office, hall)]:
+        stack.push(ZoneConnectionAddCommand(building, zone1, zone2))
+
+    return building, floors, stack, (lobby, office, stairs, hall, roof)
+
+
+def test_remove_floor_parks_its_connections():
+    building, floors, stack, (lobby, office, stairs, hall, roof) = build()
+
+    stack.push(FloorRemoveCommand(building, floors[1]))
+
+    assert {frozenset(record) for record in records(building)} == {
+        frozenset((lobby.uuid, floors[0], office.uuid, floors[0]))
+    }
+    assert building.get_zones_connected_to(lobby) == {office}
+    assert building.get_zones_connected_to(roof) == set()
+
+
+def test_undo_floor_removal_restores_connections():
+    building, floors, stack, zones = build()
+    before = records(building)
+    assert len(before) == 5
+
+    stack.push(FloorRemoveCommand(building, floors[1]))
+    stack.undo()
+
+    assert records(building) == before
+    lobby, office, stairs, hall, roof = zones
+    assert building.get_zones_connected_to(hall) == {stairs, roof, office}
+
+
+def test_redo_floor_removal_parks_connections_again():
+    building, floors, stack, (lobby, office, stairs, hall, roof) = build()
+    before = records(building)
+
+    stack.push(FloorRemoveCommand(building, floors[1]))
+    after_remove = records(building)
+    stack.undo()
+    stack.redo()
+
+    assert records(building) == after_remove
+    assert building.get_zones_connected_to(roof) == set()
+
+    # Still parked, not lost: a second undo brings them all back
+    stack.undo()
+    assert records(building) == before
+
+
+def test_connections_survive_removing_both_floors():
+    building, floors, stack, _ = build()
+    before = records(building)
+
+    stack.push(FloorRemoveCommand(building, floors[1]))
+    stack.push(FloorRemoveCommand(building, floors[2]))
+    stack.undo()
+    stack.undo()
+
+    assert records(building) == before
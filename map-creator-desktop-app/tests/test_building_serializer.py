@@ -0,0 +1,68 @@
+import json
+
+from pathlib import Path
+
+from building_binary_codec import BinaryBuildingCodec
+from building_serializer import BuildingSerializer, JsonFloorSource
+from model import FloorUnderlay, Node
+
+
+BUILDING_PATH = Path(__file__).resolve().parent.parent / "some_building.json"
+
+
+def normalized(data: dict) -> dict:
+    data = dict(data)
+    data["zone_connections"] = sorted(
+        tuple(sorted(connection.values())) for connection in data["zone_connections"]
+    )
+    return data
+
+
+def test_json_save_matches_json_dump(tmp_path):
+    serializer = BuildingSerializer()
+    building = serializer.load_from_file(str(BUILDING_PATH))
+    building.floors[0].underlay = FloorUnderlay("plan.png", 640, 480)
+    path = tmp_path / "building.inmap"
+
+    serializer.save_to_file(building, str(path))
+
+    assert path.read_text(encoding="utf-8") == json.dumps(building.to_dict(), indent=4)
+
+
+def test_json_save_reuses_unchanged_floors(tmp_path):
+    serializer = BuildingSerializer()
+    building = serializer.load_from_file(str(BUILDING_PATH))
+    path = tmp_path / "building.inmap"
+    serializer.save_to_file(building, str(path))
+
+    unchanged, changed = building.floors[0], building.floors[1]
+    source = unchanged.source
+    assert isinstance(source, JsonFloorSource) and not unchanged.is_dirty
+
+    changed.add(Node(1, 2))
+    assert changed.is_dirty
+    serializer.save_to_file(building, str(path))
+
+    assert unchanged.source is source
+    assert not changed.is_dirty
+    assert json.loads(path.read_text(encoding="utf-8")) == building.to_dict()
+
+
+def test_json_save_of_unloaded_floors(tmp_path):
+    serializer = BuildingSerializer()
+    data = serializer.load_from_file(str(BUILDING_PATH)).to_dict()
+    binary_path = tmp_path / "building.inmapb"
+    binary_path.write_bytes(BinaryBuildingCodec().encode(data))
+    building = serializer.load_from_file(str(binary_path), lazy=True)
+
+    serializer.save_to_file(building, str(tmp_path / "building.inmap"))
+
+    assert not any(floor.is_loaded or floor.is_dirty for floor in building.floors)
+    assert normalized(json.loads((tmp_path / "building.inmap").read_text(encoding="utf-8"))) == normalized(data)
+
+    # Overwriting the file they load from loads them first
+    serializer.save_to_file(building, str(binary_path))
+
+    assert all(floor.is_loaded for floor in building.floors)
+    assert all(isinstance(floor.source, JsonFloorSource) for floor in building.floors)
+    assert normalized(json.loads(binary_path.read_text(encoding="utf-8"))) == normalized(data)
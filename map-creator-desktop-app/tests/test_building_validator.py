@@ -0,0 +1,131 @@
+import random
+
+import numpy as np
+import pytest
+
+from building_validator import (
+    BuildingValidator, FloorGeometry, IssueKind, MAX_BOX_CELLS,
+    _boxes, _candidate_pairs, _cell_counts, _cell_size, _segments,
+)
+from model import Building, Floor, Node, Wall, Zone
+
+
+def make_floor():
+    building = Building()
+    floor = Floor("Floor")
+    building.add_floor(floor)
+    return building, floor
+
+
+def add_zone(floor: Floor, points, name: str) -> Zone:
+    zone = Zone([Node(x, y) for x, y in points], name)
+    floor.add(zone)
+    return zone
+
+
+def issues_of(building: Building, kind: IssueKind):
+    return [issue for issue in BuildingValidator().validate_building(building) if issue.kind == kind]
+
+
+def test_self_intersecting_zone():
+    building, floor = make_floor()
+    bow_tie = add_zone(floor, [(0, 0), (100, 100), (100, 0), (0, 200)], "Bow tie")
+    add_zone(floor, [(200, 0), (300, 0), (300, 100), (200, 100)], "Square")
+    # Already reported as degenerate
+    add_zone(floor, [(400, 0), (450, 0), (500, 0)], "Flat")
+
+    issues = issues_of(building, IssueKind.SELF_INTERSECTING_ZONE)
+
+    assert [issue.elements for issue in issues] == [[bow_tie]]
+    assert issues[0].position is not None
+
+
+def test_zone_touching_itself_at_a_corner():
+    building, floor = make_floor()
+    zone = add_zone(floor, [(0, 0), (50, 50), (100, 0), (100, 100), (50, 50), (0, 100)], "Figure eight")
+
+    issues = issues_of(building, IssueKind.SELF_INTERSECTING_ZONE)
+
+    assert [issue.elements for issue in issues] == [[zone]]
+
+
+def random_boxes(rng, count, size):
+    boxes = []
+    for _ in range(count):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        shape = rng.random()
+        if shape < 0.3:
+            w, h = 0.0, 0.0
+        elif shape < 0.6:
+            w, h = (rng.uniform(0, size), 0.0) if rng.random() < 0.5 else (0.0, rng.uniform(0, size))
+        elif shape < 0.95:
+            w, h = rng.uniform(0, size), rng.uniform(0, size)
+        else:
+            w, h = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        boxes.append((x, y, x + w, y + h))
+    return tuple(np.array(values) for values in zip(*boxes))
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_candidate_pairs_match_all_pairs(strict):
+    rng = random.Random(strict)
+    boxes_a = random_boxes(rng, 300, 50)
+    boxes_b = random_boxes(rng, 200, 50)
+
+    a, b = _candidate_pairs(boxes_a, boxes_b, strict)
+
+    expected = set()
+    for i in range(len(boxes_a[0])):
+        for j in range(len(boxes_b[0])):
+            ax1, ay1, ax2, ay2 = (values[i] for values in boxes_a)
+            bx1, by1, bx2, by2 = (values[j] for values in boxes_b)
+            if strict:
+                overlap = ax1 < bx2 and bx1 < ax2 and ay1 < by2 and by1 < ay2
+            else:
+                overlap = ax1 <= bx2 and bx1 <= ax2 and ay1 <= by2 and by1 <= ay2
+            if overlap:
+                expected.add((i, j))
+
+    found = list(zip(a.tolist(), b.tolist()))
+    assert len(found) == len(set(found))
+    assert set(found) == expected
+
+
+def test_degenerate_walls_keep_grid_coarse():
+    # Axis-aligned walls have no extent across and zero length walls none at
+    # all; when they are most of the boxes, the cells must still fit the walls
+    building, floor = make_floor()
+    nodes = [[Node(i * 1000.0, j * 1000.0) for j in range(11)] for i in range(11)]
+    for i in range(10):
+        for j in range(11):
+            floor.add(Wall(nodes[i][j], nodes[i + 1][j]))
+            floor.add(Wall(nodes[j][i], nodes[j][i + 1]))
+    zero_length = [Wall(Node(i * 10.0 + 5, 5.0), Node(i * 10.0 + 5, 5.0)) for i in range(300)]
+    for wall in zero_length:
+        floor.add(wall)
+
+    geometry = FloorGeometry(floor)
+    wall_nodes = geometry.wall_nodes
+    boxes = _boxes(*_segments(geometry.xs, geometry.ys, wall_nodes[:, 0], wall_nodes[:, 1]))
+
+    cell_size = _cell_size(boxes, boxes)
+    assert cell_size >= 1000.0
+    assert _cell_counts(*boxes, cell_size).max() <= 4
+
+    issues = issues_of(building, IssueKind.ZERO_LENGTH_WALL)
+    assert {id(issue.elements[0]) for issue in issues} == {id(wall) for wall in zero_length}
+
+
+def test_large_boxes_are_not_bucketed():
+    rng = random.Random(5)
+    boxes = random_boxes(rng, 200, 20)
+    boxes = tuple(np.append(values, bound) for values, bound in zip(boxes, (-10.0, -10.0, 2000.0, 2000.0)))
+
+    cell_size = _cell_size(boxes, boxes)
+    assert _cell_counts(*boxes, cell_size)[-1] > MAX_BOX_CELLS
+
+    a, b = _candidate_pairs(boxes, boxes)
+    pairs = set(zip(a.tolist(), b.tolist()))
+    last = len(boxes[0]) - 1
+    assert {(last, j) for j in range(last + 1)} <= pairs
+    assert {(j, last) for j in range(last + 1)} <= pairs
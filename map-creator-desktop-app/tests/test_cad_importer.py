@@ -0,0 +1,99 @@
+import io
+
+import pytest
+
+from cad_importer import CadImporter, DxfReader, LayerMapping, SvgReader
+from model import Floor, PointOfInterest, Wall, Zone
+
+
+def dxf(*groups, units: int = None) -> io.BytesIO:
+    lines = []
+    if units is not None:
+        lines += ["0", "SECTION", "2", "HEADER", "9", "$INSUNITS", "70", str(units), "0", "ENDSEC"]
+    lines += ["0", "SECTION", "2", "ENTITIES"]
+    for group in groups:
+        lines += group
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    return io.BytesIO("\n".join(lines).encode("utf-8") + b"\n")
+
+
+def line(layer: str, x1, y1, x2, y2) -> list[str]:
+    return ["0", "LINE", "8", layer, "10", str(x1), "20", str(y1), "11", str(x2), "21", str(y2)]
+
+
+def square(layer: str, size) -> list[str]:
+    corners = [(0, 0), (size, 0), (size, size), (0, size)]
+    groups = ["0", "LWPOLYLINE", "8", layer, "70", "1"]
+    for x, y in corners:
+        groups += ["10", str(x), "20", str(y)]
+    return groups
+
+
+def points(elements) -> list[tuple]:
+    return sorted((node.x, node.y) for element in elements for node in element.dependencies)
+
+
+def test_dxf_units_scale_to_centimetres_and_flip_y():
+    floor = Floor("Floor")
+    result = CadImporter().import_entities(DxfReader(dxf(line("Walls", 0, 0, 2, 3), units=6)), floor)
+
+    assert result.unit_scale == 100
+    assert result.walls == 1
+    assert points(floor.walls) == [(0, 0), (200, -300)]
+
+
+def test_unitless_dxf_is_read_as_millimetres():
+    floor = Floor("Floor")
+    CadImporter().import_entities(DxfReader(dxf(line("Walls", 0, 0, 1000, 0))), floor)
+
+    assert points(floor.walls) == [(0, 0), (100, 0)]
+
+
+def test_dxf_layers_map_to_element_types():
+    floor = Floor("Floor")
+    reader = DxfReader(dxf(
+        line("A-WALL", 0, 0, 10, 0),
+        square("Rooms", 10),
+        ["0", "TEXT", "8", "Labels", "10", "5", "20", "5", "1", "Lobby"],
+        line("Furniture", 0, 0, 1, 1),
+        ["0", "CIRCLE", "8", "Walls", "10", "0", "20", "0", "40", "1"],
+        units=5,
+    ))
+
+    result = CadImporter().import_entities(reader, floor)
+
+    assert (result.walls, result.zones, result.points_of_interest, result.skipped) == (1, 1, 1, 2)
+    assert [poi.name for poi in floor.points_of_interest] == ["Lobby"]
+    assert floor.zones[0].area == pytest.approx(100)
+    # the wall and the zone share the nodes they meet at
+    assert set(floor.walls[0].dependencies) <= set(floor.zones[0].corner_nodes)
+
+
+def test_explicit_mapping_and_unit_override():
+    floor = Floor("Floor")
+    mapping = LayerMapping({"Furniture": Wall, "A-WALL": None})
+    reader = DxfReader(dxf(line("A-WALL", 0, 0, 10, 0), line("Furniture", 0, 0, 1, 0), units=6))
+
+    result = CadImporter(mapping, unit_scale=2).import_entities(reader, floor)
+
+    assert (result.walls, result.skipped) == (1, 1)
+    assert points(floor.walls) == [(0, 0), (2, 0)]
+
+
+def test_svg_view_box_units_and_group_layers():
+    svg = b"""<svg xmlns="http://www.w3.org/2000/svg" width="10m" height="5m" viewBox="0 0 1000 500">
+      <g id="walls" transform="translate(10, 20)">
+        <line x1="0" y1="0" x2="100" y2="0"/>
+      </g>
+      <g id="rooms"><rect x="0" y="0" width="100" height="50"/></g>
+      <g id="ignored"><line x1="0" y1="0" x2="1" y2="1"/></g>
+    </svg>"""
+    floor = Floor("Floor")
+
+    result = CadImporter().import_entities(SvgReader(io.BytesIO(svg)), floor)
+
+    assert result.unit_scale == pytest.approx(1)
+    assert (result.walls, result.zones, result.skipped) == (1, 1, 1)
+    assert points(floor.walls) == [(10, 20), (110, 20)]
+    assert isinstance(floor.zones[0], Zone) and floor.zones[0].area == pytest.approx(5000)
+    assert not any(isinstance(element, PointOfInterest) for element in floor.elements)
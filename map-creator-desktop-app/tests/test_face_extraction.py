@@ -0,0 +1,61 @@
+import pytest
+
+from model import FaceExtractor, Floor, Node, Wall, Zone
+from model.zone_geometry import ZoneGeometry
+
+
+def add_walls(floor: Floor, *points):
+    # a point repeating the first one closes the loop on its node
+    nodes = [Node(x, y) for x, y in points]
+    if len(nodes) > 2 and points[-1] == points[0]:
+        nodes[-1] = nodes[0]
+    for start, end in zip(nodes, nodes[1:]):
+        floor.add(Wall(start, end))
+    return nodes
+
+
+def areas(faces) -> list[float]:
+    return sorted(ZoneGeometry(tuple((node.x, node.y) for node in face)).area for face in faces)
+
+
+def two_rooms() -> Floor:
+    # 20 x 10 outline split in two by a wall ending on the outline
+    floor = Floor("Floor")
+    add_walls(floor, (0, 0), (20, 0), (20, 10), (0, 10), (0, 0))
+    add_walls(floor, (10, 0), (10, 10))
+    return floor
+
+
+def test_adjacent_rooms_share_their_wall():
+    faces = FaceExtractor().extract(two_rooms())
+
+    assert areas(faces) == [pytest.approx(100), pytest.approx(100)]
+    shared = set(faces[0]) & set(faces[1])
+    assert sorted((node.x, node.y) for node in shared) == [(10, 0), (10, 10)]
+
+
+def test_faces_use_the_floors_nodes():
+    floor = two_rooms()
+    faces = FaceExtractor().extract(floor)
+
+    corners = {(node.x, node.y): node for node in floor.nodes}
+    for face in faces:
+        for node in face:
+            assert corners.get((node.x, node.y)) is node
+
+
+def test_rooms_with_a_zone_are_skipped():
+    floor = two_rooms()
+    floor.add(Zone([Node(0, 0), Node(10, 0), Node(10, 10), Node(0, 10)], "Left"))
+
+    assert areas(FaceExtractor().extract(floor)) == [pytest.approx(100)]
+    assert len(FaceExtractor().extract(floor, skip_zoned=False)) == 2
+
+
+def test_dead_ends_are_pruned_and_gaps_joined():
+    floor = Floor("Floor")
+    add_walls(floor, (0, 0), (40, 0), (40, 40), (0, 40), (0, 3))
+    add_walls(floor, (15, 20), (25, 20))
+
+    assert FaceExtractor(gap_tolerance=0).extract(floor) == []
+    assert areas(FaceExtractor(gap_tolerance=4).extract(floor)) == [pytest.approx(1600)]
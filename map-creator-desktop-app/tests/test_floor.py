@@ -0,0 +1,101 @@
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QUndoStack
+
+from commands import (
+    DeleteElementsCommand, MoveElementsCommand, SetFloorUnderlayCommand, WallAddCommand, ZoneAddCommand
+)
+from model import Floor, FloorUnderlay, Node, Point, Wall, Zone
+
+
+def test_delete_shared_node_and_undo():
+    floor = Floor("Floor")
+    corner = Node(0, 0)
+    wall = Wall(corner, Node(100, 0))
+    zone = Zone([corner, Node(0, 100), Node(100, 100)], "Room")
+    floor.add(wall)
+    floor.add(zone)
+
+    stack = QUndoStack()
+    stack.push(DeleteElementsCommand(floor, [corner]))
+
+    assert floor.walls == [] and floor.zones == []
+    assert corner not in floor.nodes
+
+    stack.undo()
+
+    assert floor.walls == [wall] and floor.zones == [zone]
+    assert corner in floor.nodes
+    assert corner.owners == {wall, zone}
+
+
+def test_removing_a_node_removes_its_owners():
+    floor = Floor("Floor")
+    corner = Node(0, 0)
+    wall = Wall(corner, Node(100, 0))
+    floor.add(wall)
+
+    floor.remove(corner)
+
+    assert floor.walls == []
+    assert floor.nodes == []
+
+
+def test_set_underlay_undo_redo():
+    floor = Floor("Floor")
+    floor.mark_saved(object())
+    assert not floor.is_dirty
+    plan = FloorUnderlay("plan.png", 400, 300, 0.5)
+
+    stack = QUndoStack()
+    stack.push(SetFloorUnderlayCommand(floor, plan))
+
+    assert floor.underlay is plan
+    assert floor.is_dirty
+
+    stack.push(SetFloorUnderlayCommand(floor, None))
+    assert floor.underlay is None
+
+    stack.undo()
+    assert floor.underlay is plan
+    stack.undo()
+    assert floor.underlay is None
+    stack.redo()
+    assert floor.underlay is plan
+
+
+def test_move_command_adopts_an_applied_drag():
+    floor = Floor("Floor")
+    wall = Wall(Node(0, 0), Node(100, 0))
+    floor.add(wall)
+    floor.translate([wall], 10, 20)
+
+    stack = QUndoStack()
+    stack.push(MoveElementsCommand([wall], QPointF(10, 20), applied=True))
+
+    assert (wall.start_node.x, wall.start_node.y) == (10, 20)
+
+    stack.undo()
+    assert (wall.start_node.x, wall.start_node.y) == (0, 0)
+
+    stack.redo()
+    assert (wall.end_node.x, wall.end_node.y) == (110, 20)
+
+
+def test_add_commands_own_snapped_nodes_only_while_applied():
+    floor = Floor("Floor")
+    wall = Wall(Node(0, 0), Node(100, 0))
+    floor.add(wall)
+    corner = wall.end_node
+
+    wall_cmd = WallAddCommand(floor, Point(100, 0), Point(100, 100), snap_distance=1)
+    zone_cmd = ZoneAddCommand(floor, [Point(100, 0), Point(200, 0), Point(200, 100)], snap_distance=1)
+    assert corner.owners == {wall}
+
+    stack = QUndoStack()
+    stack.push(wall_cmd)
+    stack.push(zone_cmd)
+    assert len(corner.owners) == 3
+
+    stack.undo()
+    stack.undo()
+    assert corner.owners == {wall}
@@ -0,0 +1,69 @@
+from model import Floor, Node, Wall
+
+
+def record(floor: Floor) -> list:
+    events = []
+    floor.item_added.connect(lambda element: events.append(("added", element)))
+    floor.item_removed.connect(lambda element: events.append(("removed", element)))
+    floor.items_added.connect(lambda elements: events.append(("items_added", list(elements))))
+    floor.items_removed.connect(lambda elements: events.append(("items_removed", list(elements))))
+    floor.elements_updated.connect(lambda elements: events.append(("updated", set(elements))))
+    return events
+
+
+def test_batch_emits_once_at_the_end():
+    floor = Floor("Floor")
+    events = record(floor)
+    walls = [Wall(Node(i, 0), Node(i, 10)) for i in range(3)]
+
+    with floor.batch():
+        for wall in walls:
+            floor.add(wall)
+        assert events == []
+
+    assert len(events) == 1
+    kind, added = events[0]
+    assert kind == "items_added"
+    assert set(added) == set(walls) | {node for wall in walls for node in wall.dependencies}
+
+
+def test_nested_batches_emit_with_the_outermost():
+    floor = Floor("Floor")
+    events = record(floor)
+    node = Node(0, 0)
+
+    with floor.batch():
+        with floor.batch():
+            floor.add(node)
+        assert events == []
+
+    assert events == [("items_added", [node])]
+
+
+def test_add_then_remove_in_a_batch_emits_nothing():
+    floor = Floor("Floor")
+    events = record(floor)
+    revision = floor.revision
+    node = Node(0, 0)
+
+    with floor.batch():
+        floor.add(node)
+        floor.remove(node)
+
+    assert events == []
+    assert floor.revision == revision
+
+
+def test_remove_and_add_back_becomes_an_update():
+    floor = Floor("Floor")
+    wall = Wall(Node(0, 0), Node(10, 0))
+    floor.add(wall)
+    events = record(floor)
+
+    with floor.batch():
+        floor.remove(wall)
+        floor.add(wall)
+        floor.translate([wall], 5, 0)
+
+    assert events == [("updated", {wall, wall.start_node, wall.end_node})]
+    assert floor.is_dirty
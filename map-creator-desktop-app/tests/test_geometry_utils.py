@@ -0,0 +1,101 @@
+import math
+import random
+
+import pytest
+
+from model.spatial_index import segments_intersect
+from utils.geometry_utils import PolylineIndex, find_self_intersection
+
+
+# Every pair of segments, with the same rules as the sweep: consecutive
+# segments may only share their common vertex
+def brute_force_conflicts(points, closed):
+    count = len(points)
+    segment_count = count if closed and count > 2 else count - 1
+
+    def folds_back(a, shared, b):
+        cross = (shared[0] - a[0]) * (b[1] - a[1]) - (shared[1] - a[1]) * (b[0] - a[0])
+        dot = (a[0] - shared[0]) * (b[0] - shared[0]) + (a[1] - shared[1]) * (b[1] - shared[1])
+        return cross == 0 and dot > 0
+
+    conflicts = set()
+    for a in range(segment_count):
+        for b in range(a + 1, segment_count):
+            if b == a + 1:
+                found = folds_back(points[a], points[b], points[(b + 1) % count])
+            elif closed and a == 0 and b == segment_count - 1:
+                found = folds_back(points[1], points[0], points[b])
+            else:
+                found = segments_intersect(*points[a], *points[a + 1], *points[b], *points[(b + 1) % count])
+            if found:
+                conflicts.add((a, b))
+    return conflicts
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("grid", [2, 4, 20])
+def test_sweep_matches_brute_force(closed, grid):
+    # Small grids give many repeated points, collinear and vertical edges
+    rng = random.Random(grid * 2 + closed)
+    for _ in range(3000):
+        points = [(float(rng.randint(0, grid)), float(rng.randint(0, grid))) for _ in range(rng.randint(2, 9))]
+
+        found = find_self_intersection(points, closed)
+        conflicts = brute_force_conflicts(points, closed)
+
+        if conflicts:
+            assert found in conflicts, points
+        else:
+            assert found is None, points
+
+
+def test_sweep_matches_brute_force_on_random_floats():
+    rng = random.Random(7)
+    for _ in range(2000):
+        points = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(rng.randint(3, 12))]
+
+        found = find_self_intersection(points, closed=True)
+        conflicts = brute_force_conflicts(points, closed=True)
+
+        assert (found is None) == (not conflicts)
+        if found is not None:
+            assert found in conflicts
+
+
+def test_repeated_point_touches():
+    square_with_spike = [(0, 0), (4, 0), (4, 4), (2, 4), (2, 2), (2, 4), (0, 4)]
+    assert find_self_intersection(square_with_spike, closed=True) is not None
+
+    figure_eight = [(0, 0), (2, 2), (4, 0), (4, 4), (2, 2), (0, 4)]
+    assert find_self_intersection(figure_eight, closed=True) is not None
+
+
+def test_large_simple_polygon():
+    count = 5000
+    star = [
+        ((1 + i % 2) * math.cos(2 * math.pi * i / count), (1 + i % 2) * math.sin(2 * math.pi * i / count))
+        for i in range(count)
+    ]
+    assert find_self_intersection(star, closed=True) is None
+
+    star[count // 2] = (3.0, 0.0)
+    assert find_self_intersection(star, closed=True) is not None
+
+
+def test_polyline_index_matches_sweep():
+    rng = random.Random(3)
+    for _ in range(500):
+        index = PolylineIndex(cell_size=2)
+        points = []
+        for _ in range(rng.randint(1, 8)):
+            point = (float(rng.randint(0, 6)), float(rng.randint(0, 6)))
+            extended = points + [point]
+            valid = point != (points[-1] if points else None) and find_self_intersection(extended) is None
+            if len(points) >= 3 and point == points[0]:
+                valid = find_self_intersection(points, closed=True) is None
+
+            assert index.can_extend_to(point) == valid, extended
+            if not valid:
+                break
+            index.append(point)
+            points.append(point)
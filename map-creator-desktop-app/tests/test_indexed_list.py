@@ -0,0 +1,58 @@
+from model import IndexedList, Node
+
+
+def test_removal_keeps_order_and_uuid_lookup():
+    nodes = [Node(i, 0) for i in range(6)]
+    items = IndexedList(nodes)
+
+    items.remove(nodes[1])
+    items.remove(nodes[4])
+
+    assert list(items) == [nodes[0], nodes[2], nodes[3], nodes[5]]
+    assert len(items) == 4
+    assert nodes[1] not in items
+    assert items.get(nodes[1].uuid) is None
+    assert items.get(nodes[5].uuid) is nodes[5]
+    assert items.index(nodes[5]) == 3
+    assert items[-1] is nodes[5]
+
+
+def test_compacts_once_half_are_holes():
+    nodes = [Node(i, 0) for i in range(10)]
+    items = IndexedList(nodes)
+
+    for node in nodes[:5]:
+        items.remove(node)
+    assert len(items._items) == 10
+
+    items.remove(nodes[5])
+
+    assert len(items._items) == 4
+    assert [items.index(node) for node in nodes[6:]] == [0, 1, 2, 3]
+
+
+def test_iterating_while_removing_visits_the_rest():
+    nodes = [Node(i, 0) for i in range(8)]
+    items = IndexedList(nodes)
+
+    seen = []
+    for node in items:
+        seen.append(node)
+        items.remove(node)
+
+    assert seen == nodes
+    assert len(items) == 0
+
+
+def test_duplicates_are_ignored_and_removed_elements_can_return():
+    node = Node(0, 0)
+    items = IndexedList()
+
+    assert items.append(node)
+    assert not items.append(node)
+    assert items.remove(node)
+    assert not items.remove(node)
+    assert items.append(node)
+
+    assert items == [node]
+    assert items.get(node.uuid) is node
@@ -0,0 +1,48 @@
+import io
+import json
+
+from utils.json_stream import JsonStreamReader
+
+
+def read_document(reader: JsonStreamReader) -> dict:
+    data = {}
+    for key in reader.iter_object():
+        data[key] = reader.read_value()
+    return data
+
+
+def test_values_across_chunks():
+    document = {
+        "name": "Ünïcødé floor ☃",
+        "walls": [{"id": i, "x": i * 0.25, "label": "wall ✓" * (i % 3)} for i in range(2000)],
+        "count": 123456789,
+    }
+
+    reader = JsonStreamReader(io.BytesIO(json.dumps(document, ensure_ascii=False).encode("utf-8")), chunk_size=7)
+
+    assert read_document(reader) == document
+
+
+def test_progress_reaches_file_size(tmp_path):
+    path = tmp_path / "floor.json"
+    document = {"names": ["Küche", "Büro", "Straße", "会议室"] * 500}
+    path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+
+    progress = []
+    with open(path, "rb") as f:
+        reader = JsonStreamReader(f, chunk_size=64, progress=lambda done, total: progress.append((done, total)))
+        assert read_document(reader) == document
+
+    size = path.stat().st_size
+    assert progress[-1] == (size, size)
+    assert all(done <= total for done, total in progress)
+
+
+def test_array_elements():
+    reader = JsonStreamReader(io.BytesIO(b'[1, {"a": [2, 3]}, "x"]'), chunk_size=3)
+
+    values = []
+    for _ in reader.iter_array():
+        values.append(reader.read_value())
+
+    assert values == [1, {"a": [2, 3]}, "x"]
@@ -0,0 +1,81 @@
+import pytest
+
+from PySide6.QtWidgets import QGraphicsScene
+
+from model import Point, PointOfInterest
+from view import LevelOfDetail, PointOfInterestGraphicsItem
+
+
+# Points of interest report their moves to their scene's level_of_detail
+class Scene(QGraphicsScene):
+    def __init__(self):
+        super().__init__()
+        self.level_of_detail = LevelOfDetail(self)
+
+
+@pytest.fixture
+def scene(qapp):
+    return Scene()
+
+
+def add_points(scene: Scene, *positions) -> list[PointOfInterest]:
+    points = [PointOfInterest(Point(x, y), f"Point {i}") for i, (x, y) in enumerate(positions)]
+    items = [PointOfInterestGraphicsItem(point) for point in points]
+    for item in items:
+        scene.addItem(item)
+    scene.level_of_detail.add_items(items)
+    return points
+
+
+def counts(scene: Scene) -> list[int]:
+    return sorted(marker.count for marker in scene.level_of_detail.markers)
+
+
+def test_close_points_cluster_when_zoomed_out(scene):
+    lod = scene.level_of_detail
+    add_points(scene, (0, 0), (5, 0), (10, 5), (5000, 5000))
+
+    assert counts(scene) == []
+
+    lod.set_zoom(lod.cluster_max_zoom / 4)
+
+    assert lod.is_clustering
+    assert counts(scene) == [3]
+
+
+def test_moved_points_leave_and_join_clusters(scene):
+    lod = scene.level_of_detail
+    points = add_points(scene, (0, 0), (5, 0), (10, 5), (5000, 5000))
+    lod.set_zoom(lod.cluster_max_zoom / 4)
+
+    points[0].position = Point(5000, 5005)
+    assert counts(scene) == [2, 2]
+
+    points[1].position = Point(5005, 5000)
+    assert counts(scene) == [3]
+
+    points[2].position = Point(-5000, 0)
+    assert counts(scene) == [3]
+
+
+def test_marker_follows_points_within_their_cell(scene):
+    lod = scene.level_of_detail
+    points = add_points(scene, (1, 1), (3, 3))
+    lod.set_zoom(lod.cluster_max_zoom / 4)
+    marker = lod.markers[0]
+
+    points[1].position = Point(5, 5)
+
+    assert lod.markers == [marker]
+    assert (marker.x(), marker.y()) == (3, 3)
+
+
+def test_zooming_back_in_shows_every_point(scene):
+    lod = scene.level_of_detail
+    add_points(scene, (0, 0), (5, 0))
+    lod.set_zoom(lod.cluster_max_zoom / 4)
+
+    lod.set_zoom(1.0)
+
+    assert counts(scene) == []
+    assert all(item.isVisible() for item in scene.items() if isinstance(item, PointOfInterestGraphicsItem))
@@ -0,0 +1,52 @@
+from model import Floor, Node, Point, Wall, Zone
+
+
+def test_queries_follow_moved_nodes():
+    floor = Floor("Floor")
+    wall = Wall(Node(0, 0), Node(100, 0))
+    zone = Zone([Node(0, 10), Node(50, 10), Node(50, 60), Node(0, 60)], "Room")
+    floor.add(wall)
+    floor.add(zone)
+    index = floor.spatial_index
+
+    assert index.nearest_node(Point(101, 1)) is wall.end_node
+    assert index.zone_at(Point(25, 30)) is zone
+
+    floor.translate([wall], 1000, 1000)
+    wall.start_node.position = Point(500, 500)
+    floor.translate([zone], 300, 0)
+
+    assert index.nearest_node(Point(101, 1)) is not wall.end_node
+    assert index.nearest_node(Point(1099, 1001)) is wall.end_node
+    assert index.nearest_node(Point(501, 499), 5) is wall.start_node
+    assert index.zone_at(Point(25, 30)) is None
+    assert index.zone_at(Point(325, 30)) is zone
+    assert index.elements_in_rect(0, -10, 200, 10, [Wall]) == []
+    assert index.walls_crossing(Point(800, 0), Point(800, 2000)) == [wall]
+
+
+def test_removed_elements_leave_the_index():
+    floor = Floor("Floor")
+    wall = Wall(Node(0, 0), Node(100, 0))
+    other = Wall(Node(0, 50), Node(100, 50))
+    floor.add(wall)
+    floor.add(other)
+    index = floor.spatial_index
+
+    floor.remove(wall)
+
+    assert index.nearest_node(Point(0, 0)) is other.start_node
+    assert index.elements_in_rect(-1, -1, 101, 1) == []
+    assert index.walls_crossing(Point(50, -10), Point(50, 100)) == [other]
+
+    floor.remove(other)
+    assert index.nearest_node(Point(0, 0)) is None
+
+
+def test_nearest_node_respects_max_distance():
+    floor = Floor("Floor")
+    node = Node(0, 0)
+    floor.add(node)
+
+    assert floor.spatial_index.nearest_node(Point(3, 4), 5) is node
+    assert floor.spatial_index.nearest_node(Point(3, 4), 4.9) is None
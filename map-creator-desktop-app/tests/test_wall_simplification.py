@@ -0,0 +1,102 @@
+import json
+
+from PySide6.QtGui import QUndoStack
+
+from commands import SimplifyWallsCommand
+from model import Building, Floor, Node, Wall, WallSimplifier, Zone
+
+
+def add_wall(floor: Floor, x1, y1, x2, y2) -> Wall:
+    wall = Wall(Node(x1, y1), Node(x2, y2))
+    floor.add(wall)
+    return wall
+
+
+def segments(floor: Floor) -> list[tuple]:
+    return sorted(
+        tuple(sorted(((wall.start_node.x, wall.start_node.y), (wall.end_node.x, wall.end_node.y))))
+        for wall in floor.walls
+    )
+
+
+def simplify(floor: Floor, tolerance: float = 1.0) -> SimplifyWallsCommand:
+    cmd = SimplifyWallsCommand(floor, WallSimplifier(tolerance))
+    QUndoStack().push(cmd)
+    return cmd
+
+
+def test_collinear_walls_merge_into_one():
+    floor = Floor("Floor")
+    first = add_wall(floor, 0, 0, 100, 0)
+    second = Wall(first.end_node, Node(200, 0))
+    floor.add(second)
+
+    cmd = simplify(floor)
+
+    assert segments(floor) == [((0, 0), (200, 0))]
+    assert (cmd.removed_walls, cmd.removed_nodes) == (1, 1)
+
+
+def test_overlapping_duplicates_collapse():
+    floor = Floor("Floor")
+    add_wall(floor, 0, 0, 100, 0)
+    add_wall(floor, 0, 0, 100, 0)
+    add_wall(floor, 50, 0, 150, 0)
+
+    simplify(floor)
+
+    assert segments(floor) == [((0, 0), (150, 0))]
+    assert len(floor.nodes) == 2
+
+
+def test_near_ends_snap_and_micro_walls_go():
+    floor = Floor("Floor")
+    add_wall(floor, 0, 0, 100, 0)
+    add_wall(floor, 100.4, 0.3, 100, 100)
+    add_wall(floor, 100, 100, 100.5, 100.2)
+
+    simplify(floor)
+
+    assert len(floor.walls) == 2
+    assert len(floor.nodes) == 3
+    corner = floor.walls[0].end_node
+    assert floor.walls[1].start_node is corner or floor.walls[1].end_node is corner
+
+
+def test_used_nodes_keep_walls_apart_and_undo_restores():
+    floor = Floor("Floor")
+    first = add_wall(floor, 0, 0, 100, 0)
+    second = Wall(first.end_node, Node(200, 0))
+    floor.add(second)
+    floor.add(Wall(first.end_node, Node(100, 100)))
+    floor.add(Zone([first.start_node, Node(0, -50), Node(-50, -50)], "Room"))
+    before = segments(floor)
+
+    stack = QUndoStack()
+    stack.push(SimplifyWallsCommand(floor, WallSimplifier(1.0)))
+    assert segments(floor) == before
+
+    add_wall(floor, 200.3, 0, 300, 0)
+    stack.push(SimplifyWallsCommand(floor, WallSimplifier(1.0)))
+    after = segments(floor)
+    assert ((100, 0), (300, 0)) in after
+
+    stack.undo()
+    assert len(floor.walls) == 4
+    stack.redo()
+    assert segments(floor) == after
+
+
+def test_reported_size_matches_the_saved_file():
+    building = Building()
+    floor = Floor("Floor")
+    building.add_floor(floor)
+    for x in range(0, 1000, 50):
+        add_wall(floor, x, 0, x + 50, 0)
+        add_wall(floor, x + 0.2, 10, x + 50, 10)
+
+    size_before = len(json.dumps(building.to_dict(), indent=4))
+    cmd = simplify(floor)
+
+    assert cmd.removed_walls == 38
+    assert cmd.removed_bytes == size_before - len(json.dumps(building.to_dict(), indent=4))
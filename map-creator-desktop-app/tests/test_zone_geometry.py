@@ -0,0 +1,64 @@
+import pytest
+
+from model import Floor, Node, Point, Zone
+
+
+def square_zone(floor: Floor) -> Zone:
+    zone = Zone([Node(0, 0), Node(10, 0), Node(10, 10), Node(0, 10)], "Room")
+    floor.add(zone)
+    return zone
+
+
+def test_geometry_is_kept_until_a_corner_moves():
+    floor = Floor("Floor")
+    zone = square_zone(floor)
+    geometry = zone.geometry
+
+    assert geometry.area == pytest.approx(100)
+    assert geometry.bounds == (0, 0, 10, 10)
+    assert zone.geometry is geometry
+
+    zone.name = "Renamed"
+    assert zone.geometry is geometry
+
+    zone.corner_nodes[2].position = Point(20, 10)
+
+    assert zone.geometry is not geometry
+    assert zone.area == pytest.approx(150)
+    assert zone.bounds == (0, 0, 20, 10)
+
+
+def test_translating_the_floor_invalidates_owners():
+    floor = Floor("Floor")
+    zone = square_zone(floor)
+    geometry = zone.geometry
+
+    floor.translate([zone.corner_nodes[0]], -10, 0)
+
+    assert zone.geometry is not geometry
+    assert zone.bounds == (-10, 0, 10, 10)
+
+
+def test_replacing_a_corner_invalidates():
+    floor = Floor("Floor")
+    zone = square_zone(floor)
+    geometry = zone.geometry
+    old = zone.corner_nodes[1]
+    new = Node(20, 0)
+
+    zone.replace_node(old, new)
+
+    assert zone.geometry is not geometry
+    assert zone.bounds == (0, 0, 20, 10)
+    assert zone not in old.owners and zone in new.owners
+
+
+def test_centroid_and_perimeter():
+    floor = Floor("Floor")
+    zone = Zone([Node(0, 0), Node(30, 0), Node(0, 30)], "Triangle")
+    floor.add(zone)
+
+    assert zone.perimeter == pytest.approx(60 + 30 * 2 ** 0.5)
+    assert zone.geometry.centroid.x() == pytest.approx(10)
+    assert zone.geometry.centroid.y() == pytest.approx(10)
+    assert zone.position.x() == pytest.approx(10)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from PySide6.QtGui import QTransform
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QPointF
 from PySide6.QtWidgets import QGraphicsScene
 
 from .tool import Tool
@@ -23,11 +23,11 @@ class SelectTool(Tool):
 
         self._selected_models = set()
         self._movables_start_pos = dict()
+        self._applied_delta = QPointF()
 
     def deactivate(self):
         if self._is_dragging:
-            for model, pos in self._movables_start_pos.items():
-                model.position = pos
+            self._move_dragged(QPointF())
         
         self.clear_selection()
         self._reset_dragging()
@@ -64,9 +64,7 @@ class SelectTool(Tool):
             delta = pos - self._start_pos
             delta = self._controller.snap_to_grid(delta)
 
-            for model in self._movables_start_pos.keys():
-                model.position = self._movables_start_pos[model]
-                model.moveBy(delta)
+            self._move_dragged(delta)
                 
     def mouse_release(self, pos):
         if self._is_dragging and self._movables_start_pos:
@@ -74,12 +72,13 @@ class SelectTool(Tool):
             delta = self._controller.snap_to_grid(delta)
 
             if delta.manhattanLength() > 0.1:
-                for model, pos in self._movables_start_pos.items():
-                    model.position = pos
-                    pos = pos + delta
+                self._move_dragged(delta)
 
-                cmd = MoveElementsCommand([x for x in self._movables_start_pos.keys()], delta)
+                # the drag already moved the elements, the command adopts that offset
+                cmd = MoveElementsCommand([x for x in self._movables_start_pos.keys()], delta, applied=True)
                 self._controller.execute(cmd)
+            else:
+                self._move_dragged(QPointF())
                 
         else:
             self.clear_selection()
@@ -94,11 +93,21 @@ class SelectTool(Tool):
 
             self._reset_dragging()
 
+    def _move_dragged(self, delta: QPointF):
+        # one vectorized step from the last applied offset
+        step = delta - self._applied_delta
+        if step.isNull():
+            return
+
+        self._controller.current_floor.translate(list(self._movables_start_pos.keys()), step.x(), step.y())
+        self._applied_delta = delta
+
     def _reset_dragging(self):
         self._is_dragging = False
         self._start_pos = None
         self._start_pos = None
         self._last_pos = None
+        self._applied_delta = QPointF()
         self._reference_movable = None
 
     def clear_selection(self):
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import QGraphicsScene
 from .tool import Tool
 from view import WallPreview
 from commands import WallAddCommand
+from constants import NODE_SNAP_DISTANCE
 
 if TYPE_CHECKING:
     from main_map_controller import MainMapController
@@ -30,7 +31,8 @@ class WallAddTool(Tool):
         if self._start_point is None:
             self._start_point = pos
         else:
-            command = WallAddCommand(self._controller.current_floor, self._start_point, pos)
+            command = WallAddCommand(self._controller.current_floor, self._start_point, pos,
+                                     NODE_SNAP_DISTANCE)
             self._controller.execute(command)
             self.deactivate()
 
@@ -5,11 +5,12 @@ from PySide6.QtCore import QPointF
 from PySide6.QtWidgets import QGraphicsScene
 
 from utils.general import ask_zone_name
-import utils.geometry_utils as geo
+from utils.geometry_utils import PolylineIndex
 
 from .tool import Tool
 from view import ZonePreview
 from commands import ZoneAddCommand
+from constants import NODE_SNAP_DISTANCE
 
 if TYPE_CHECKING:
     from main_map_controller import MainMapController
@@ -21,10 +22,15 @@ class ZoneAddTool(Tool):
         super().__init__(presenter, scene)
         self._corner_points = []
 
+        # Placed edges, so the rubber band is checked against the few
+        # edges near it rather than all of them on every mouse move
+        self._outline = PolylineIndex()
+
         self._preview = ZonePreview(scene)
 
     def deactivate(self):
         self._corner_points = []
+        self._outline.clear()
         self._preview.clear()
 
     def mouse_click(self, pos, modifier=None):
@@ -35,12 +41,14 @@ class ZoneAddTool(Tool):
         
         if len(self._corner_points) == 0 or pos != self._corner_points[0]:
             self._corner_points.append(pos)
+            self._outline.append((pos.x(), pos.y()))
         else:
             name, zone_type = ask_zone_name("New Zone")
             if name is None or zone_type is None:
                 return
 
-            cmd = ZoneAddCommand(self._controller.current_floor, self._corner_points, name.strip(), zone_type)
+            cmd = ZoneAddCommand(self._controller.current_floor, self._corner_points, name.strip(), zone_type,
+                                 NODE_SNAP_DISTANCE)
             self._controller.execute(cmd)
             self.deactivate()
 
@@ -49,11 +57,4 @@ class ZoneAddTool(Tool):
         self._preview.update_preview(self._corner_points, pos, self._is_polygon_valid(pos))
 
     def _is_polygon_valid(self, new_point: QPointF) -> bool:
-        if len(self._corner_points) < 1:
-            return True
-
-        start = self._corner_points[0]
-        intersection = geo.get_self_intersetion(self._corner_points + [new_point])
-        if intersection == start and len(self._corner_points) >= 3 and new_point == start:
-            return True
-        return intersection is None
+        return self._outline.can_extend_to((new_point.x(), new_point.y()))
@@ -1,12 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from PySide6.QtGui import QTransform
-
 from cad_scene import InteractiveScene
 
 from .tool import Tool
-from model import Zone
 
 from view import HighlightPreview
 from widgets import ManageZoneConnectionDialog
@@ -23,18 +20,18 @@ class ZoneConnectTool(Tool):
         self._highlight_preview = HighlightPreview()
 
     def mouse_click(self, pos, modifier=None):
-        item = self._scene.itemAt(pos, QTransform())
-        el = self._controller.get_model_for_item(item)
+        zone = self._controller.current_floor.spatial_index.zone_at(pos)
 
-        if type(el) == Zone:
+        if zone is not None:
             parent = self._scene.views()[0] if self._scene.views() else None
-            window = ManageZoneConnectionDialog(self._controller, el, parent)
+            window = ManageZoneConnectionDialog(self._controller, zone, parent)
             window.show()
     
     def mouse_move(self, pos):
-        item = self._scene.itemAt(pos, QTransform())
+        zone = self._controller.current_floor.spatial_index.zone_at(pos)
+        item = self._controller.get_item_for_model(zone) if zone is not None else None
 
-        if type(self._controller.get_model_for_item(item)) == Zone:
+        if item is not None:
             self._highlight_preview.update_preview(item)
         else:
             self._highlight_preview.clear()
\ No newline at end of file
@@ -0,0 +1,530 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import threading
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import numpy as np
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Qt, QRect, QRectF, QStandardPaths
+from PySide6.QtGui import QImage, QImageIOHandler, QImageReader, QPainter, QPixmap
+
+from model import FloorUnderlay
+
+# Floor plan images are far too big to draw, or even to keep decoded. On
+# import they are cut into a pyramid of TILE_SIZE tiles cached on disk:
+# level 0 at full resolution, every next level at half the one before,
+# down to a level that fits in a single tile.
+#
+#   <cache>/underlays/<key>/index.json
+#   <cache>/underlays/<key>/<level>/<column>_<row>.png
+#
+# The key hashes the image's path, size and modification time, so an edited
+# image gets a new pyramid. Only the tiles in view, at the level matching the
+# zoom, are decoded (on a worker thread) and kept in an LRU of pixmaps.
+
+TILE_SIZE = 256
+INDEX_FILE = "index.json"
+
+# Decoded (ARGB32) size above which images are read in strips
+STRIP_BYTES = 256 * 1024 * 1024
+
+_allocation_limit_lock = threading.Lock()
+
+
+class TilePyramid:
+    def __init__(self, directory: str, width: int, height: int, levels: int, tile_size: int = TILE_SIZE):
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.levels = levels
+        self.tile_size = tile_size
+
+    @staticmethod
+    def cache_root() -> str:
+        return os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "underlays")
+
+    @staticmethod
+    def directory_for(image_path: str, cache_root: str = None) -> str:
+        image_path = os.path.abspath(image_path)
+        stat = os.stat(image_path)
+        key = hashlib.sha1(f"{image_path}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")).hexdigest()
+        return os.path.join(cache_root or TilePyramid.cache_root(), key)
+
+    @classmethod
+    def open(cls, image_path: str, cache_root: str = None) -> "TilePyramid | None":
+        # None until the pyramid of the image as it is now has been built
+        try:
+            directory = cls.directory_for(image_path, cache_root)
+            with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return cls(directory, index["width"], index["height"], index["levels"], index["tile_size"])
+
+    @staticmethod
+    def level_count(width: int, height: int, tile_size: int = TILE_SIZE) -> int:
+        return max(1, math.ceil(math.log2(max(width, height) / tile_size)) + 1)
+
+    def level_size(self, level: int) -> tuple[int, int]:
+        factor = 1 << level
+        return math.ceil(self.width / factor), math.ceil(self.height / factor)
+
+    def tile_grid(self, level: int) -> tuple[int, int]:
+        width, height = self.level_size(level)
+        return math.ceil(width / self.tile_size), math.ceil(height / self.tile_size)
+
+    def tile_path(self, level: int, column: int, row: int) -> str:
+        return os.path.join(self.directory, str(level), f"{column}_{row}.png")
+
+
+def build_pyramid(image_path: str,
+                  cache_root: str = None,
+                  progress: Callable[[int, int], None] = None,
+                  cancelled: Callable[[], bool] = None) -> TilePyramid:
+    directory = TilePyramid.directory_for(image_path, cache_root)
+
+    layout = _strip_layout(image_path)
+    if layout is not None:
+        width, height, strip_height = layout
+        strips = (
+            read_image(image_path, QRect(0, top, width, min(strip_height, height - top)))
+            for top in range(0, height, strip_height)
+        )
+    else:
+        image = read_image(image_path)
+        width, height = image.width(), image.height()
+        strips = iter([image])
+        del image
+
+    pyramid = TilePyramid(directory + ".partial", width, height, TilePyramid.level_count(width, height))
+    size = pyramid.tile_size
+
+    total = sum(columns * rows for columns, rows in map(pyramid.tile_grid, range(pyramid.levels)))
+    done = 0
+
+    shutil.rmtree(pyramid.directory, ignore_errors=True)
+    for level in range(pyramid.levels):
+        os.makedirs(os.path.join(pyramid.directory, str(level)))
+
+    # Encoding tiles leaves the interpreter, so they are written in parallel.
+    # Only a few tile copies wait for a worker at a time.
+    workers = os.cpu_count() or 1
+    pending = deque()
+
+    def save_tiles(image: QImage, level: int, first_row: int):
+        nonlocal done
+        columns, _ = pyramid.tile_grid(level)
+        for row in range(math.ceil(image.height() / size)):
+            for column in range(columns):
+                if cancelled is not None and cancelled():
+                    raise PyramidBuildCancelled()
+
+                if len(pending) >= workers * 2:
+                    pending.popleft().result()
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+
+                pending.append(executor.submit(_save_tile, image.copy(QRect(column * size, row * size, size, size)),
+                                               pyramid.tile_path(level, column, first_row + row)))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Level 0 one strip at a time, each strip scaled into level 1
+            image = None
+            if pyramid.levels > 1:
+                image = QImage(*pyramid.level_size(1), QImage.Format_ARGB32_Premultiplied)
+                painter = QPainter(image)
+                painter.setCompositionMode(QPainter.CompositionMode_Source)
+
+            try:
+                top = 0
+                for strip in strips:
+                    strip = strip.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+                    save_tiles(strip, 0, top // size)
+
+                    if image is not None:
+                        painter.drawImage(0, top // 2, strip.scaled(math.ceil(strip.width() / 2),
+                                                                    math.ceil(strip.height() / 2),
+                                                                    Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+                    top += strip.height()
+                    del strip
+            finally:
+                if image is not None:
+                    painter.end()
+
+            for level in range(1, pyramid.levels):
+                save_tiles(image, level, 0)
+                if level + 1 < pyramid.levels:
+                    next_width, next_height = pyramid.level_size(level + 1)
+                    image = image.scaled(next_width, next_height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+            while pending:
+                pending.popleft().result()
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    except PyramidBuildCancelled:
+        shutil.rmtree(pyramid.directory, ignore_errors=True)
+        raise
+
+    with open(os.path.join(pyramid.directory, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "width": width,
+            "height": height,
+            "levels": pyramid.levels,
+            "tile_size": pyramid.tile_size,
+        }, f)
+
+    # Readers only ever see complete pyramids
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(pyramid.directory, directory)
+    pyramid.directory = directory
+    return pyramid
+
+def _strip_layout(image_path: str) -> tuple[int, int, int] | None:
+    # Images too big to decode at once are read in strips of whole tile rows
+    # where the format can decode just a part. Each strip still decodes the
+    # file up to it, so strips are as tall as the budget allows.
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if (not size.isValid()
+            or not reader.supportsOption(QImageIOHandler.ClipRect)
+            or reader.transformation() != QImageIOHandler.TransformationNone):
+        return None
+
+    rows = STRIP_BYTES // (4 * size.width()) // TILE_SIZE * TILE_SIZE
+    if rows >= size.height():
+        return None
+    return size.width(), size.height(), max(TILE_SIZE, rows)
+
+def read_image(image_path: str, clip: QRect = None) -> QImage:
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    if clip is not None:
+        reader.setClipRect(clip)
+
+    # The default allocation limit refuses anything like a 20k x 20k plan,
+    # which is only decoded in full to tile or trace it. The limit is global,
+    # so it is lifted for one read at a time.
+    with _allocation_limit_lock:
+        limit = QImageReader.allocationLimit()
+        QImageReader.setAllocationLimit(0)
+        try:
+            image = reader.read()
+        finally:
+            QImageReader.setAllocationLimit(limit)
+
+    if image.isNull():
+        raise ValueError(f"Can't read image {image_path}: {reader.errorString()}")
+    return image
+
+def read_grayscale(image_path: str) -> np.ndarray:
+    image = read_image(image_path).convertToFormat(QImage.Format_Grayscale8)
+    rows = np.frombuffer(image.constBits(), np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width()].copy()
+
+def _save_tile(tile: QImage, path: str):
+    if not tile.save(path, "PNG"):
+        raise OSError(f"Can't write tile {path}")
+
+
+class PyramidBuildCancelled(Exception):
+    pass
+
+
+# ------------------------------------
+# ------- Background building --------
+# ------------------------------------
+class _BuildTaskSignals(QObject):
+    progress = Signal(str, int, int)
+    finished = Signal(object, str, object)
+    failed = Signal(object, str, str)
+
+class _BuildTask(QRunnable):
+    def __init__(self, image_path: str, cache_root: str):
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.image_path = image_path
+        self.cache_root = cache_root
+        self.cancelled = False
+        self.signals = _BuildTaskSignals()
+
+    def run(self):
+        try:
+            pyramid = build_pyramid(
+                self.image_path,
+                self.cache_root,
+                progress=lambda done, total: self.signals.progress.emit(self.image_path, done, total),
+                cancelled=lambda: self.cancelled,
+            )
+        except PyramidBuildCancelled:
+            self.signals.finished.emit(self, self.image_path, None)
+            return
+        except Exception as e:
+            self.signals.failed.emit(self, self.image_path, str(e))
+            return
+
+        self.signals.finished.emit(self, self.image_path, pyramid)
+
+class PyramidBuilder(QObject):
+    progress = Signal(str, int, int)
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+
+    def __init__(self, cache_root: str = None, parent=None):
+        super().__init__(parent)
+        self._cache_root = cache_root
+        self._tasks: dict[str, _BuildTask] = {}
+
+        # One image at a time, each build already uses every core
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    def is_building(self, image_path: str) -> bool:
+        return image_path in self._tasks
+
+    def build(self, image_path: str):
+        if image_path in self._tasks:
+            return
+
+        task = _BuildTask(image_path, self._cache_root)
+        task.signals.progress.connect(self.progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+
+        self._tasks[image_path] = task
+        self._pool.start(task)
+
+    def cancel_all(self):
+        for task in self._tasks.values():
+            task.cancelled = True
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_finished(self, task: _BuildTask, image_path: str, pyramid: TilePyramid):
+        self._tasks.pop(image_path, None)
+        if pyramid is not None:
+            self.finished.emit(image_path, pyramid)
+
+    def _on_failed(self, task: _BuildTask, image_path: str, error: str):
+        self._tasks.pop(image_path, None)
+        self.failed.emit(image_path, error)
+
+
+# ------------------------------------
+# ------------ Tile cache ------------
+# ------------------------------------
+class _TileLoadSignals(QObject):
+    loaded = Signal(object, object)
+
+class _TileLoadTask(QRunnable):
+    def __init__(self, cache: "TileCache", key: tuple, path: str):
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.cache = cache
+        self.key = key
+        self.path = path
+        self.signals = _TileLoadSignals()
+
+    def run(self):
+        # Tiles scrolled out of view before their turn are not decoded
+        image = QImage(self.path) if self.cache.is_wanted(self.key) else None
+        self.signals.loaded.emit(self, image)
+
+class TileCache(QObject):
+    tile_loaded = Signal()
+
+    def __init__(self, capacity: int = 512, parent=None):
+        super().__init__(parent)
+        self._capacity = capacity
+        self._pixmaps: OrderedDict[tuple, QPixmap] = OrderedDict()
+
+        # Requested tiles still loading, and those the last frame needed
+        self._tasks: dict[tuple, _TileLoadTask] = {}
+        self._wanted: set[tuple] = set()
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, min(4, QThreadPool.globalInstance().maxThreadCount())))
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    def begin_frame(self):
+        self._wanted = set()
+
+    def is_wanted(self, key: tuple) -> bool:
+        return key in self._wanted
+
+    def tile(self, pyramid: TilePyramid, level: int, column: int, row: int, request: bool = True) -> QPixmap | None:
+        key = (pyramid.directory, level, column, row)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        if request:
+            self._wanted.add(key)
+            if key not in self._tasks:
+                task = _TileLoadTask(self, key, pyramid.tile_path(level, column, row))
+                task.signals.loaded.connect(self._on_loaded)
+                self._tasks[key] = task
+                # Coarse levels first, they stand in for the rest meanwhile
+                self._pool.start(task, level)
+        return None
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._wanted = set()
+
+    def wait(self):
+        self._wanted = set()
+        self._pool.waitForDone()
+
+    def _on_loaded(self, task: _TileLoadTask, image: QImage):
+        self._tasks.pop(task.key, None)
+        if image is None or image.isNull():
+            return
+
+        # Pixmaps can only be made on the GUI thread
+        self._pixmaps[task.key] = QPixmap.fromImage(image)
+        while len(self._pixmaps) > self._capacity:
+            self._pixmaps.popitem(last=False)
+
+        self.tile_loaded.emit()
+
+
+# ------------------------------------
+# ------------- Drawing --------------
+# ------------------------------------
+class UnderlayRenderer(QObject):
+    changed = Signal()
+    build_progress = Signal(str, int, int)
+    build_failed = Signal(str, str)
+
+    def __init__(self, cache_root: str = None, cache_capacity: int = 512, parent=None):
+        super().__init__(parent)
+        self._cache_root = cache_root
+        self._pyramids: dict[str, TilePyramid] = {}
+
+        self._cache = TileCache(cache_capacity, self)
+        self._cache.tile_loaded.connect(self.changed)
+
+        self._builder = PyramidBuilder(cache_root, self)
+        self._builder.progress.connect(self.build_progress)
+        self._builder.finished.connect(self._on_built)
+        self._builder.failed.connect(self._on_build_failed)
+
+        # Images that could not be tiled are not tried again on every frame
+        self._failed: set[str] = set()
+
+    @property
+    def cache(self) -> TileCache:
+        return self._cache
+
+    def pyramid(self, underlay: FloorUnderlay) -> TilePyramid | None:
+        path = underlay.image_path
+        pyramid = self._pyramids.get(path)
+        if pyramid is not None or path in self._failed:
+            return pyramid
+
+        pyramid = TilePyramid.open(path, self._cache_root)
+        if pyramid is not None:
+            self._pyramids[path] = pyramid
+        elif os.path.exists(path):
+            self._builder.build(path)
+        else:
+            self._failed.add(path)
+            self.build_failed.emit(path, "Image file not found.")
+        return pyramid
+
+    def wait(self):
+        self._builder.cancel_all()
+        self._builder.wait()
+        self._cache.wait()
+
+    def draw(self, painter: QPainter, rect: QRectF, underlay: FloorUnderlay):
+        pyramid = self.pyramid(underlay)
+        if pyramid is None:
+            return
+
+        # Screen pixels per image pixel picks the level, so a tile pixel
+        # is never drawn much smaller than a screen pixel
+        transform = painter.worldTransform()
+        view_scale = math.hypot(transform.m11(), transform.m12()) * underlay.scale
+        level = 0 if view_scale >= 1 else min(pyramid.levels - 1, int(math.log2(1 / view_scale)))
+
+        # Exposed rectangle in pixels of that level
+        pixel_size = underlay.scale * (1 << level)
+        left = (rect.left() - underlay.x) / pixel_size
+        top = (rect.top() - underlay.y) / pixel_size
+        right = (rect.right() - underlay.x) / pixel_size
+        bottom = (rect.bottom() - underlay.y) / pixel_size
+
+        columns, rows = pyramid.tile_grid(level)
+        size = pyramid.tile_size
+        first_column, last_column = max(0, math.floor(left / size)), min(columns - 1, math.floor(right / size))
+        first_row, last_row = max(0, math.floor(top / size)), min(rows - 1, math.floor(bottom / size))
+        if first_column > last_column or first_row > last_row:
+            return
+
+        self._cache.begin_frame()
+
+        painter.save()
+        painter.setOpacity(underlay.opacity)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, level > 0 or view_scale < 1)
+
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                target = QRectF(underlay.x + column * size * pixel_size,
+                                underlay.y + row * size * pixel_size,
+                                size * pixel_size, size * pixel_size)
+
+                pixmap = self._cache.tile(pyramid, level, column, row)
+                if pixmap is not None:
+                    painter.drawPixmap(QRectF(target.topLeft(), pixmap.size() * pixel_size), pixmap,
+                                       QRectF(pixmap.rect()))
+                else:
+                    self._draw_coarser(painter, pyramid, level, column, row, target)
+
+        painter.restore()
+
+    def _draw_coarser(self, painter: QPainter, pyramid: TilePyramid, level: int, column: int, row: int,
+                      target: QRectF):
+        # A loaded tile of a coarser level covering this one stands in,
+        # the coarsest level is always requested so there is one soon
+        size = pyramid.tile_size
+        for coarser in range(level + 1, pyramid.levels):
+            shift = coarser - level
+            request = coarser == pyramid.levels - 1
+            pixmap = self._cache.tile(pyramid, coarser, column >> shift, row >> shift, request)
+            if pixmap is None:
+                continue
+
+            part = size >> shift
+            source = QRectF((column - ((column >> shift) << shift)) * part,
+                            (row - ((row >> shift) << shift)) * part,
+                            part, part).intersected(QRectF(pixmap.rect()))
+            if not source.isEmpty():
+                painter.drawPixmap(QRectF(target.topLeft(), source.size() * (1 << shift) * target.width() / size),
+                                   pixmap, source)
+            return
+
+    def _on_built(self, image_path: str, pyramid: TilePyramid):
+        self._pyramids[image_path] = pyramid
+        self.changed.emit()
+
+    def _on_build_failed(self, image_path: str, error: str):
+        self._failed.add(image_path)
+        self.build_failed.emit(image_path, error)
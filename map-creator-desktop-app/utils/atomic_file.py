@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from contextlib import contextmanager, nullcontext
+from typing import Callable
+
+@contextmanager
+def atomic_write(file_path: str,
+                 mode: str = 'w',
+                 encoding: str = None,
+                 replace_lock=None,
+                 on_replaced: Callable[[], None] = None):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    prefix = "." + os.path.basename(file_path) + "."
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            # mkstemp creates owner-only files, keep the permissions of the target
+            file_mode = os.stat(file_path).st_mode if os.path.exists(file_path) else 0o644
+            os.chmod(temp_path, file_mode & 0o7777)
+
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+
+        with replace_lock if replace_lock is not None else nullcontext():
+            os.replace(temp_path, file_path)
+            if on_replaced is not None:
+                on_replaced()
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
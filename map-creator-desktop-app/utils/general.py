@@ -1,12 +1,19 @@
 from PySide6.QtGui import QPalette
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
     QComboBox, QDialogButtonBox, QMessageBox, QInputDialog, 
-    QFileDialog, QApplication
+    QFileDialog, QApplication, QProgressDialog
 )
 
-from model import ZoneType, PointOfInterestType, Building
+import os
+import re
+
+from model import ZoneType, PointOfInterestType, Building, Floor
 from building_serializer import BuildingSerializer
+from building_saver import BuildingSaver
+from cad_importer import CadImporter, CadImportResult
+from constants import BUILDING_FILE_EXTENSION, COMPACT_BUILDING_FILE_EXTENSION
 
 def ask_zone_name(window_name="Zone settings",
                   default_name="Example Zone",
@@ -137,13 +144,26 @@ def load_file_dialog(parent,
 
 def load_building(parent,
                   title="Open Building File",
-                  filter="Indoor Map Files (*.inmap)") -> Building | None:
+                  filter="Indoor Map Files (*.inmap *.inmapb)") -> Building | None:
     path = load_file_dialog(parent, title, filter)
     if path is None:
         return None
 
+    progress_dialog = QProgressDialog("Loading building...", None, 0, 100, parent)
+    progress_dialog.setWindowTitle(title)
+    progress_dialog.setWindowModality(Qt.WindowModal)
+    progress_dialog.setMinimumDuration(500)
+
+    def report_progress(done: int, total: int):
+        if total > 0:
+            progress_dialog.setValue(int(done * 100 / total))
+
     serializer = BuildingSerializer()
-    building = serializer.load_from_file(path)
+    try:
+        building = serializer.load_from_file(path, report_progress, lazy=True)
+    finally:
+        progress_dialog.reset()
+
     if building is None:
         QMessageBox.critical(
             parent,
@@ -152,6 +172,38 @@ def load_building(parent,
         )
     return building
 
+def import_cad_floor(parent,
+                     title="Import CAD Drawing",
+                     filter="CAD Drawings (*.dxf *.svg)") -> tuple[Floor, CadImportResult] | None:
+    path = load_file_dialog(parent, title, filter)
+    if path is None:
+        return None
+
+    progress_dialog = QProgressDialog("Importing drawing...", None, 0, 100, parent)
+    progress_dialog.setWindowTitle(title)
+    progress_dialog.setWindowModality(Qt.WindowModal)
+    progress_dialog.setMinimumDuration(500)
+
+    def report_progress(done: int, total: int):
+        if total > 0:
+            progress_dialog.setValue(int(done * 100 / total))
+
+    # A floor of its own, off screen until it is picked
+    floor = Floor(os.path.splitext(os.path.basename(path))[0])
+    try:
+        result = CadImporter().import_file(path, floor, report_progress)
+    except (OSError, ValueError, SyntaxError) as e:
+        QMessageBox.critical(
+            parent,
+            "Error",
+            f"Failed to import drawing: {path}\n{e}"
+        )
+        return None
+    finally:
+        progress_dialog.reset()
+
+    return floor, result
+
 def save_file_dialog(parent,
                      title="Save File",
                      extension=".json", 
@@ -164,6 +216,12 @@ def save_file_dialog(parent,
             selected_files = file_dialog.selectedFiles()
             if selected_files:
                 file_path = selected_files[0]
+
+                # Multiple filters may each imply their own extension
+                match = re.search(r"\*(\.\w+)", file_dialog.selectedNameFilter())
+                if match:
+                    extension = match.group(1)
+
                 if not file_path.lower().endswith(extension):
                     file_path += extension
                 
@@ -173,15 +231,22 @@ def save_file_dialog(parent,
 
 def save_building(parent,
                   building: Building,
+                  saver: BuildingSaver = None,
                   title="Save Building File",
-                  extension=".inmap",
-                  filter="Indoor Map Files (*.inmap)"):
+                  extension=BUILDING_FILE_EXTENSION,
+                  filter="Indoor Map Files (*.inmap);;Compact Indoor Map Files (*.inmapb)"):
         path = save_file_dialog(parent, title, extension, filter)
         if path is None:
             return None
     
+        binary = path.lower().endswith(COMPACT_BUILDING_FILE_EXTENSION)
+
+        if saver is not None:
+            saver.save(building, path, binary)
+            return path
+
         serializer = BuildingSerializer()
-        success = serializer.save_to_file(building, path)
+        success = serializer.save_to_file(building, path, binary)
         if not success:
             QMessageBox.critical(
                 parent,
@@ -1,34 +1,291 @@
-from PySide6.QtCore import QLineF, QPointF
+import math
+import random
 
-def get_self_intersetion(path_points: list[QPointF]) -> QPointF:
-    n = len(path_points)
-    if n < 3:
-        return None
-    
-    for i in range(n - 1):
-        line1_start = path_points[i]
-        line1_end = path_points[i + 1]
-        line1 = QLineF(line1_start, line1_end)
+from typing import Callable
+
+from model.spatial_index import segments_intersect
+
+Coordinate = tuple[float, float]
+
+def _orientation(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+    value = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (value > 0) - (value < 0)
+
+def _folds_back(a: Coordinate, shared: Coordinate, b: Coordinate) -> bool:
+    # Segments a-shared and shared-b meet at shared; they overlap when b
+    # lies on the line through a and shared, on the same side as a
+    if _orientation(*a, *shared, *b) != 0:
+        return False
+    return (a[0] - shared[0]) * (b[0] - shared[0]) + (a[1] - shared[1]) * (b[1] - shared[1]) > 0
+
+# Segments crossing the sweep line, ordered bottom to top in a treap, so
+# inserting, removing and finding the neighbours of a segment are O(log n)
+class _SweepStatus:
+    class _Node:
+        __slots__ = ("segment", "priority", "left", "right", "parent")
+
+        def __init__(self, segment: int):
+            self.segment = segment
+            self.priority = random.random()
+            self.left = None
+            self.right = None
+            self.parent = None
+
+    def __init__(self):
+        self._root = None
+
+    # below(other) tells whether the new segment goes below other
+    def insert(self, segment: int, below: Callable[[int], bool]) -> "_SweepStatus._Node":
+        node = _SweepStatus._Node(segment)
+
+        parent = None
+        current = self._root
+        go_left = False
+        while current is not None:
+            parent = current
+            go_left = below(current.segment)
+            current = current.left if go_left else current.right
+
+        node.parent = parent
+        if parent is None:
+            self._root = node
+        elif go_left:
+            parent.left = node
+        else:
+            parent.right = node
 
-        for j in range(i + 2, n - 1):
-            line2_start = path_points[j]
-            line2_end = path_points[j + 1]
-            line2 = QLineF(line2_start, line2_end)
+        while node.parent is not None and node.priority < node.parent.priority:
+            self._rotate_up(node)
+        return node
 
-            intersection_type, point = line1.intersects(line2)
+    def remove(self, node: "_SweepStatus._Node"):
+        while node.left is not None or node.right is not None:
+            if node.right is None or (node.left is not None and node.left.priority < node.right.priority):
+                self._rotate_up(node.left)
+            else:
+                self._rotate_up(node.right)
 
-            if intersection_type == QLineF.IntersectionType.BoundedIntersection:
-                return point
+        self._replace(node, None)
 
-    if point_is_on_segment(path_points[-1], path_points[-3], path_points[-2]):
-        return path_points[-1]
-    else:
+    def below(self, node: "_SweepStatus._Node") -> "_SweepStatus._Node | None":
+        if node.left is not None:
+            node = node.left
+            while node.right is not None:
+                node = node.right
+            return node
+
+        while node.parent is not None and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    def above(self, node: "_SweepStatus._Node") -> "_SweepStatus._Node | None":
+        if node.right is not None:
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+    def _replace(self, node: "_SweepStatus._Node", child: "_SweepStatus._Node | None"):
+        parent = node.parent
+        if parent is None:
+            self._root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        if child is not None:
+            child.parent = parent
+
+    # Swaps a node with its parent, keeping the in-order sequence
+    def _rotate_up(self, node: "_SweepStatus._Node"):
+        parent = node.parent
+        self._replace(parent, node)
+        if parent.left is node:
+            parent.left = node.right
+            if node.right is not None:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left is not None:
+                node.left.parent = parent
+            node.left = parent
+        parent.parent = node
+
+def find_self_intersection(points: list[Coordinate], closed: bool = False) -> tuple[int, int] | None:
+    # Shamos-Hoyer sweep: segments are kept ordered by height along a
+    # vertical line sweeping from left to right. The first crossing always
+    # happens between two segments that are neighbours in that order at
+    # some point, so only O(n log n) pairs have to be tested.
+    #
+    # Segment i runs from points[i] to points[i + 1] (and the last one back
+    # to points[0] when closed). Returns the indices of two segments that
+    # touch anywhere other than the vertex shared by consecutive segments.
+    count = len(points)
+    segment_count = count if closed and count > 2 else count - 1
+    if segment_count < 2:
         return None
 
-def point_is_on_segment(point: QPointF, seg_start: QPointF, seg_end: QPointF) -> bool:
-    line = QLineF(seg_start, seg_end)
-    distance_to_start = QLineF(point, seg_start).length()
-    distance_to_end = QLineF(point, seg_end).length()
-    segment_length = line.length()
+    def conflict(a: int, b: int) -> bool:
+        if a > b:
+            a, b = b, a
+
+        if b == a + 1:
+            return _folds_back(points[a], points[b], points[(b + 1) % count])
+        if closed and a == 0 and b == segment_count - 1:
+            return _folds_back(points[1], points[0], points[b])
+
+        (ax, ay), (bx, by) = points[a], points[a + 1]
+        (cx, cy), (dx, dy) = points[b], points[(b + 1) % count]
+        return segments_intersect(ax, ay, bx, by, cx, cy, dx, dy)
+
+    # Segments meeting at an end point are tested against each other up
+    # front, as the sweep never holds one ending there together with one
+    # starting there. Any four of them include a pair that conflicts, so
+    # this stays linear.
+    ends: dict[Coordinate, list[int]] = {}
+    for s in range(segment_count):
+        for end in (points[s], points[(s + 1) % count]):
+            meeting = ends.setdefault(end, [])
+            if s in meeting:
+                continue
+            for other in meeting:
+                if conflict(s, other):
+                    return (s, other) if s < other else (other, s)
+            meeting.append(s)
+
+    lefts = []
+    rights = []
+    events = []
+    for s in range(segment_count):
+        start, end = points[s], points[(s + 1) % count]
+        left, right = (start, end) if start <= end else (end, start)
+        lefts.append(left)
+        rights.append(right)
+        # Zero length segments are covered by the end point test
+        if left != right:
+            # Removals sort before insertions at the same point
+            events.append((left[0], left[1], 1, s))
+            events.append((right[0], right[1], 0, s))
+    events.sort()
+
+    # Position on the sweep line, ties broken by the order just to its right
+    def sweep_key(s: int, x: float) -> tuple[float, float]:
+        (x1, y1), (x2, y2) = lefts[s], rights[s]
+        if x1 == x2:
+            return y1, math.inf
+
+        slope = (y2 - y1) / (x2 - x1)
+        return y1 + (x - x1) * slope, slope
+
+    status = _SweepStatus()
+    nodes = {}
+    for x, _, is_insertion, s in events:
+        if not is_insertion:
+            node = nodes.pop(s)
+            below, above = status.below(node), status.above(node)
+            if below is not None and above is not None and conflict(below.segment, above.segment):
+                return tuple(sorted((below.segment, above.segment)))
+            status.remove(node)
+            continue
+
+        key = sweep_key(s, x)
+        node = status.insert(s, lambda other: key < sweep_key(other, x))
+        nodes[s] = node
+
+        for neighbour in (status.below(node), status.above(node)):
+            if neighbour is not None and conflict(s, neighbour.segment):
+                return tuple(sorted((s, neighbour.segment)))
+
+    return None
+
+
+# An open polyline being drawn point by point, with its segments filed in a
+# uniform grid. Whether the next segment would cross the ones already placed
+# is answered from the few cells around it, so checking the rubber band on
+# every mouse move does not grow with the number of corners.
+class PolylineIndex:
+    def __init__(self, cell_size: float = 100.0):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive.")
+
+        self._cell_size = float(cell_size)
+        self._points: list[Coordinate] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    @property
+    def points(self) -> list[Coordinate]:
+        return self._points
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def clear(self):
+        self._points = []
+        self._cells = {}
+
+    def append(self, point: Coordinate):
+        point = (float(point[0]), float(point[1]))
+        if self._points:
+            segment = len(self._points) - 1
+            for cell in self._cells_for(self._points[-1], point):
+                self._cells.setdefault(cell, []).append(segment)
+        self._points.append(point)
+
+    def can_extend_to(self, point: Coordinate) -> bool:
+        # Closing the outline onto its first point is allowed once it has
+        # three corners; any other contact with a placed segment is not
+        points = self._points
+        count = len(points)
+        if count == 0:
+            return True
+
+        point = (float(point[0]), float(point[1]))
+        last = points[-1]
+        if point == last:
+            return False
+
+        closing = count >= 3 and point == points[0]
+
+        for segment in self._candidates(last, point):
+            start, end = points[segment], points[segment + 1]
+
+            if segment == count - 2:
+                if _folds_back(start, last, point):
+                    return False
+            elif closing and segment == 0:
+                if _folds_back(end, start, last):
+                    return False
+            elif segments_intersect(*last, *point, *start, *end):
+                return False
+
+        return True
+
+    def _cell_range(self, a: Coordinate, b: Coordinate) -> tuple[int, int, int, int]:
+        size = self._cell_size
+        return (math.floor(min(a[0], b[0]) / size), math.floor(min(a[1], b[1]) / size),
+                math.floor(max(a[0], b[0]) / size), math.floor(max(a[1], b[1]) / size))
+
+    def _cells_for(self, a: Coordinate, b: Coordinate):
+        min_i, min_j, max_i, max_j = self._cell_range(a, b)
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                yield i, j
+
+    def _candidates(self, a: Coordinate, b: Coordinate):
+        segment_count = len(self._points) - 1
+        min_i, min_j, max_i, max_j = self._cell_range(a, b)
+
+        # A rubber band across the whole outline is cheaper to test against
+        # every segment than cell by cell
+        if (max_i - min_i + 1) * (max_j - min_j + 1) > segment_count:
+            return range(segment_count)
 
-    return abs((distance_to_start + distance_to_end) - segment_length) < 1e-6
\ No newline at end of file
+        found = set()
+        for cell in self._cells_for(a, b):
+            found.update(self._cells.get(cell, ()))
+        return found
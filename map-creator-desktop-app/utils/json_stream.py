@@ -0,0 +1,145 @@
+import codecs
+import json
+import os
+
+from typing import BinaryIO, Callable, Iterator
+
+# Walks JSON containers one key / element at a time, so only the value
+# currently being decoded has to be held in memory. Reads the file as UTF-8
+# bytes, so progress is reported in the same unit as the file size.
+class JsonStreamReader:
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self,
+                 file: BinaryIO,
+                 chunk_size: int = 1 << 16,
+                 progress: Callable[[int, int], None] = None):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._read_total = 0
+
+        try:
+            self._size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    # The caller must consume the value of every yielded key
+    def iter_object(self) -> Iterator[str]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Object key must be a string.")
+            self._expect(":")
+
+            yield key
+
+            separator = self._next_char()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}', got {separator!r}.")
+
+    # The caller must consume every yielded element
+    def iter_array(self) -> Iterator[int]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            separator = self._next_char()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']', got {separator!r}.")
+
+    def read_value(self):
+        self._peek()
+
+        # A value spanning chunks is decoded again from its start after every
+        # read, so each read doubles in size to keep large values linear
+        read_size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(read_size):
+                    raise
+                read_size *= 2
+                continue
+
+            # A number may continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                if self._fill(read_size):
+                    read_size *= 2
+                    continue
+
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        self.read_value()
+
+    def _expect(self, char: str):
+        found = self._next_char()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, got {found!r}.")
+
+    def _next_char(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document.")
+
+    def _fill(self, size: int = None) -> bool:
+        if self._eof:
+            return False
+
+        data = self._file.read(size or self._chunk_size)
+        if not data:
+            self._eof = True
+            # Raises on a character cut off by the end of the file
+            self._text_decoder.decode(b"", final=True)
+            return False
+
+        # A character split across reads is held back until the next one
+        chunk = self._text_decoder.decode(data)
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._read_total += len(data)
+
+        if self._progress is not None:
+            self._progress(min(self._read_total, self._size), self._size)
+
+        return True
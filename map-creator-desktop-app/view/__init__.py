@@ -1,8 +1,13 @@
 from .cursor_modes import *
+from .floor_layer_item import FloorLayerItem
 from .highlight_preview import HighlightPreview
+from .label_detail import LabelDetail
+from .level_of_detail import LevelOfDetail
 from .node_item import NodeGraphicsItem
 from .point_of_interest_item import PointOfInterestGraphicsItem
+from .point_of_interest_cluster_item import PointOfInterestClusterItem
 from .point_of_interest_preview import PointOfInterestPreview
+from .point_of_interest_pixmaps import PointOfInterestPixmapCache, point_of_interest_pixmaps
 from .wall_item import WallGraphicsItem
 from .wall_preview import WallPreview
 from .zone_item import ZoneGraphicsItem
@@ -11,10 +16,16 @@ from .zoom import GraphicsViewZoom
 
 __all__ = [
     "CursorMode",
+    "FloorLayerItem",
     "HighlightPreview",
+    "LabelDetail",
+    "LevelOfDetail",
     "NodeGraphicsItem",
     "PointOfInterestGraphicsItem",
+    "PointOfInterestClusterItem",
     "PointOfInterestPreview",
+    "PointOfInterestPixmapCache",
+    "point_of_interest_pixmaps",
     "WallGraphicsItem",
     "WallPreview",
     "ZoneGraphicsItem",
@@ -0,0 +1,20 @@
+from PySide6.QtCore import QRectF
+from PySide6.QtWidgets import QGraphicsItem
+
+# Parent of every graphics item of one floor. Hiding it hides the whole
+# floor in one call, so floors viewed recently can stay in the scene.
+class FloorLayerItem(QGraphicsItem):
+    def __init__(self):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemHasNoContents, True)
+
+        # Whether the items' enabled state was last set for active_type, the
+        # active layer type of the scene, kept up by the scene
+        self.items_synced = False
+        self.active_type = None
+
+    def boundingRect(self) -> QRectF:
+        return QRectF()
+
+    def paint(self, painter, option, widget=None):
+        pass
@@ -5,6 +5,10 @@ class HighlightPreview:
         self._highlight_item = None
 
     def update_preview(self, item):
+        # Moves within the highlighted item change nothing
+        if item is self._highlight_item and item is not None and shiboken6.isValid(item):
+            return
+
         self.clear()
 
         # Ensure item still exists
@@ -16,4 +20,4 @@ class HighlightPreview:
         # Ensure item still exists
         if self._highlight_item and shiboken6.isValid(self._highlight_item):
             self._highlight_item.set_highlight(False)
-            self._highlight_item = None
\ No newline at end of file
+        self._highlight_item = None
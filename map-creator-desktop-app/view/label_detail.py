@@ -0,0 +1,7 @@
+from enum import Enum
+
+# How much of an item's label is drawn at the current zoom
+class LabelDetail(Enum):
+    HIDDEN = 0
+    PLAIN = 1
+    FULL = 2
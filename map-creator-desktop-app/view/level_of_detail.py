@@ -0,0 +1,232 @@
+import math
+
+from PySide6.QtWidgets import QGraphicsScene
+
+from constants import (
+    LOD_NODE_MIN_ZOOM, LOD_LABEL_OUTLINE_MIN_ZOOM, LOD_LABEL_MIN_ZOOM,
+    LOD_POI_CLUSTER_MAX_ZOOM, LOD_POI_CLUSTER_RADIUS,
+)
+from .label_detail import LabelDetail
+from .node_item import NodeGraphicsItem
+from .point_of_interest_item import PointOfInterestGraphicsItem
+from .point_of_interest_cluster_item import PointOfInterestClusterItem
+from .zone_item import ZoneGraphicsItem
+
+# Shows less of the map the further the view is zoomed out: nodes are hidden,
+# labels lose their outline and then disappear, and points of interest close
+# together on screen collapse into cluster markers. Items are only touched
+# when a threshold is crossed, so pan and zoom cost nothing in between.
+class LevelOfDetail:
+    def __init__(self,
+                 scene: QGraphicsScene,
+                 node_min_zoom: float = LOD_NODE_MIN_ZOOM,
+                 label_outline_min_zoom: float = LOD_LABEL_OUTLINE_MIN_ZOOM,
+                 label_min_zoom: float = LOD_LABEL_MIN_ZOOM,
+                 cluster_max_zoom: float = LOD_POI_CLUSTER_MAX_ZOOM,
+                 cluster_radius: float = LOD_POI_CLUSTER_RADIUS):
+        self._scene = scene
+        self.node_min_zoom = node_min_zoom
+        self.label_outline_min_zoom = label_outline_min_zoom
+        self.label_min_zoom = label_min_zoom
+        self.cluster_max_zoom = cluster_max_zoom
+        self.cluster_radius = cluster_radius
+
+        self._zoom = 1.0
+        self._show_nodes = True
+        self._label_detail = LabelDetail.FULL
+        self._cell_size = None
+
+        self._nodes: set[NodeGraphicsItem] = set()
+        self._zones: set[ZoneGraphicsItem] = set()
+        self._points: set[PointOfInterestGraphicsItem] = set()
+
+        # Points of interest bucketed into cells of about the cluster radius,
+        # kept only while clustering
+        self._cells: dict[tuple[int, int], set[PointOfInterestGraphicsItem]] = {}
+        self._point_cells: dict[PointOfInterestGraphicsItem, tuple[int, int]] = {}
+        self._markers: dict[tuple[int, int], PointOfInterestClusterItem] = {}
+        self._dirty: set[tuple[int, int]] = set()
+
+        self._apply_zoom()
+
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @property
+    def show_nodes(self) -> bool:
+        return self._show_nodes
+
+    @property
+    def label_detail(self) -> LabelDetail:
+        return self._label_detail
+
+    @property
+    def is_clustering(self) -> bool:
+        return self._cell_size is not None
+
+    @property
+    def markers(self) -> list[PointOfInterestClusterItem]:
+        return list(self._markers.values())
+
+    def set_zoom(self, zoom: float):
+        if zoom != self._zoom:
+            self._zoom = zoom
+            self._apply_zoom()
+
+    # Re-reads the thresholds, e.g. after they were changed
+    def refresh(self):
+        self._apply_zoom()
+
+    def add_items(self, items):
+        for item in items:
+            if isinstance(item, NodeGraphicsItem):
+                self._nodes.add(item)
+                if not self._show_nodes:
+                    item.setVisible(False)
+            elif isinstance(item, ZoneGraphicsItem):
+                self._zones.add(item)
+                if self._label_detail != LabelDetail.FULL:
+                    item.set_label_detail(self._label_detail)
+            elif isinstance(item, PointOfInterestGraphicsItem):
+                self._points.add(item)
+                if self._label_detail != LabelDetail.FULL:
+                    item.set_label_detail(self._label_detail)
+                if self._cell_size is not None:
+                    self._place(item)
+        self._flush()
+
+    def remove_items(self, items):
+        for item in items:
+            if item in self._nodes:
+                self._nodes.discard(item)
+                item.setVisible(True)
+            elif item in self._zones:
+                self._zones.discard(item)
+            elif item in self._points:
+                self._points.discard(item)
+                self._unplace(item)
+                item.setVisible(True)
+        self._flush()
+
+    # Called by points of interest whenever they move
+    def point_moved(self, item: PointOfInterestGraphicsItem):
+        if self._cell_size is None or item not in self._points:
+            return
+
+        if self._cell_of(item) != self._point_cells.get(item):
+            self._unplace(item)
+            self._place(item)
+        else:
+            self._dirty.add(self._point_cells[item])
+        self._flush()
+
+    # Forgets every item, e.g. right before the scene deletes them all
+    def clear(self):
+        for marker in self._markers.values():
+            self._scene.removeItem(marker)
+
+        self._nodes.clear()
+        self._zones.clear()
+        self._points.clear()
+        self._cells.clear()
+        self._point_cells.clear()
+        self._markers.clear()
+        self._dirty.clear()
+
+    def _apply_zoom(self):
+        show_nodes = self._zoom >= self.node_min_zoom
+        if show_nodes != self._show_nodes:
+            self._show_nodes = show_nodes
+            for item in self._nodes:
+                item.setVisible(show_nodes)
+
+        if self._zoom < self.label_min_zoom:
+            label_detail = LabelDetail.HIDDEN
+        elif self._zoom < self.label_outline_min_zoom:
+            label_detail = LabelDetail.PLAIN
+        else:
+            label_detail = LabelDetail.FULL
+
+        if label_detail != self._label_detail:
+            self._label_detail = label_detail
+            for item in self._zones:
+                item.set_label_detail(label_detail)
+            for item in self._points:
+                item.set_label_detail(label_detail)
+
+        # Cells grow in powers of two, so zooming rebuilds the clusters only
+        # once every few steps
+        cell_size = None
+        if self._zoom < self.cluster_max_zoom:
+            cell_size = 2.0 ** math.ceil(math.log2(self.cluster_radius / self._zoom))
+
+        if cell_size != self._cell_size:
+            self._uncluster()
+            self._cell_size = cell_size
+            if cell_size is not None:
+                for item in self._points:
+                    self._place(item)
+                self._flush()
+
+    def _uncluster(self):
+        for marker in self._markers.values():
+            self._scene.removeItem(marker)
+        for item in self._point_cells:
+            item.setVisible(True)
+
+        self._cells.clear()
+        self._point_cells.clear()
+        self._markers.clear()
+        self._dirty.clear()
+
+    def _cell_of(self, item) -> tuple[int, int]:
+        pos = item.pos()
+        return (math.floor(pos.x() / self._cell_size), math.floor(pos.y() / self._cell_size))
+
+    def _place(self, item):
+        cell = self._cell_of(item)
+        self._cells.setdefault(cell, set()).add(item)
+        self._point_cells[item] = cell
+        self._dirty.add(cell)
+
+    def _unplace(self, item):
+        cell = self._point_cells.pop(item, None)
+        if cell is None:
+            return
+
+        items = self._cells[cell]
+        items.discard(item)
+        if not items:
+            del self._cells[cell]
+        self._dirty.add(cell)
+
+    # Brings the markers and point visibility of changed cells up to date
+    def _flush(self):
+        dirty, self._dirty = self._dirty, set()
+        for cell in dirty:
+            items = self._cells.get(cell, ())
+            marker = self._markers.get(cell)
+
+            if len(items) < 2:
+                if marker is not None:
+                    self._scene.removeItem(marker)
+                    del self._markers[cell]
+                for item in items:
+                    item.setVisible(True)
+                continue
+
+            if marker is None:
+                marker = PointOfInterestClusterItem()
+                self._markers[cell] = marker
+                self._scene.addItem(marker)
+
+            x = y = 0.0
+            for item in items:
+                item.setVisible(False)
+                pos = item.pos()
+                x += pos.x()
+                y += pos.y()
+
+            marker.set_count(len(items))
+            marker.setPos(x / len(items), y / len(items))
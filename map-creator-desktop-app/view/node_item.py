@@ -3,29 +3,34 @@ from PySide6.QtWidgets import QGraphicsEllipseItem
 
 from model import Node
 
-class NodeGraphicsItem(QGraphicsEllipseItem):
-    def __init__(self, node: Node):
-        radius = 5
+# The dot a node is drawn as, also used on its own by tool previews
+class NodeMarkerItem(QGraphicsEllipseItem):
+    RADIUS = 5
+
+    def __init__(self):
+        radius = NodeMarkerItem.RADIUS
         super().__init__(-radius, -radius, radius * 2, radius * 2)
         self.setBrush(QColor("blue"))
+        self.setZValue(1)
+
+class NodeGraphicsItem(NodeMarkerItem):
+    def __init__(self, node: Node):
+        super().__init__()
         self.node = node
-        self.setPos(node.position)
+        self.setPos(node.x, node.y)
         self.setFlag(QGraphicsEllipseItem.ItemIsSelectable, True)
-        self.setZValue(1)
 
         self.node.updated.connect(self.update_item)
 
-    def itemChange(self, change, value):
-        if change == QGraphicsEllipseItem.ItemSceneHasChanged and value is None:
-            try:
-                self.node.updated.disconnect(self.update_item)
-            except TypeError:
-                pass
-
-        return super().itemChange(change, value)
+    # Called by the scene once the item has left it
+    def release(self):
+        try:
+            self.node.updated.disconnect(self.update_item)
+        except TypeError:
+            pass
 
     def update_item(self):
         self.update_geometry()
 
     def update_geometry(self):
-        self.setPos(self.node.position)
+        self.setPos(self.node.x, self.node.y)
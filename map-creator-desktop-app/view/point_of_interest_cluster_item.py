@@ -0,0 +1,41 @@
+from PySide6.QtGui import QBrush, QColor, QPen
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsSimpleTextItem
+
+# Stands in for several points of interest too close together to tell apart
+# at the current zoom. Drawn at the same size on screen whatever the zoom.
+class PointOfInterestClusterItem(QGraphicsEllipseItem):
+    RADIUS = 14
+
+    def __init__(self):
+        radius = PointOfInterestClusterItem.RADIUS
+        super().__init__(-radius, -radius, radius * 2, radius * 2)
+        self.setBrush(QBrush(QColor("#D32C2C")))
+        self.setPen(QPen(Qt.white, 2))
+        self.setFlag(QGraphicsEllipseItem.ItemIgnoresTransformations, True)
+        self.setEnabled(False)
+        self.setZValue(2)
+
+        self._count_item = QGraphicsSimpleTextItem(self)
+        self._count_item.setBrush(QBrush(Qt.white))
+
+        font = self._count_item.font()
+        font.setBold(True)
+        self._count_item.setFont(font)
+
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def set_count(self, count: int):
+        if count == self._count:
+            return
+
+        self._count = count
+        self._count_item.setText(str(count))
+        self.setToolTip(f"{count} points of interest")
+
+        text_rect = self._count_item.boundingRect()
+        self._count_item.setPos(-text_rect.width() / 2, -text_rect.height() / 2)
@@ -1,4 +1,4 @@
-from PySide6.QtGui import QPainterPath, QBrush, QColor, QPen, QPixmap, QPainter
+from PySide6.QtGui import QPainterPath, QBrush, QColor, QPen, QGuiApplication
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsPixmapItem, QGraphicsSimpleTextItem
 
@@ -6,7 +6,12 @@ from model import PointOfInterest, PointOfInterestType
 
 from constants import icons, poi_colors
 
+from .label_detail import LabelDetail
+from .point_of_interest_pixmaps import point_of_interest_pixmaps
+
 class PointOfInterestGraphicsItem(QGraphicsPathItem):
+    AVATAR_RENDER_SIZE = 64
+
     type_to_image = {
             PointOfInterestType.GENERIC: icons["generic"],
             PointOfInterestType.RESTAURANT: icons["restaurant"],
@@ -28,6 +33,13 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
         self._point_of_interest = point_of_interest
 
         self._icon_path = self._get_pin_path()
+        self.setPath(self._icon_path)
+        self.setPen(QPen(Qt.black, 1))
+        self.setScale(0.6)
+
+        # Name and type the label and pin were last built for
+        self._name = None
+        self._type = None
 
         self._text_item = QGraphicsSimpleTextItem(self._point_of_interest.name, parent=self)
         
@@ -40,6 +52,7 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
         self._text_item.setFont(font)
         self._text_item.setBrush(QBrush(Qt.white))
         self._text_item.setPen(QPen(Qt.black, 2))
+        self._label_detail = LabelDetail.FULL
 
         self.setFlag(QGraphicsPathItem.ItemIsSelectable, True)
         self.setZValue(2)
@@ -48,21 +61,45 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
         
         self.update_item()
 
-    def itemChange(self, change, value):
-        if change == QGraphicsPathItem.ItemSceneHasChanged and value is None:
-            try:
-                self._point_of_interest.updated.disconnect(self.update_item)
-            except TypeError:
-                pass
-
-        return super().itemChange(change, value)
-
+    # Called by the scene once the item has left it
+    def release(self):
+        try:
+            self._point_of_interest.updated.disconnect(self.update_item)
+        except TypeError:
+            pass
 
+    # Moves, many per second during a drag, only update the position
     def update_item(self):
-        self._update_label()
-        self._update_pin()
-        self._update_geometry()
-        self.setPos(self._point_of_interest.position)
+        name = self._point_of_interest.name
+        if name != self._name:
+            self._name = name
+            self._update_label()
+            self._update_geometry()
+
+        poi_type = self._point_of_interest.type
+        if poi_type != self._type:
+            self._type = poi_type
+            self._update_pin()
+
+        position = self._point_of_interest.position
+        if position.x() != self.x() or position.y() != self.y():
+            self.setPos(position.x(), position.y())
+
+            # Keeps the clusters of a zoomed out view up to date
+            level_of_detail = getattr(self.scene(), "level_of_detail", None)
+            if level_of_detail is not None:
+                level_of_detail.point_moved(self)
+
+    def set_label_detail(self, detail: LabelDetail):
+        if detail == self._label_detail:
+            return
+
+        self._label_detail = detail
+        self._text_item.setVisible(detail != LabelDetail.HIDDEN)
+        if detail == LabelDetail.FULL:
+            self._text_item.setPen(QPen(Qt.black, 2))
+        else:
+            self._text_item.setPen(QPen(Qt.NoPen))
 
     def _update_geometry(self):
         text_rect = self._text_item.boundingRect()
@@ -71,32 +108,18 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
         self._text_item.setPos(offset_x, offset_y)
 
     def _update_pin(self):
-        self.setPath(self._icon_path)
+        self.setBrush(QBrush(self._get_coloring()))
 
-        color = self._get_coloring()
-        self.setBrush(QBrush(color))
-        self.setPen(QPen(Qt.black, 1))
+        render_size = PointOfInterestGraphicsItem.AVATAR_RENDER_SIZE
+        app = QGuiApplication.instance()
+        device_pixel_ratio = app.devicePixelRatio() if app is not None else 1.0
 
-        render_size = 64
-        original_pixmap = self._get_image_pixmap(render_size)
-        original_pixmap = original_pixmap.scaled(render_size, 
-                                                 render_size, 
-                                                 Qt.KeepAspectRatioByExpanding, 
-                                                 Qt.SmoothTransformation)
-        
-        circular_pixmap = QPixmap(render_size, render_size)
-        circular_pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(circular_pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        
-        path_circle = QPainterPath()
-        path_circle.addEllipse(0, 0, render_size, render_size)
-        painter.setClipPath(path_circle)
-        
-        painter.drawPixmap(0, 0, original_pixmap)
-        painter.end()
+        path = PointOfInterestGraphicsItem.type_to_image.get(
+            self._point_of_interest.type, "icons/generic.png"
+        )
+        circular_pixmap = point_of_interest_pixmaps.avatar(
+            self._point_of_interest.type, path, render_size, device_pixel_ratio
+        )
 
         if self._avatar_item:
             self._avatar_item.setPixmap(circular_pixmap)
@@ -106,11 +129,9 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
             self._avatar_item.setScale(0.5)
         
             center_y_of_head = -40
-            real_width = self._avatar_item.pixmap().width() * self._avatar_item.scale()
+            real_width = render_size * self._avatar_item.scale()
             self._avatar_item.setPos(-real_width / 2, center_y_of_head - (real_width / 2))
 
-        self.setScale(0.6)
-
     def _update_label(self):
         self._text_item.setText(self._point_of_interest.name)
         self.setToolTip(self._point_of_interest.name)
@@ -121,18 +142,6 @@ class PointOfInterestGraphicsItem(QGraphicsPathItem):
         )
         return QColor(color)
 
-    def _get_image_pixmap(self, default_size=64) -> QPixmap:
-        path = PointOfInterestGraphicsItem.type_to_image.get(
-            self._point_of_interest.type, "icons/generic.png"
-        )
-
-        pixmap = QPixmap(path)
-        if pixmap.isNull():
-            pixmap = QPixmap(default_size, default_size)
-            pixmap.fill(Qt.white)
-
-        return pixmap
-    
     def _get_pin_path(self) -> QPainterPath:
         path = QPainterPath()
         path.cubicTo(-8, -12, -20, -28, -20, -40)   # Left side
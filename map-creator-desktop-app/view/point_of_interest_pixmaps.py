@@ -0,0 +1,85 @@
+from PySide6.QtGui import QPainter, QPainterPath, QPixmap
+from PySide6.QtCore import Qt
+
+from model import PointOfInterestType
+
+# Circular avatars of point of interest icons, rendered once per
+# (type, size, device pixel ratio) and shared by every item showing them.
+# A floor switch then decodes each icon once rather than once per item.
+class PointOfInterestPixmapCache:
+    def __init__(self):
+        self._pixmaps: dict[tuple[PointOfInterestType, int, float], QPixmap] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def avatar(self,
+               poi_type: PointOfInterestType,
+               image_path: str,
+               render_size: int,
+               device_pixel_ratio: float = 1.0) -> QPixmap:
+        key = (poi_type, render_size, device_pixel_ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = self._render(image_path, render_size, device_pixel_ratio)
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    # Bytes held by the cached pixmaps
+    @property
+    def memory_usage(self) -> int:
+        return sum(p.width() * p.height() * p.depth() // 8 for p in self._pixmaps.values())
+
+    def stats(self) -> dict:
+        return {
+            "pixmaps": len(self._pixmaps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "memory_usage": self.memory_usage,
+        }
+
+    def clear(self):
+        self._pixmaps.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _render(self, image_path: str, render_size: int, device_pixel_ratio: float) -> QPixmap:
+        size = round(render_size * device_pixel_ratio)
+
+        image = QPixmap(image_path)
+        if image.isNull():
+            image = QPixmap(size, size)
+            image.fill(Qt.white)
+
+        image = image.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        path_circle = QPainterPath()
+        path_circle.addEllipse(0, 0, size, size)
+        painter.setClipPath(path_circle)
+
+        painter.drawPixmap(0, 0, image)
+        painter.end()
+
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return pixmap
+
+point_of_interest_pixmaps = PointOfInterestPixmapCache()
@@ -1,6 +1,6 @@
 from PySide6.QtGui import QPen, QColor
 from PySide6.QtCore import QPointF
-from PySide6.QtWidgets import QGraphicsScene
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsEllipseItem
 
 import shiboken6
 
@@ -13,19 +13,21 @@ class PointOfInterestPreview:
         self._poi_preview = None
 
     def update_preview(self, pos: QPointF):
-        self.clear()
+        if pos is None:
+            self.clear()
+            return
 
-        if pos is not None:
-            self._poi_preview = self.scene.addEllipse(
-                pos.x() - 5,
-                pos.y() - 5,
-                10,
-                10,
-                PointOfInterestPreview.PEN,
-            )
+        # Made once and moved with the mouse. The scene deletes its items
+        # when cleared.
+        if self._poi_preview is None or not shiboken6.isValid(self._poi_preview):
+            self._poi_preview = QGraphicsEllipseItem(-5, -5, 10, 10)
+            self._poi_preview.setPen(PointOfInterestPreview.PEN)
             self._poi_preview.setOpacity(self.OPACITY)
 
+        if self._poi_preview.scene() is None:
+            self.scene.addItem(self._poi_preview)
+        self._poi_preview.setPos(pos)
+
     def clear(self):
-        if self._poi_preview and shiboken6.isValid(self._poi_preview):
+        if self._poi_preview and shiboken6.isValid(self._poi_preview) and self._poi_preview.scene() is not None:
             self.scene.removeItem(self._poi_preview)
-            self._poi_preview = None
\ No newline at end of file
@@ -15,14 +15,12 @@ class WallGraphicsItem(QGraphicsLineItem):
 
         self.wall.updated.connect(self.update_item)
 
-    def itemChange(self, change, value):
-        if change == QGraphicsLineItem.ItemSceneHasChanged and value is None:
-            try:
-                self.wall.updated.disconnect(self.update_item)
-            except TypeError:
-                pass
-
-        return super().itemChange(change, value)
+    # Called by the scene once the item has left it
+    def release(self):
+        try:
+            self.wall.updated.disconnect(self.update_item)
+        except TypeError:
+            pass
 
     def update_item(self):
         self.update_geometry()
@@ -1,12 +1,13 @@
 from PySide6.QtGui import QPen, QColor
 from PySide6.QtCore import QPointF, Qt
-from PySide6.QtWidgets import QGraphicsScene
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsLineItem
 
 import shiboken6
 
-from model import Node
-from .node_item import NodeGraphicsItem
+from .node_item import NodeMarkerItem
 
+# Made once and moved with the mouse; clear() only takes the items out of
+# the scene until the next preview
 class WallPreview:
     OPACITY = 0.5
     LINE_WIDTH = 4
@@ -17,38 +18,49 @@ class WallPreview:
         self._start_preview = None
         self._line_preview = None
         self._end_preview = None
+        self._shown = False
 
     def update_preview(self, start_pos: QPointF, cursor_pos: QPointF):
-        self.clear()
+        self._show()
 
         if start_pos is None:
-            self._start_preview = NodeGraphicsItem(Node(cursor_pos.x(), cursor_pos.y()))
-            self._start_preview.setOpacity(self.OPACITY)
-            self.scene.addItem(self._start_preview)
+            self._start_preview.setPos(cursor_pos)
+            self._line_preview.setVisible(False)
+            self._end_preview.setVisible(False)
         else:
-            self._start_preview = NodeGraphicsItem(Node(start_pos.x(), start_pos.y()))
-            self._start_preview.setOpacity(self.OPACITY)
-            self.scene.addItem(self._start_preview)
+            self._start_preview.setPos(start_pos)
+            self._line_preview.setLine(start_pos.x(), start_pos.y(), cursor_pos.x(), cursor_pos.y())
+            self._line_preview.setVisible(True)
+            self._end_preview.setPos(cursor_pos)
+            self._end_preview.setVisible(True)
 
-            self._line_preview = self.scene.addLine(
-                start_pos.x(), start_pos.y(), cursor_pos.x(), cursor_pos.y()
-            )
-            self._line_preview.setOpacity(self.OPACITY)
-            self._line_preview.setPen(QPen(QColor("black"), self.LINE_WIDTH, self.LINE_LOOKS))
+    def clear(self):
+        if not self._shown:
+            return
 
-            self._end_preview = NodeGraphicsItem(Node(cursor_pos.x(), cursor_pos.y()))
-            self._end_preview.setOpacity(self.OPACITY)
-            self.scene.addItem(self._end_preview)
+        self._shown = False
+        for item in (self._start_preview, self._line_preview, self._end_preview):
+            if shiboken6.isValid(item) and item.scene() is not None:
+                self.scene.removeItem(item)
 
-    def clear(self):
-        if self._start_preview and shiboken6.isValid(self._start_preview):
-            self.scene.removeItem(self._start_preview)
-            self._start_preview = None
+    def _show(self):
+        # The scene deletes its items when cleared
+        if self._start_preview is None or not shiboken6.isValid(self._start_preview):
+            self._create_items()
+            self._shown = False
+
+        if not self._shown:
+            self._shown = True
+            for item in (self._start_preview, self._line_preview, self._end_preview):
+                self.scene.addItem(item)
+
+    def _create_items(self):
+        self._start_preview = NodeMarkerItem()
+        self._start_preview.setOpacity(self.OPACITY)
 
-        if self._line_preview and shiboken6.isValid(self._line_preview):
-            self.scene.removeItem(self._line_preview)
-            self._line_preview = None
+        self._line_preview = QGraphicsLineItem()
+        self._line_preview.setOpacity(self.OPACITY)
+        self._line_preview.setPen(QPen(QColor("black"), self.LINE_WIDTH, self.LINE_LOOKS))
 
-        if self._end_preview and shiboken6.isValid(self._end_preview):
-            self.scene.removeItem(self._end_preview)
-            self._end_preview = None
\ No newline at end of file
+        self._end_preview = NodeMarkerItem()
+        self._end_preview.setOpacity(self.OPACITY)
@@ -1,9 +1,11 @@
 from PySide6.QtGui import QBrush, QPen, QColor, QPolygonF
-from PySide6.QtCore import QPointF
+from PySide6.QtCore import Qt, QPointF
 from PySide6.QtWidgets import QGraphicsPolygonItem, QGraphicsSimpleTextItem
 
 from model import Zone, ZoneType
 
+from .label_detail import LabelDetail
+
 class ZoneGraphicsItem(QGraphicsPolygonItem):
     EMOTE_TYPE_MAP = {
         ZoneType.GENERIC: "",
@@ -12,11 +14,13 @@ class ZoneGraphicsItem(QGraphicsPolygonItem):
     }
 
     def __init__(self, zone: Zone):
-        polygon = QPolygonF([QPointF(node.x, node.y) for node in zone.corner_nodes])   
-        super().__init__(polygon)
+        super().__init__()
 
         self._zone = zone
 
+        # Geometry the polygon and label were last built from
+        self._geometry = None
+
         self.setBrush(QBrush(QColor(100, 200, 250, 100)))
         self.setPen(QPen(QColor("blue"), 2))
 
@@ -33,22 +37,26 @@ class ZoneGraphicsItem(QGraphicsPolygonItem):
         self._label.setBrush(QBrush(QColor("white")))
         self._label.setPen(QPen(QColor("black"), 2))
         self._label.setFont(font)
+        self._label_detail = LabelDetail.FULL
 
         self._zone.updated.connect(self.update_item)
         self.update_item()
 
-    def itemChange(self, change, value):
-        if change == QGraphicsPolygonItem.ItemSceneHasChanged and value is None:
-            try:
-                self._zone.updated.disconnect(self.update_item)
-            except TypeError:
-                pass
-
-        return super().itemChange(change, value)
+    # Called by the scene once the item has left it
+    def release(self):
+        try:
+            self._zone.updated.disconnect(self.update_item)
+        except TypeError:
+            pass
 
     def update_item(self):
-        self._update_text()
-        self._update_geometry()
+        geometry = self._zone.geometry
+        geometry_changed = geometry is not self._geometry
+        self._geometry = geometry
+
+        if geometry_changed:
+            self._update_geometry(geometry)
+        self._update_text(geometry)
 
     def set_highlight(self, highlight=True):
         if highlight:
@@ -56,7 +64,19 @@ class ZoneGraphicsItem(QGraphicsPolygonItem):
         else:
             self.setBrush(QBrush(QColor(100, 200, 250, 100)))
 
-    def _update_text(self):
+    # The outline is the costly part of the label to draw, so it goes first
+    def set_label_detail(self, detail: LabelDetail):
+        if detail == self._label_detail:
+            return
+
+        self._label_detail = detail
+        self._label.setVisible(detail != LabelDetail.HIDDEN)
+        if detail == LabelDetail.FULL:
+            self._label.setPen(QPen(QColor("black"), 2))
+        else:
+            self._label.setPen(QPen(Qt.NoPen))
+
+    def _update_text(self, geometry):
         emote = self.EMOTE_TYPE_MAP.get(self._zone.type, "")
         name = f"{emote} {self._zone.name}" if emote else self._zone.name
         self._label.setText(name)
@@ -66,10 +86,9 @@ class ZoneGraphicsItem(QGraphicsPolygonItem):
         offset_x = text_rect.width() / 2
         offset_y = text_rect.height() / 2
 
-        pos_x = self._zone.position.x() - offset_x
-        pos_y = self._zone.position.y() - offset_y
-        self._label.setPos(pos_x, pos_y)
+        center = geometry.center
+        self._label.setPos(center.x() - offset_x, center.y() - offset_y)
 
-    def _update_geometry(self):
-        polygon = QPolygonF([QPointF(node.x, node.y) for node in self._zone.corner_nodes])
+    def _update_geometry(self, geometry):
+        polygon = QPolygonF([QPointF(x, y) for x, y in geometry.points])
         self.setPolygon(polygon)
\ No newline at end of file
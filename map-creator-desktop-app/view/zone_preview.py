@@ -1,12 +1,13 @@
 from PySide6.QtGui import QPainterPath, QPen, QColor
 from PySide6.QtCore import QPointF
-from PySide6.QtWidgets import QGraphicsScene, QGraphicsPathItem
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsPathItem, QGraphicsLineItem
 
 import shiboken6
 
-from model import Node
-from .node_item import NodeGraphicsItem
+from .node_item import NodeMarkerItem
 
+# The placed edges are one path, extended as corners are added; only the
+# rubber band edge to the cursor and the cursor dot move with the mouse
 class ZonePreview:
     DEFAULT_PEN = QPen(QColor("black"), 2)
     ERROR_PEN = QPen(QColor("red"), 2)
@@ -14,37 +15,80 @@ class ZonePreview:
     def __init__(self, scene: QGraphicsScene):
         self.scene = scene
         self._polygon_item = None
+        self._rubber_band_item = None
         self._point_item = None
-        self._current_pen = self.DEFAULT_PEN
+        self._current_pen = None
+        self._shown = False
+
+        self._path = QPainterPath()
+        self._path_points = 0
 
     def update_preview(self, corner_points: list[QPointF], new_point: QPointF, valid: bool):
-        self.clear()
+        self._show()
+        self._update_path(corner_points)
 
-        path = self._create_path(corner_points, new_point)
+        pen = self.DEFAULT_PEN if valid else self.ERROR_PEN
+        if pen is not self._current_pen:
+            self._current_pen = pen
+            self._polygon_item.setPen(pen)
+            self._rubber_band_item.setPen(pen)
 
-        self._polygon_item = QGraphicsPathItem(path)
-        self._polygon_item.setPen(self.DEFAULT_PEN if valid else self.ERROR_PEN)
-        self.scene.addItem(self._polygon_item)
+        if corner_points:
+            last = corner_points[-1]
+            self._rubber_band_item.setLine(last.x(), last.y(), new_point.x(), new_point.y())
+            self._rubber_band_item.setVisible(True)
+        else:
+            self._rubber_band_item.setVisible(False)
 
-        self._point_item = NodeGraphicsItem(Node(new_point.x(), new_point.y()))
-        self._point_item.setOpacity(0.5)
-        self.scene.addItem(self._point_item)
+        self._point_item.setPos(new_point)
 
     def clear(self):
-        if self._polygon_item and shiboken6.isValid(self._polygon_item):
-            self.scene.removeItem(self._polygon_item)
-            self._polygon_item = None
+        self._path = QPainterPath()
+        self._path_points = 0
 
-        if self._point_item and shiboken6.isValid(self._point_item):
-            self.scene.removeItem(self._point_item)
-            self._point_item = None
+        if not self._shown:
+            return
 
-    def _create_path(self, corner_points: list[QPointF], new_point: QPointF) -> QPainterPath:
-        path = QPainterPath()
-        if corner_points:
-            path.moveTo(corner_points[0])
+        self._shown = False
+        for item in (self._polygon_item, self._rubber_band_item, self._point_item):
+            if shiboken6.isValid(item) and item.scene() is not None:
+                self.scene.removeItem(item)
+
+    def _show(self):
+        # The scene deletes its items when cleared
+        if self._polygon_item is None or not shiboken6.isValid(self._polygon_item):
+            self._create_items()
+            self._shown = False
+
+        if not self._shown:
+            self._shown = True
+            self._polygon_item.setPath(self._path)
+            for item in (self._polygon_item, self._rubber_band_item, self._point_item):
+                self.scene.addItem(item)
+
+    def _create_items(self):
+        self._polygon_item = QGraphicsPathItem()
+        self._rubber_band_item = QGraphicsLineItem()
+        self._current_pen = None
+
+        self._point_item = NodeMarkerItem()
+        self._point_item.setOpacity(0.5)
+
+    # Corners are only ever added until the preview is cleared
+    def _update_path(self, corner_points: list[QPointF]):
+        count = len(corner_points)
+        if count == self._path_points:
+            return
+
+        if count < self._path_points:
+            self._path = QPainterPath()
+            self._path_points = 0
+
+        for point in corner_points[self._path_points:]:
+            if self._path_points == 0:
+                self._path.moveTo(point)
+            else:
+                self._path.lineTo(point)
+            self._path_points += 1
 
-            for point in corner_points[1:]:
-                path.lineTo(point)
-            path.lineTo(new_point)
-        return path
\ No newline at end of file
+        self._polygon_item.setPath(self._path)
@@ -6,6 +6,7 @@ from .map_view import FloorView, MapTheme
 from .toolbar import Toolbar
 from .zone_management import ManageZoneConnectionDialog
 from .right_panel_dock import RightPanelDock
+from .validation_panel import ValidationPanel
 
 __all__ = [
     "AppMenu",
@@ -16,5 +17,6 @@ __all__ = [
     "MapTheme",
     "Toolbar",
     "ManageZoneConnectionDialog",
-    "RightPanelDock"
+    "RightPanelDock",
+    "ValidationPanel"
 ]
\ No newline at end of file
@@ -11,6 +11,14 @@ class AppMenu(QMenuBar):
     save_requested = Signal()
     load_requested = Signal()
     new_file_requested = Signal()
+    import_cad_requested = Signal()
+    validate_requested = Signal()
+    weld_nodes_requested = Signal()
+    detect_rooms_requested = Signal()
+    simplify_walls_requested = Signal()
+    trace_walls_requested = Signal()
+    import_underlay_requested = Signal()
+    remove_underlay_requested = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -18,6 +26,7 @@ class AppMenu(QMenuBar):
         self._create_file_menu()
         self._create_edit_menu()
         self._create_view_menu()
+        self._create_tools_menu()
 
     def _create_file_menu(self):
         file_menu = self.addMenu("File")
@@ -37,6 +46,10 @@ class AppMenu(QMenuBar):
         load_action.triggered.connect(self.load_requested)
         file_menu.addAction(load_action)
 
+        import_cad_action = QAction("Import CAD Drawing...", self)
+        import_cad_action.triggered.connect(self.import_cad_requested)
+        file_menu.addAction(import_cad_action)
+
         exit_action = QAction("Exit", self)
         exit_action.setShortcut(QKeySequence.Quit)
 
@@ -76,4 +89,37 @@ class AppMenu(QMenuBar):
         theme_menu.addAction(system_theme_action)
         theme_menu.addAction(light_theme_action)
         theme_menu.addAction(dark_theme_action)
-        view_menu.addMenu(theme_menu)
\ No newline at end of file
+        view_menu.addMenu(theme_menu)
+
+        view_menu.addSeparator()
+
+        import_underlay_action = QAction("Import Floor Plan...", self)
+        import_underlay_action.triggered.connect(self.import_underlay_requested)
+        view_menu.addAction(import_underlay_action)
+
+        remove_underlay_action = QAction("Remove Floor Plan", self)
+        remove_underlay_action.triggered.connect(self.remove_underlay_requested)
+        view_menu.addAction(remove_underlay_action)
+
+    def _create_tools_menu(self):
+        tools_menu = self.addMenu("Tools")
+
+        validate_action = QAction("Check Building", self)
+        validate_action.triggered.connect(self.validate_requested)
+        tools_menu.addAction(validate_action)
+
+        weld_action = QAction("Weld Coincident Nodes", self)
+        weld_action.triggered.connect(self.weld_nodes_requested)
+        tools_menu.addAction(weld_action)
+
+        detect_rooms_action = QAction("Detect Rooms", self)
+        detect_rooms_action.triggered.connect(self.detect_rooms_requested)
+        tools_menu.addAction(detect_rooms_action)
+
+        simplify_walls_action = QAction("Simplify Walls", self)
+        simplify_walls_action.triggered.connect(self.simplify_walls_requested)
+        tools_menu.addAction(simplify_walls_action)
+
+        trace_walls_action = QAction("Trace Walls from Floor Plan", self)
+        trace_walls_action.triggered.connect(self.trace_walls_requested)
+        tools_menu.addAction(trace_walls_action)
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
 )
 
 from model import Building, Floor
+from model.qt_adapter import QtBuildingAdapter
 
 if TYPE_CHECKING:
     from main_map_controller import MainMapController
@@ -26,9 +27,10 @@ class AutoSyncFloorList(QWidget):
 
         # assign building and connect signals
         self._building = controller.building
-        self._building.floor_added.connect(self.refresh_view)
-        self._building.floor_removed.connect(self.refresh_view)
-        self._building.floor_name_changed.connect(self.refresh_view)
+        self._building_signals = QtBuildingAdapter(self._building, self)
+        self._building_signals.floor_added.connect(self.refresh_view)
+        self._building_signals.floor_removed.connect(self.refresh_view)
+        self._building_signals.floor_name_changed.connect(self.refresh_view)
 
         layout = QVBoxLayout(self)
 
@@ -87,15 +89,18 @@ class AutoSyncFloorList(QWidget):
             self.floor_selected.emit(clicked_floor)
 
     def _on_building_changed(self, building: Building):
-        self._building.floor_added.disconnect(self.refresh_view)
-        self._building.floor_removed.disconnect(self.refresh_view)
-        self._building.floor_name_changed.disconnect(self.refresh_view)
         self._building = building
-        self._building.floor_added.connect(self.refresh_view)
-        self._building.floor_removed.connect(self.refresh_view)
-        self._building.floor_name_changed.connect(self.refresh_view)
+        self._building_signals.attach(building)
         self.refresh_view()
 
+    def select_floor(self, floor: Floor):
+        # Goes through the list selection, so floor_selected is emitted
+        for i in range(self._list_widget.count()):
+            item = self._list_widget.item(i)
+            if item.data(Qt.UserRole) is floor:
+                self._list_widget.setCurrentItem(item)
+                return
+
     @property
     def current_floor(self) -> Floor | None:
         current_item = self._list_widget.currentItem()
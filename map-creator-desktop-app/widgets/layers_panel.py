@@ -23,6 +23,7 @@ class LayersPanel(QWidget):
 
         self.btn_group = QButtonGroup(self)
         self.btn_group.setExclusive(True)
+        self._type_buttons = {}
 
         self._add_layer_btn("Walls", Wall, layout)
         self._add_layer_btn("Zones", Zone, layout)
@@ -42,7 +43,13 @@ class LayersPanel(QWidget):
         btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
         btn.clicked.connect(lambda: self.active_class_changed.emit(item_type))
+        self._type_buttons[item_type] = btn
 
         layout.insertWidget(layout.count() - 1, btn)
 
         self.btn_group.addButton(btn, self.btn_group.buttons().__len__())
+
+    def select_type(self, item_type: type):
+        btn = self._type_buttons.get(item_type)
+        if btn is not None and not btn.isChecked():
+            btn.click()
@@ -56,6 +56,7 @@ class FloorView(QGraphicsView):
     @map_theme.setter
     def map_theme(self, value: MapTheme):
         self._map_theme = value
+        self.scene.invalidate_grid()
         self.viewport().update()
 
     def drawForeground(self, painter, rect):
@@ -121,6 +122,7 @@ class FloorView(QGraphicsView):
             self._zoom.zoom_in()
         else:
             self._zoom.zoom_out()
+        self.scene.level_of_detail.set_zoom(self._zoom.current_zoom)
 
     def keyPressEvent(self, event):
         self.presenter.on_keyboard_press(event.key())
@@ -141,6 +143,7 @@ class FloorView(QGraphicsView):
 
     def reset_zoom(self):
         self._zoom.reset_zoom()
+        self.scene.level_of_detail.set_zoom(self._zoom.current_zoom)
 
     def reset_rotation(self):
         previous_mode = self._transofmation_mode
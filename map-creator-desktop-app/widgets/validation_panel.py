@@ -0,0 +1,124 @@
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar,
+    QTableView, QHeaderView, QAbstractItemView
+)
+
+# Rows are only created for what is on screen, a large building can have
+# tens of thousands of problems
+class _IssueTableModel(QAbstractTableModel):
+    HEADERS = ["Problem", "Floor", "Details"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._issues = []
+
+    def set_issues(self, issues: list):
+        self.beginResetModel()
+        self._issues = issues
+        self.endResetModel()
+
+    def issue(self, row: int):
+        return self._issues[row] if 0 <= row < len(self._issues) else None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._issues)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+
+        issue = self._issues[index.row()]
+        column = index.column()
+        if column == 0:
+            return issue.kind.value
+        if column == 1:
+            return issue.floor.name if issue.floor else ""
+        return issue.message
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class ValidationPanel(QWidget):
+    run_requested = Signal()
+    cancel_requested = Signal()
+    issue_selected = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        top_row = QHBoxLayout()
+        self._status_label = QLabel("Building not checked yet.")
+        top_row.addWidget(self._status_label, 1)
+
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setVisible(False)
+        top_row.addWidget(self._progress_bar)
+
+        self._run_button = QPushButton("Check")
+        self._run_button.clicked.connect(self.run_requested)
+        top_row.addWidget(self._run_button)
+
+        self._cancel_button = QPushButton("Cancel")
+        self._cancel_button.setEnabled(False)
+        self._cancel_button.clicked.connect(self.cancel_requested)
+        top_row.addWidget(self._cancel_button)
+
+        layout.addLayout(top_row)
+
+        self._model = _IssueTableModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        self._table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Interactive)
+        self._table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self._table.clicked.connect(self._on_clicked)
+        layout.addWidget(self._table)
+
+    def clear(self):
+        self.set_running(False)
+        self._status_label.setText("Building not checked yet.")
+        self._model.set_issues([])
+
+    def set_running(self, running: bool):
+        self._run_button.setEnabled(not running)
+        self._cancel_button.setEnabled(running)
+        self._progress_bar.setVisible(running)
+
+        if running:
+            self._progress_bar.setValue(0)
+            self._status_label.setText("Checking building...")
+
+    def set_progress(self, done: int, total: int):
+        if total > 0:
+            self._progress_bar.setValue(int(done * 100 / total))
+
+    def show_cancelled(self):
+        self.set_running(False)
+        self._status_label.setText("Check cancelled.")
+
+    def show_failed(self, error: str):
+        self.set_running(False)
+        self._status_label.setText(f"Check failed: {error}")
+
+    def show_issues(self, issues: list):
+        self.set_running(False)
+        self._status_label.setText(f"{len(issues)} problems found." if issues else "No problems found.")
+        self._model.set_issues(issues)
+
+    def _on_clicked(self, index: QModelIndex):
+        issue = self._model.issue(index.row())
+        if issue is not None:
+            self.issue_selected.emit(issue)